@@ -1,18 +1,64 @@
-import click
-
-from .scan import scan
-from .between import between
-from .checksum import checksum
+import sys
 
+import click
 
-@click.group()
-def main():
-    pass
+from diff.core.util import (
+    PROGRESS_REPORTER_SINGLETON,
+    AVAILABLE_PROGRESS_MODES,
+    PROGRESS_MODE_AUTO,
+    PROFILER_SINGLETON,
+    AVAILABLE_PROFILE_FORMATS,
+    AVAILABLE_PROFILE_CAPTURES,
+    HASH_POOL_SINGLETON,
+    AVAILABLE_HASH_BACKENDS,
+    HASH_BACKEND_AUTO
+)
+from .lazy_group import LazyGroup
 
 
-main.add_command(scan)
-main.add_command(between)
-main.add_command(checksum)
+@click.group(cls=LazyGroup, lazy_commands={
+    'scan': 'diff.scan:scan',
+    'between': 'diff.between:between',
+    'checksum': 'diff.checksum:checksum',
+    'dupes': 'diff.dupes:dupes',
+    'replicas': 'diff.replicas:replicas',
+    'serve': 'diff.serve:serve',
+    'query': 'diff.serve:query'
+})
+@click.option(
+    '--progress',
+    type=click.Choice(AVAILABLE_PROGRESS_MODES),
+    default=PROGRESS_MODE_AUTO,
+    help='How progress is reported on stderr. A status line on a terminal, periodic log lines, JSON lines or nothing.'
+)
+@click.option(
+    '--hash-backend',
+    type=click.Choice(AVAILABLE_HASH_BACKENDS),
+    default=HASH_BACKEND_AUTO,
+    help='How the files of a tree are hashed. Threads for large files, processes for many small files, or chosen '
+         'automatically from the sizes of the files.'
+)
+@click.option(
+    '--profile',
+    type=click.Choice(AVAILABLE_PROFILE_FORMATS),
+    default=None,
+    help='Prints the time spent in each phase of the command to stderr once the command completes.'
+)
+@click.option(
+    '--profile-capture',
+    type=click.Choice(AVAILABLE_PROFILE_CAPTURES),
+    default=None,
+    help='Additionally profiles every function call or every memory allocation. Requires --profile.'
+)
+def main(progress: str, hash_backend: str, profile: str | None, profile_capture: str | None):
+    PROGRESS_REPORTER_SINGLETON.set_mode(progress)
+    HASH_POOL_SINGLETON.set_backend(hash_backend)
+    if profile is None:
+        if profile_capture is not None:
+            raise click.UsageError('The --profile-capture option requires the --profile option.')
+        return
+    PROFILER_SINGLETON.enable(profile_capture)
+    click.get_current_context().call_on_close(lambda: click.echo(PROFILER_SINGLETON.report(profile), err=True))
 
 
 if __name__ == '__main__':
@@ -20,3 +66,4 @@ if __name__ == '__main__':
         main()
     except Exception as e:
         print(e)
+        sys.exit(2)
@@ -0,0 +1,52 @@
+"""
+Measures how long the directory walk of a scan takes for an increasing --concurrency against the serial walk.
+
+Concurrent listings and stats only pay off on file systems where every call has a high latency, such as a network
+mount, so the tree should be generated on such a file system using --directory. On a local disk the walks are expected
+to take about as long as the serial one.
+
+Usage:
+    python -m diff.benchmarks.concurrency --directory <path_on_network_mount> --directories 50 --files 100
+"""
+from typing import List
+from pathlib import Path
+import argparse
+import tempfile
+import time
+
+from diff.core.tree import TreeLoader, AsyncTreeLoader
+
+from .synthetic_tree import generate_flat_tree
+
+
+def _best_time(tree_loader: TreeLoader, root: Path, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tree_loader.read_tree_from_disk(root, False, None)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the serial directory walk against the concurrent walk.')
+    parser.add_argument('--directory', default=None, help='The directory to generate the synthetic tree in.')
+    parser.add_argument('--directories', type=int, default=50)
+    parser.add_argument('--files', type=int, default=100, help='The number of files per directory.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[4, 16, 64])
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        root = Path(directory)
+        generate_flat_tree(root, arguments.directories, arguments.files, 16, 1)
+
+        serial = _best_time(TreeLoader(), root, arguments.repeat)
+        print(f'{"serial":>12}: best {serial:.3f}s')
+        for concurrency in arguments.concurrency:
+            best = _best_time(AsyncTreeLoader(concurrency=concurrency), root, arguments.repeat)
+            print(f'{f"async {concurrency}":>12}: best {best:.3f}s, {serial / best:.2f}x the serial walk')
+
+
+if __name__ == '__main__':
+    main()
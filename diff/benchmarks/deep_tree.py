@@ -0,0 +1,119 @@
+"""
+Measures the throughput of serializing, loading and flattening deep trees, and of walking a deep directory on disk,
+and compares it against the recursive implementations the tree processing stages used to rely on.
+
+The recursive implementations fail with a RecursionError once the depth approaches the recursion limit, in which case
+the failure is reported instead of a time.
+
+Usage:
+    python -m diff.benchmarks.deep_tree --depth 5000 --chains 20
+"""
+from typing import List, Dict, Any, Callable, Generator, Tuple
+from pathlib import Path
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from diff.core.tree import Node, TreeLoader
+from diff.core.tree.diff import TreeDiff
+
+
+def _recursive_to_dict(node: Node) -> Dict[str, Any]:
+    node_dict = node._to_dict_without_children()
+    if node.children:
+        node_dict['children'] = [_recursive_to_dict(child) for child in node.children]
+    return node_dict
+
+
+def _recursive_from_dict(parent: Node | None, values: Dict[str, Any]) -> Node:
+    node = Node._from_dict_without_children(parent, values)
+    for child in values.get('children', []):
+        _recursive_from_dict(node, child)
+    return node
+
+
+def _recursive_flatten(root_node: Node) -> Dict[str, Node]:
+    def flatten(node: Node) -> Generator[Tuple[str, Node], None, None]:
+        for child in node.children or []:
+            yield str(child.path_to_node())[len(root_node.name):], child
+            if child.children:
+                yield from flatten(child)
+    return dict(flatten(root_node))
+
+
+def _recursive_walk(tree_loader: TreeLoader, path: Path, node: Node):
+    for child_path in tree_loader.list_children(path):
+        child_stat = os.stat(child_path)
+        child_node = tree_loader._read_node_details(child_path, node, child_stat, None, None)
+        if child_node.size is None:
+            _recursive_walk(tree_loader, child_path, child_node)
+
+
+def _deep_tree(depth: int, chains: int) -> Node:
+    root = Node(None, 'root', None, None, 'sha256')
+    for chain in range(chains):
+        node = root
+        for level in range(depth):
+            child = Node(node, f'c{chain}' if level == 0 else 'd', None, None, None)
+            node.attach_child(child)
+            node = child
+        node.attach_child(Node(node, 'file', 1, 'AB', None))
+    return root
+
+
+def _time(function: Callable[[], Any]) -> str:
+    start = time.perf_counter()
+    try:
+        function()
+    except RecursionError:
+        return 'RecursionError'
+    return f'{time.perf_counter() - start:.4f}s'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares iterative and recursive processing of deep trees.')
+    parser.add_argument('--depth', type=int, default=5000, help='The depth of each chain of nested nodes.')
+    parser.add_argument('--chains', type=int, default=20, help='The number of chains under the root.')
+    parser.add_argument('--disk-depth', type=int, default=1500, help='The depth of the directory walked on disk.')
+    arguments = parser.parse_args()
+
+    tree = _deep_tree(arguments.depth, arguments.chains)
+    values = tree.to_dict()
+    rows: List[Tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        ('to_dict', tree.to_dict, lambda: _recursive_to_dict(tree)),
+        ('from_dict', lambda: Node.from_dict(None, values), lambda: _recursive_from_dict(None, values)),
+        ('flatten', lambda: TreeDiff()._flatten(tree), lambda: _recursive_flatten(tree))
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        deepest = Path(directory)
+        for _ in range(arguments.disk_depth):
+            deepest = deepest.joinpath('d')
+            deepest.mkdir()
+        deepest.joinpath('file').write_text('file')
+        tree_loader = TreeLoader()
+
+        def walk():
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                tree_loader.read_tree_from_disk(Path(directory), False, None)
+
+        def recursive_walk():
+            root_stat = os.stat(directory)
+            _recursive_walk(tree_loader, Path(directory), tree_loader._read_node_details(Path(directory), None, root_stat, None, directory))
+        rows.append(('walk', walk, recursive_walk))
+
+        print(f'{"stage":>10} {"iterative":>16} {"recursive":>16}')
+        for name, iterative, recursive in rows:
+            print(f'{name:>10} {_time(iterative):>16} {_time(recursive):>16}')
+
+        # shutil.rmtree is recursive itself so the deep directory is removed before the temporary directory is.
+        deepest.joinpath('file').unlink()
+        while deepest != Path(directory):
+            deepest.rmdir()
+            deepest = deepest.parent
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Measures the hashing throughput of a scan for every hash backend.
+
+Many small files are dominated by per file interpreter overhead, where the process backend is expected to win, while
+a few large files are dominated by reading and hashing their contents, where the thread backend is expected to win.
+Run the benchmark with both a small and a large --size to see where the auto backend switches between the two.
+
+Usage:
+    python -m diff.benchmarks.hash_backend --files 20000 --size 512
+"""
+from typing import List
+from pathlib import Path
+import argparse
+import tempfile
+import time
+
+from diff.core.tree import TreeLoader
+from diff.core.util import HashPool, AVAILABLE_HASH_BACKENDS
+
+from .synthetic_tree import generate_flat_tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the hashing throughput of each hash backend.')
+    parser.add_argument('--directory', default=None, help='The directory to generate the synthetic tree in.')
+    parser.add_argument('--directories', type=int, default=20)
+    parser.add_argument('--files', type=int, default=20000, help='The total number of files to generate.')
+    parser.add_argument('--size', type=int, default=512, help='The size of each file in bytes.')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        root = Path(directory)
+        paths = generate_flat_tree(root, arguments.directories, arguments.files // arguments.directories, arguments.size, arguments.seed)
+        total_bytes = len(paths) * arguments.size
+
+        print(f'Generated {len(paths)} files totalling {total_bytes / 2 ** 20:.1f} MiB in [{root}]')
+        for backend in AVAILABLE_HASH_BACKENDS:
+            tree_loader = TreeLoader(hash_pool=HashPool(backend))
+            timings: List[float] = []
+            for _ in range(arguments.repeat):
+                start = time.perf_counter()
+                tree_loader.read_tree_from_disk(root, True, 'sha256')
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            print(f'{backend:>10}: best {best:.3f}s, {len(paths) / best:,.0f} files/s, {total_bytes / 2 ** 20 / best:.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
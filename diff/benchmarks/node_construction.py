@@ -0,0 +1,70 @@
+"""
+Measures how many nodes per second can be constructed by the directory walker, which builds nodes directly from the
+stat results, and by the scan file loader, which builds nodes from the dicts parsed from the YAML.
+
+No files are read or written so only the cost of constructing the nodes is measured.
+
+Usage:
+    python -m diff.benchmarks.node_construction --directories 100 --files 1000
+"""
+from typing import List, Dict, Any
+from pathlib import Path
+import argparse
+import os
+import time
+
+from diff.core.tree import Node, TreeLoader
+
+
+def _nodes_per_second(count: int, function, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return count / min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the number of nodes constructed per second.')
+    parser.add_argument('--directories', type=int, default=100)
+    parser.add_argument('--files', type=int, default=1000, help='The number of files within each directory.')
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    file_stat = os.stat(__file__)
+    directory_stat = os.stat(Path(__file__).parent)
+    directory_paths = [Path(f'dir{directory:04}') for directory in range(arguments.directories)]
+    file_paths = [Path(f'file{file:06}.bin') for file in range(arguments.files)]
+    count = 1 + arguments.directories * (1 + arguments.files)
+
+    tree_loader = TreeLoader()
+
+    def walk():
+        root = tree_loader._read_node_details(Path('root'), None, directory_stat, 'sha256', 'root')
+        for directory_path in directory_paths:
+            directory = tree_loader._read_node_details(directory_path, root, directory_stat, None, None)
+            for file_path in file_paths:
+                tree_loader._read_node_details(file_path, directory, file_stat, None, None)
+
+    scan: Dict[str, Any] = {
+        'name': 'root',
+        'checksum_algo': 'sha256',
+        'children': [
+            {
+                'name': directory_path.name,
+                'children': [
+                    {'name': file_path.name, 'size': file_stat.st_size, 'checksum': '0' * 64}
+                    for file_path in file_paths
+                ]
+            }
+            for directory_path in directory_paths
+        ]
+    }
+
+    print(f'{"walker":>10}: {_nodes_per_second(count, walk, arguments.repeat):,.0f} nodes/s')
+    print(f'{"scan file":>10}: {_nodes_per_second(count, lambda: Node.from_dict(None, scan), arguments.repeat):,.0f} nodes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures the hashing throughput of a scan for every available read order.
+
+The benchmark is only meaningful when the generated tree lives on the device being evaluated, for example a spinning
+archive disk, so the directory to generate the tree in should be specified with --directory. The page cache is
+dropped for every file before each run on platforms that support posix_fadvise.
+
+Usage:
+    python -m diff.benchmarks.read_order --directory <path_on_device> --files 2000 --size 262144
+"""
+from typing import List
+from pathlib import Path
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from diff.core.tree import TreeLoader, AVAILABLE_READ_ORDERS
+
+from .synthetic_tree import generate_flat_tree
+
+
+def _drop_page_cache(paths: List[Path]):
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    os.sync()
+    for path in paths:
+        descriptor = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(descriptor, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(descriptor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the hashing throughput of each read order.')
+    parser.add_argument('--directory', default=None, help='The directory to generate the synthetic tree in.')
+    parser.add_argument('--directories', type=int, default=20)
+    parser.add_argument('--files', type=int, default=1000, help='The total number of files to generate.')
+    parser.add_argument('--size', type=int, default=256 * 1024, help='The size of each file in bytes.')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        root = Path(directory)
+        paths = generate_flat_tree(root, arguments.directories, arguments.files // arguments.directories, arguments.size, arguments.seed)
+        total_bytes = len(paths) * arguments.size
+        tree_loader = TreeLoader()
+
+        print(f'Generated {len(paths)} files totalling {total_bytes / 2 ** 20:.1f} MiB in [{root}]')
+        for read_order in AVAILABLE_READ_ORDERS:
+            timings: List[float] = []
+            for _ in range(arguments.repeat):
+                _drop_page_cache(paths)
+                start = time.perf_counter()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    tree_loader.read_tree_from_disk(root, True, 'sha256', read_order)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            print(f'{read_order:>10}: best {best:.3f}s, {total_bytes / 2 ** 20 / best:.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
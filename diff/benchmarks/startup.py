@@ -0,0 +1,57 @@
+"""
+Measures the import time of the diff modules loaded by the checksum calculate command, the command with the fewest
+dependencies, and exits with 1 if it exceeds the budget.
+
+The import time of click and the standard library is excluded since it does not depend on this project. The fastest
+of several runs is kept so the first run, which may have to compile the modules, and noise from other processes do
+not count against the budget.
+
+Usage:
+    python -m diff.benchmarks.startup --budget 60 --repeat 5
+"""
+from typing import List
+from pathlib import Path
+import argparse
+import re
+import subprocess
+import sys
+
+
+_IMPORT_TIME_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+
+def _diff_import_time(arguments: List[str]) -> int:
+    """
+    Runs the CLI with -X importtime.
+
+    :return: The combined cumulative import time, in microseconds, of the diff modules imported at the top level.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'diff', *arguments],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent.parent
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is not None and len(match.group(2)) == 0 and match.group(3).split('.')[0] == 'diff':
+            total += int(match.group(1))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the import time of the checksum calculate command.')
+    parser.add_argument('--budget', type=float, default=60, help='The import time budget in milliseconds.')
+    parser.add_argument('--repeat', type=int, default=5)
+    arguments = parser.parse_args()
+
+    fastest = min(_diff_import_time(['checksum', 'calculate', __file__]) for _ in range(arguments.repeat)) / 1000
+    print(f'Import time of the diff modules: {fastest:.1f}ms, budget: {arguments.budget:.1f}ms')
+    if fastest > arguments.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Runs timed scenarios against a deterministic synthetic tree, and a mutated copy of it, and optionally compares the
+results against a previously saved baseline so regressions show up.
+
+Every scenario is run --repeat times and the fastest run is kept. The scenario is then run once more while tracing
+memory allocations to record its peak memory usage.
+
+Usage:
+    python -m diff.benchmarks --save-baseline baseline.json
+    python -m diff.benchmarks --baseline baseline.json --tolerance 0.2
+"""
+from typing import List, Dict, Any, Callable, Final
+from pathlib import Path
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from diff.core.tree import TreeLoader, YamlSerialization, Node
+from diff.core.tree.diff import TreeDiff
+
+from .synthetic_tree import generate_tree, mutate_tree, AVAILABLE_SIZE_DISTRIBUTIONS, SIZE_DISTRIBUTION_LOGNORMAL
+
+
+SCENARIO_READ_TREE: Final[str] = 'read_tree_from_disk'
+SCENARIO_HASHING: Final[str] = 'hashing'
+SCENARIO_DIFF: Final[str] = 'diff_between_trees'
+SCENARIO_YAML_SAVE: Final[str] = 'yaml_save'
+SCENARIO_YAML_LOAD: Final[str] = 'yaml_load'
+
+AVAILABLE_SCENARIOS: Final[List[str]] = [
+    SCENARIO_READ_TREE,
+    SCENARIO_HASHING,
+    SCENARIO_DIFF,
+    SCENARIO_YAML_SAVE,
+    SCENARIO_YAML_LOAD
+]
+
+
+def measure(scenario: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Measures the fastest wall time of a scenario across multiple runs and the peak memory allocated by a single run.
+
+    :param scenario: The function to measure.
+    :param repeat: The number of timed runs.
+    :return: A dict containing the fastest time in seconds and the peak allocated memory in bytes.
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scenario()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        scenario()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(min(timings), 6), 'peak_memory': peak_memory}
+
+
+def compare_results(results: Dict[str, Dict[str, float]],
+                    baseline: Dict[str, Dict[str, float]],
+                    tolerance: float) -> List[str]:
+    """
+    Compares the results of each scenario against the baseline.
+
+    :param results: The measurements of the current run keyed by scenario.
+    :param baseline: The measurements of the baseline run keyed by scenario.
+    :param tolerance: The share, above the baseline, that a measurement can grow by before it is a regression.
+    :return: A description of every measurement that regressed. Scenarios missing from the baseline are ignored.
+    """
+    regressions: List[str] = []
+    for scenario, measurements in results.items():
+        for metric, value in measurements.items():
+            expected = baseline.get(scenario, {}).get(metric)
+            if expected is not None and expected > 0 and value > expected * (1 + tolerance):
+                regressions.append(f'{scenario} {metric}: {value} is {value / expected:.2f}x the baseline of {expected}')
+    return regressions
+
+
+def run_scenarios(directory: Path, arguments: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    first_root = directory.joinpath('first')
+    second_root = directory.joinpath('second')
+    files = generate_tree(
+        first_root,
+        arguments.depth,
+        arguments.fan_out,
+        arguments.files_per_directory,
+        arguments.size_distribution,
+        arguments.mean_size,
+        arguments.seed
+    )
+    mutate_tree(first_root, second_root, files, arguments.changed, arguments.renamed, arguments.deleted, arguments.seed)
+
+    tree_loader = TreeLoader()
+    tree_diff = TreeDiff()
+    yaml_serialization = YamlSerialization()
+    scan_path = directory.joinpath('scan.yml')
+    first_tree = tree_loader.read_tree_from_disk(first_root, True, arguments.algo)
+    second_tree = tree_loader.read_tree_from_disk(second_root, True, arguments.algo)
+    yaml_serialization.to_yaml_file(scan_path, first_tree)
+
+    scenarios: Dict[str, Callable[[], Any]] = {
+        SCENARIO_READ_TREE: lambda: tree_loader.read_tree_from_disk(first_root, False, None),
+        SCENARIO_HASHING: lambda: tree_loader.read_tree_from_disk(first_root, True, arguments.algo),
+        SCENARIO_DIFF: lambda: tree_diff.diff_between_trees(first_tree, second_tree),
+        SCENARIO_YAML_SAVE: lambda: yaml_serialization.to_yaml_file(directory.joinpath('saved.yml'), first_tree),
+        SCENARIO_YAML_LOAD: lambda: Node.from_dict(None, yaml_serialization.read_yaml_file(scan_path))
+    }
+    return {
+        name: measure(scenario, arguments.repeat)
+        for name, scenario in scenarios.items()
+        if arguments.scenario is None or name in arguments.scenario
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs the benchmark scenarios against a synthetic tree.')
+    parser.add_argument('--directory', default=None, help='The directory to generate the synthetic trees in.')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--fan-out', type=int, default=4)
+    parser.add_argument('--files-per-directory', type=int, default=20)
+    parser.add_argument('--size-distribution', choices=AVAILABLE_SIZE_DISTRIBUTIONS, default=SIZE_DISTRIBUTION_LOGNORMAL)
+    parser.add_argument('--mean-size', type=int, default=16 * 1024)
+    parser.add_argument('--changed', type=float, default=0.05, help='The share of files changed in the second tree.')
+    parser.add_argument('--renamed', type=float, default=0.05, help='The share of files renamed in the second tree.')
+    parser.add_argument('--deleted', type=float, default=0.05, help='The share of files deleted in the second tree.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--algo', default='sha256')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scenario', action='append', choices=AVAILABLE_SCENARIOS, help='Only run this scenario.')
+    parser.add_argument('--save-baseline', default=None, help='Saves the results to this JSON file.')
+    parser.add_argument('--baseline', default=None, help='Compares the results against this JSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='The share a result can exceed the baseline by.')
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = run_scenarios(Path(directory), arguments)
+
+    for name, measurements in results.items():
+        print(f'{name:>20}: {measurements["seconds"]:.4f}s, {measurements["peak_memory"] / 2 ** 20:.2f} MiB peak')
+
+    if arguments.save_baseline is not None:
+        Path(arguments.save_baseline).write_text(json.dumps(results, indent=2))
+        print(f'Baseline saved to: [{arguments.save_baseline}]')
+
+    if arguments.baseline is not None:
+        regressions = compare_results(results, json.loads(Path(arguments.baseline).read_text()), arguments.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if len(regressions) > 0:
+            sys.exit(1)
+        print('No regressions found compared to the baseline.')
@@ -0,0 +1,135 @@
+from typing import List, Dict, Final
+from pathlib import Path
+import math
+import random
+import shutil
+
+
+def generate_flat_tree(root: Path, directory_count: int, files_per_directory: int, file_size: int, seed: int) -> List[Path]:
+    """
+    Generates a deterministic tree of files whose creation order, and so their inode and on disk order, is unrelated
+    to the order in which the files will be listed.
+
+    :param root: The directory the tree should be generated in.
+    :param directory_count: The number of directories to create directly under the root.
+    :param files_per_directory: The number of files to create within each directory.
+    :param file_size: The size, in bytes, of every generated file.
+    :param seed: The seed used to generate the file names, contents, and creation order.
+    :return: The paths of all the generated files in the order they were created.
+    """
+    generator = random.Random(seed)
+    paths = [
+        root.joinpath(f'dir{directory:04}', f'{generator.getrandbits(64):016x}.bin')
+        for directory in range(directory_count)
+        for _ in range(files_per_directory)
+    ]
+    generator.shuffle(paths)
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(generator.randbytes(file_size))
+    return paths
+
+
+SIZE_DISTRIBUTION_FIXED: Final[str] = 'fixed'
+SIZE_DISTRIBUTION_UNIFORM: Final[str] = 'uniform'
+SIZE_DISTRIBUTION_LOGNORMAL: Final[str] = 'lognormal'
+
+AVAILABLE_SIZE_DISTRIBUTIONS: Final[List[str]] = [
+    SIZE_DISTRIBUTION_FIXED,
+    SIZE_DISTRIBUTION_UNIFORM,
+    SIZE_DISTRIBUTION_LOGNORMAL
+]
+
+
+def generate_tree(root: Path,
+                  depth: int,
+                  fan_out: int,
+                  files_per_directory: int,
+                  size_distribution: str,
+                  mean_size: int,
+                  seed: int) -> List[Path]:
+    """
+    Generates a deterministic, nested, tree of files. The same arguments always generate the same names, sizes and
+    contents.
+
+    :param root: The directory the tree should be generated in.
+    :param depth: The number of levels of directories below the root.
+    :param fan_out: The number of directories to create within each directory above the deepest level.
+    :param files_per_directory: The number of files to create within each directory, including the root.
+    :param size_distribution: Either fixed, for every file to be mean_size bytes, uniform, for sizes evenly
+        distributed between 0 and twice mean_size, or lognormal, for mostly small files with a few very large ones.
+    :param mean_size: The average size, in bytes, of the generated files.
+    :param seed: The seed used to generate the file names, sizes and contents.
+    :return: The paths of all the generated files relative to the root.
+    """
+    if size_distribution not in AVAILABLE_SIZE_DISTRIBUTIONS:
+        raise ValueError(f'Unrecognized size distribution [{size_distribution}]. Expected one of: {AVAILABLE_SIZE_DISTRIBUTIONS}')
+
+    generator = random.Random(seed)
+    files: List[Path] = []
+    directories = [Path()]
+    for level in range(depth + 1):
+        next_directories: List[Path] = []
+        for directory in directories:
+            root.joinpath(directory).mkdir(parents=True, exist_ok=True)
+            for position in range(files_per_directory):
+                file = directory.joinpath(f'file{position:04}.bin')
+                root.joinpath(file).write_bytes(generator.randbytes(_file_size(generator, size_distribution, mean_size)))
+                files.append(file)
+            if level < depth:
+                next_directories.extend(directory.joinpath(f'dir{position:04}') for position in range(fan_out))
+        directories = next_directories
+    return files
+
+
+def mutate_tree(source: Path,
+                target: Path,
+                files: List[Path],
+                changed_share: float,
+                renamed_share: float,
+                deleted_share: float,
+                seed: int) -> Dict[str, int]:
+    """
+    Copies a generated tree and then changes the contents of, renames, and deletes a share of the copied files so the
+    copy can be diffed against the original.
+
+    :param source: The root of the generated tree to copy.
+    :param target: The path the copy should be created at. The path must not exist yet.
+    :param files: The paths of the generated files relative to the root, as returned by generate_tree.
+    :param changed_share: The share, between 0 and 1, of files whose contents will be changed.
+    :param renamed_share: The share, between 0 and 1, of files that will be renamed.
+    :param deleted_share: The share, between 0 and 1, of files that will be deleted.
+    :param seed: The seed used to select and change the files.
+    :return: The number of files that were changed, renamed, and deleted.
+    """
+    shutil.copytree(source, target)
+    generator = random.Random(seed)
+    shuffled = list(files)
+    generator.shuffle(shuffled)
+
+    changed = int(len(files) * changed_share)
+    renamed = int(len(files) * renamed_share)
+    deleted = int(len(files) * deleted_share)
+    if changed + renamed + deleted > len(files):
+        raise ValueError('The changed, renamed and deleted shares cannot add up to more than every file.')
+
+    for file in shuffled[:changed]:
+        path = target.joinpath(file)
+        path.write_bytes(generator.randbytes(max(1, path.stat().st_size)))
+    for file in shuffled[changed:changed + renamed]:
+        path = target.joinpath(file)
+        path.rename(path.with_name('renamed_' + path.name))
+    for file in shuffled[changed + renamed:changed + renamed + deleted]:
+        target.joinpath(file).unlink()
+
+    return {'changed': changed, 'renamed': renamed, 'deleted': deleted}
+
+
+def _file_size(generator: random.Random, size_distribution: str, mean_size: int) -> int:
+    if size_distribution == SIZE_DISTRIBUTION_UNIFORM:
+        return generator.randint(0, 2 * mean_size)
+    if size_distribution == SIZE_DISTRIBUTION_LOGNORMAL:
+        # A sigma of 1.5 keeps the median small while the mean is still mean_size.
+        sigma = 1.5
+        return int(generator.lognormvariate(math.log(max(mean_size, 1)) - sigma ** 2 / 2, sigma))
+    return mean_size
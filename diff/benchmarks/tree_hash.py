@@ -0,0 +1,61 @@
+"""
+Measures the throughput of the chunked tree hash algorithms for an increasing number of workers and compares them
+against the plain, single threaded, hash algorithm.
+
+The file should be generated on the device being evaluated, for example a fast NVMe disk, using --directory.
+
+Usage:
+    python -m diff.benchmarks.tree_hash --directory <path_on_device> --size 1073741824
+"""
+from typing import List
+from pathlib import Path
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from diff.core.util import Checksum
+
+
+def _time_checksum(checksum: Checksum, path: Path, algo: str, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            checksum.compute_file_checksum(path, algo)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares the throughput of tree hashing by number of workers.')
+    parser.add_argument('--directory', default=None, help='The directory to generate the test file in.')
+    parser.add_argument('--size', type=int, default=256 * 2 ** 20, help='The size of the test file in bytes.')
+    parser.add_argument('--algo', default='sha256')
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=arguments.directory) as directory:
+        path = Path(directory).joinpath('large.bin')
+        with open(path, 'wb') as file:
+            remaining = arguments.size
+            while remaining > 0:
+                block = os.urandom(min(remaining, 2 ** 20))
+                file.write(block)
+                remaining -= len(block)
+
+        megabytes = arguments.size / 2 ** 20
+        baseline = _time_checksum(Checksum(), path, arguments.algo, arguments.repeat)
+        print(f'{arguments.algo:>16}: {baseline:.3f}s, {megabytes / baseline:.1f} MiB/s')
+
+        workers = 1
+        while workers <= max(1, os.cpu_count() or 1):
+            elapsed = _time_checksum(Checksum(tree_workers=workers), path, arguments.algo + '-tree', arguments.repeat)
+            print(f'{arguments.algo}-tree x{workers:<3}: {elapsed:.3f}s, {megabytes / elapsed:.1f} MiB/s, '
+                  f'{baseline / elapsed:.2f}x')
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
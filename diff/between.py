@@ -1,7 +1,25 @@
+from typing import Tuple
+
 import click
 
 from diff.core.cli import CliBetween
-from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
+from diff.core.tree import (
+    AVAILABLE_HASH_ALGORITHMS,
+    DEFAULT_HASH_ALGORITHM,
+    AVAILABLE_READ_ORDERS,
+    DEFAULT_READ_ORDER,
+    build_path_filter
+)
+
+from .options import (
+    path_filter_options,
+    concurrency_option,
+    tree_loader_for,
+    external_options,
+    validate_external_options,
+    listing_options,
+    listing_options_for
+)
 
 
 @click.command()
@@ -20,12 +38,61 @@ from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
     default=DEFAULT_HASH_ALGORITHM,
     help='The preferred algorithm to hash the file with.'
 )
-def between(first: str, second: str, checksum: bool, algo: str):
+@click.option(
+    '--quick',
+    '-q',
+    is_flag=True,
+    help='Stops at the first difference found and exits with a status of 1 if the directories differ.'
+)
+@click.option(
+    '--read-order',
+    type=click.Choice(AVAILABLE_READ_ORDERS),
+    default=DEFAULT_READ_ORDER,
+    help='The order in which files are hashed. Use inode or physical to reduce seeking on spinning disks.'
+)
+@path_filter_options
+@concurrency_option
+@external_options
+@listing_options
+def between(first: str,
+            second: str,
+            checksum: bool,
+            algo: str,
+            quick: bool,
+            read_order: str,
+            exclude: Tuple[str, ...],
+            include: Tuple[str, ...],
+            ignore_file: str | None,
+            concurrency: int | None,
+            external: bool,
+            memory_budget: int | None,
+            summary_depth: int | None,
+            limit: int | None,
+            full_listing: str | None):
     """
     Scans two directories, specified by the first and second paths, and compares the structure of the two.
 
     This will identify all files that are similar (have the same name but different size or checksum), all files
     that exist within the first directory but not the second, and all files that exist within the second directory but
     not the first.
+
+    In quick mode the scan stops as soon as the first difference is found and only that difference is reported.
+
+    In external mode both directories are sorted on disk, within the memory budget, so directories with more files
+    than fit in memory can be compared.
+
+    Excluded directories are skipped without being listed in both directories.
+
+    With a summary depth the differences are rolled up into counts per directory, so very large diffs produce a short
+    report.
     """
-    CliBetween().between(first, second, checksum, algo)
+    path_filter = build_path_filter(exclude, include, ignore_file)
+    memory_budget_bytes = validate_external_options(external, quick, memory_budget, read_order)
+    options = listing_options_for(quick, summary_depth, limit, full_listing)
+    tree_loader = tree_loader_for(concurrency, quick, external)
+    if external:
+        CliBetween().external_between(first, second, checksum, algo, path_filter, memory_budget_bytes, options)
+    elif not quick:
+        CliBetween(tree_loader=tree_loader).between(first, second, checksum, algo, read_order, path_filter, options)
+    elif not CliBetween().quick_between(first, second, checksum, algo, path_filter):
+        click.get_current_context().exit(1)
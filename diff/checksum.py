@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import click
 
 from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
@@ -5,7 +7,7 @@ from diff.core.cli import CliChecksum
 
 
 @click.command('calculate')
-@click.argument('path')
+@click.argument('paths', nargs=-1, required=True)
 @click.option(
     '--algo',
     '-a',
@@ -13,18 +15,37 @@ from diff.core.cli import CliChecksum
     default=DEFAULT_HASH_ALGORITHM,
     help='The preferred algorithm to hash the file with.'
 )
-def _calculate(path: str, algo: str):
+@click.option(
+    '--output',
+    '-o',
+    default=None,
+    help='Writes the hashes to a sha256sum compatible manifest file instead of printing them.'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    default=None,
+    help='The maximum number of files to hash in parallel.'
+)
+def _calculate(paths: tuple[str, ...], algo: str, output: str | None, workers: int | None):
     """
-    Computes the hash of a given file.
+    Computes the hash of one or more files.
 
-    path: The path to the file to compute the hash of. This must be an existing file and not a directory.
+    If a single file is specified its hash is printed. If multiple files or any directories are specified, or an
+    output file is specified, then the hash of every file, including every file nested within the directories, is
+    computed in parallel and written in a sha256sum compatible manifest format.
+
+    paths: The paths to the files, or directories, to compute the hash of.
     """
-    return CliChecksum().calculate(path, algo)
+    if len(paths) == 1 and output is None and Path(paths[0]).is_file():
+        return CliChecksum().calculate(paths[0], algo)
+    CliChecksum().calculate_manifest(list(paths), algo, output, workers)
 
 
 @click.command('verify')
-@click.argument('path')
-@click.argument('hash')
+@click.argument('path', required=False)
+@click.argument('hash', required=False)
 @click.option(
     '--algo',
     '-a',
@@ -32,14 +53,38 @@ def _calculate(path: str, algo: str):
     default=DEFAULT_HASH_ALGORITHM,
     help='The preferred algorithm to hash the file with.'
 )
-def _verify(path: str, hash: str, algo: str):
+@click.option(
+    '--manifest',
+    '-m',
+    default=None,
+    help='Verifies every file listed in a sha256sum compatible manifest instead of a single file.'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    default=None,
+    help='The maximum number of files to verify in parallel when verifying a manifest.'
+)
+def _verify(path: str | None, hash: str | None, algo: str, manifest: str | None, workers: int | None):
     """
     Computes the hash of a given file and compares said computed hash to the provided hash for equality.
 
+    When a manifest is specified every file listed in the manifest is verified in parallel, a summary is printed, and
+    the command exits with a status of 1 if any file does not match.
+
     path: The path to the file to compute the hash of. This must be an existing file and not a directory.
 
     hash: The hash previously computed to compare against.
     """
+    if manifest is not None:
+        if path is not None or hash is not None:
+            raise click.UsageError('A path and hash cannot be specified together with a manifest.')
+        if not CliChecksum().verify_manifest(manifest, algo, workers):
+            click.get_current_context().exit(1)
+        return
+    if path is None or hash is None:
+        raise click.UsageError('Both a path and a hash must be specified when not verifying a manifest.')
     return CliChecksum().verify(path, hash, algo)
 
 
@@ -64,6 +109,31 @@ def _compare(first: str, second: str, algo: str):
     CliChecksum().compare(first, second, algo)
 
 
+@click.command('diff-ranges')
+@click.argument('scan')
+@click.argument('relative_path')
+@click.argument('target', required=False)
+@click.option(
+    '--against-scan',
+    '-s',
+    default=None,
+    help='Compares the chunk checksums against the same file in another scan instead of a file on disk.'
+)
+def _diff_ranges(scan: str, relative_path: str, target: str | None, against_scan: str | None):
+    """
+    Lists the byte ranges of a large file that have changed using the chunk checksums recorded by a scan.
+
+    The scan must have been created using the --chunk-threshold option of the scan folder command.
+
+    scan: The path to the yaml file containing the results of the scan.
+
+    relative_path: The path of the file, relative to the scanned directory, whose changes should be located.
+
+    target: The file on disk to compare against. Defaults to the file at the location it was originally scanned.
+    """
+    CliChecksum().diff_ranges(scan, relative_path, target, against_scan)
+
+
 @click.group()
 def checksum():
     pass
@@ -72,3 +142,4 @@ def checksum():
 checksum.add_command(_calculate)
 checksum.add_command(_verify)
 checksum.add_command(_compare)
+checksum.add_command(_diff_ranges)
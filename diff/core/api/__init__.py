@@ -0,0 +1,15 @@
+from diff.core.util import lazy_exports
+
+
+# Imported on first access, the same as every other package, so embedding the API only loads the modules it uses.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'DiffTools': '.diff_tools',
+    'FileHash': '.results',
+    'Difference': '.results',
+    'Node': 'diff.core.tree',
+    'TreeEntry': 'diff.core.tree',
+    'PathFilter': 'diff.core.tree',
+    'build_path_filter': 'diff.core.tree',
+    'DiffResult': 'diff.core.tree.diff',
+    'FirstDifference': 'diff.core.tree.diff'
+})
@@ -0,0 +1,222 @@
+from typing import Dict, Any, Iterable, Iterator, Deque, Tuple, Callable, Final
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+import os
+import threading
+
+from diff.core.tree import (
+    Node,
+    TreeLoader,
+    YamlSerialization,
+    YAML_SERIALIZATION_SINGLETON,
+    DEFAULT_READ_ORDER,
+    DEFAULT_CHUNK_SIZE,
+    PathFilter,
+    DEFAULT_PATH_FILTER,
+    TreeEntry
+)
+from diff.core.tree.diff import (
+    DiffResult,
+    FirstDifference,
+    TreeDiff,
+    TREE_DIFF_SINGLETON,
+    QuickDiff,
+    QuickDiffSide,
+    DiskSide,
+    ScanSide
+)
+from diff.core.util import Checksum, CHECKSUM_SINGLETON, ProgressReporter, Profiler, PROFILER_SINGLETON, either
+
+from .results import FileHash, Difference
+
+
+# The number of files queued for hashing, per worker, ahead of the file whose checksum is yielded next.
+_QUEUED_FILES_PER_WORKER: Final[int] = 4
+
+
+class DiffTools:
+
+    """
+    The programmatic API for embedding scans, hashes and diffs in another application.
+
+    Every result is returned as a Node, a typed result object or a generator, nothing is printed and no message is
+    formatted. Progress is only reported to the on_progress callback, as the same snapshots the json progress mode
+    writes. The pool hashing files, and comparing checksums for first_difference, is created the first time it is
+    needed and reused by every following call until the instance is closed.
+    """
+
+    def __init__(self,
+                 max_workers: int | None = None,
+                 on_progress: Callable[[Dict[str, Any]], None] | None = None,
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 yaml_serialization: YamlSerialization = YAML_SERIALIZATION_SINGLETON,
+                 tree_diff: TreeDiff = TREE_DIFF_SINGLETON,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        """
+        :param max_workers: The number of workers in the pool. Defaults to the default of a ThreadPoolExecutor.
+        :param on_progress: If specified, called periodically with a snapshot of each stage of work in progress,
+            such as listing or hashing the files of a tree, and once more when each stage completes.
+        """
+        self._max_workers = max_workers
+        self._checksum = checksum
+        self._yaml_serialization = yaml_serialization
+        self._tree_diff = tree_diff
+        # Each instance has its own reporter so the progress of one is never reported to the callback of another.
+        self._tree_loader = TreeLoader(yaml_serialization, checksum, ProgressReporter(callback=on_progress), profiler)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def scan(self,
+             path: Path,
+             checksum_algo: str | None = None,
+             read_order: str = DEFAULT_READ_ORDER,
+             chunk_threshold: int | None = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE,
+             path_filter: PathFilter = DEFAULT_PATH_FILTER) -> Node:
+        """
+        Reads the tree of a directory on disk.
+
+        :param checksum_algo: If specified, the checksum of every file is computed with this algorithm.
+        :return: The root of the tree. See TreeLoader.read_tree_from_disk for the remaining parameters.
+        """
+        return self._tree_loader.read_tree_from_disk(
+            path,
+            checksum_algo is not None,
+            checksum_algo,
+            read_order,
+            chunk_threshold,
+            chunk_size,
+            path_filter
+        )
+
+    def walk(self,
+             path: Path,
+             checksum_algo: str | None = None,
+             path_filter: PathFilter = DEFAULT_PATH_FILTER) -> Iterator[TreeEntry]:
+        """
+        Walks a directory on disk one entry at a time, without building a tree.
+
+        :param checksum_algo: If specified, the checksum of every file is computed with this algorithm.
+        :return: The path relative to the directory, the size, which is None for directories, and the checksum of
+            every entry as it is found.
+        """
+        return self._tree_loader.read_entries_from_disk(path, checksum_algo is not None, checksum_algo, path_filter)
+
+    def load_scan(self, file_path: Path) -> Node:
+        """
+        Reads the tree saved to a scan file.
+        """
+        return self._tree_loader.read_tree_from_yaml(file_path)
+
+    def save_scan(self, tree: Node, file_path: Path):
+        """
+        Saves a tree to a scan file, in the same format as the scan folder command.
+        """
+        self._yaml_serialization.to_yaml_file(file_path, tree)
+
+    def hash_files(self, paths: Iterable[Path], algo: str) -> Iterator[FileHash]:
+        """
+        Computes the checksum of every file using the pool, in the order the files were given.
+
+        Only a few files per worker are queued ahead of the one whose checksum is yielded next, so paths can be a
+        generator of any length. A file that cannot be read is yielded with its error instead of stopping the
+        remaining files from being hashed.
+        """
+        executor = self._get_executor()
+        window = either(self._max_workers, os.cpu_count() or 1) * _QUEUED_FILES_PER_WORKER
+        pending: Deque[Tuple[Path, Future]] = deque()
+        try:
+            for path in paths:
+                pending.append((path, executor.submit(self._checksum.compute_file_checksum, path, algo)))
+                if len(pending) >= window:
+                    yield _to_file_hash(*pending.popleft())
+            while len(pending) > 0:
+                yield _to_file_hash(*pending.popleft())
+        finally:
+            # Closing the generator early cancels the files that were queued but never yielded.
+            for _, future in pending:
+                future.cancel()
+
+    def diff(self, first: Node, second: Node) -> DiffResult:
+        """
+        Identifies every difference between two trees.
+        """
+        return self._tree_diff.diff_between_trees(first, second)
+
+    def differences(self, first: Node, second: Node) -> Iterator[Difference]:
+        """
+        Identifies every difference between two trees, one difference at a time. Files that changed are yielded first,
+        followed by the entries missing from the first tree and then the entries missing from the second tree.
+        """
+        diff_result = self.diff(first, second)
+        for first_node, second_node in diff_result.similar:
+            yield Difference(_relative_path(first, first_node), _reason(first_node, second_node), first_node, second_node)
+        for node in diff_result.first_tree.missing:
+            yield Difference(_relative_path(second, node), FirstDifference.MISSING_FROM_FIRST, None, node)
+        for node in diff_result.second_tree.missing:
+            yield Difference(_relative_path(first, node), FirstDifference.MISSING_FROM_SECOND, node, None)
+
+    def first_difference(self,
+                         first: Node | Path,
+                         second: Node | Path,
+                         checksum_algo: str | None = None,
+                         path_filter: PathFilter = DEFAULT_PATH_FILTER) -> FirstDifference | None:
+        """
+        Compares two trees, each either a directory on disk or a tree read from a scan file, and stops at the first
+        difference.
+
+        :param checksum_algo: If specified, the checksums of files with the same size are also compared, computing
+            the checksum of the files on disk with this algorithm.
+        :return: The first difference found or None if both trees are identical.
+        """
+        return QuickDiff(executor=self._get_executor()).first_difference(
+            self._side(first, checksum_algo, path_filter),
+            self._side(second, checksum_algo, path_filter),
+            checksum_algo is not None
+        )
+
+    def close(self):
+        """
+        Shuts down the pool, if it was created, once every queued task completed.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'DiffTools':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def _side(self, tree: Node | Path, checksum_algo: str | None, path_filter: PathFilter) -> QuickDiffSide:
+        if isinstance(tree, Node):
+            return ScanSide(tree)
+        return DiskSide(tree, checksum_algo, self._tree_loader, self._checksum, path_filter)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='diff-tools')
+            return self._executor
+
+
+def _to_file_hash(path: Path, future: Future) -> FileHash:
+    try:
+        return FileHash(path, future.result())
+    except OSError as e:
+        return FileHash(path, None, e)
+
+
+def _reason(first: Node, second: Node) -> str:
+    if (first.size is None) != (second.size is None):
+        return FirstDifference.TYPE
+    if first.size != second.size:
+        return FirstDifference.SIZE
+    return FirstDifference.CHECKSUM
+
+
+def _relative_path(root: Node, node: Node) -> str:
+    return os.path.relpath(node.path_to_node(), root.path_to_node())
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from diff.core.tree import Node
+
+
+class FileHash:
+
+    """
+    The checksum of a single file, or the error that prevented the file from being read.
+    """
+
+    def __init__(self, path: Path, checksum: str | None, error: OSError | None = None):
+        self.path = path
+        self.checksum = checksum
+        self.error = error
+
+
+class Difference:
+
+    """
+    A single difference between two trees. The reason is one of the reasons of a FirstDifference. The nodes hold the
+    entry of each tree, with the node of the tree the entry is missing from set to None.
+    """
+
+    def __init__(self, relative_path: str, reason: str, first: Node | None, second: Node | None):
+        self.relative_path = relative_path
+        self.reason = reason
+        self.first = first
+        self.second = second
@@ -1,3 +1,12 @@
-from .cli_between import CliBetween as CliBetween
-from .cli_checksum import CliChecksum as CliChecksum
-from .cli_scan import CliScan as CliScan
+from diff.core.util import lazy_exports
+
+
+# Every command only uses one of these so each is imported, along with its dependencies, on first access.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'CliBetween': '.cli_between',
+    'CliChecksum': '.cli_checksum',
+    'CliDupes': '.cli_dupes',
+    'CliReplicas': '.cli_replicas',
+    'CliScan': '.cli_scan',
+    'CliServe': '.cli_serve'
+})
@@ -1,19 +1,29 @@
+from typing import Callable, Tuple
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 
 from diff.core.tree.diff import (
     TreeDiff,
     TREE_DIFF_SINGLETON,
     SimilarityPrinter,
     SIMILARITY_PRINTER_SINGLETON,
-    DiffMessageDecorator
+    DiffMessageDecorator,
+    QuickDiff,
+    QUICK_DIFF_SINGLETON,
+    ListingOptions,
+    DEFAULT_LISTING_OPTIONS,
+    DiskSide,
+    ExternalTreeDiff,
+    EXTERNAL_TREE_DIFF_SINGLETON
 )
 from diff.core.tree import (
     TreeLoader,
     TREE_LOADER_SINGLETON,
-    Node
+    DEFAULT_READ_ORDER,
+    PathFilter,
+    DEFAULT_PATH_FILTER
 )
 from diff.core.errors import NotADirectoryException
+from diff.core.util import IoScheduler, IO_SCHEDULER_SINGLETON, DEFAULT_MEMORY_BUDGET
 
 
 class CliBetween:
@@ -21,12 +31,80 @@ class CliBetween:
     def __init__(self,
                  tree_diff: TreeDiff = TREE_DIFF_SINGLETON,
                  tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
-                 similarity_printer: SimilarityPrinter = SIMILARITY_PRINTER_SINGLETON):
+                 similarity_printer: SimilarityPrinter = SIMILARITY_PRINTER_SINGLETON,
+                 quick_diff: QuickDiff = QUICK_DIFF_SINGLETON,
+                 io_scheduler: IoScheduler = IO_SCHEDULER_SINGLETON,
+                 external_tree_diff: ExternalTreeDiff = EXTERNAL_TREE_DIFF_SINGLETON,
+                 print_function: Callable[[str], None] = print):
         self._tree_diff = tree_diff
         self._tree_loader = tree_loader
         self._similarity_printer = similarity_printer
+        self._quick_diff = quick_diff
+        self._io_scheduler = io_scheduler
+        self._external_tree_diff = external_tree_diff
+        self._print_function = print_function
+
+    def between(self,
+                first: str,
+                second: str,
+                checksum: bool,
+                algo: str,
+                read_order: str = DEFAULT_READ_ORDER,
+                path_filter: PathFilter = DEFAULT_PATH_FILTER,
+                listing_options: ListingOptions = DEFAULT_LISTING_OPTIONS):
+        first_path, second_path = self._validate_paths(first, second)
+
+        self._print_scanning(first_path, second_path)
+        # Both paths are scanned in parallel unless they live on the same rotational disk.
+        first_tree, second_tree = self._io_scheduler.map(
+            lambda path: self._tree_loader.read_tree_from_disk(path, checksum, algo, read_order, path_filter=path_filter),
+            [first_path, second_path]
+        )
 
-    def between(self, first: str, second: str, checksum: bool, algo: str):
+        diff_result = self._tree_diff.diff_between_trees(first_tree, second_tree)
+        self._similarity_printer.print_similarity_results(diff_result, _Decorator(first_path, second_path), listing_options)
+
+    def external_between(self,
+                         first: str,
+                         second: str,
+                         checksum: bool,
+                         algo: str,
+                         path_filter: PathFilter = DEFAULT_PATH_FILTER,
+                         memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                         listing_options: ListingOptions = DEFAULT_LISTING_OPTIONS):
+        first_path, second_path = self._validate_paths(first, second)
+
+        # The entries of the first directory that fit in memory are kept while the second directory is sorted, so each
+        # directory is sorted within half of the budget. The directories are walked one after the other for the same
+        # reason.
+        self._print_scanning(first_path, second_path)
+        with self._external_tree_diff.sort_tree_from_disk(first_path, checksum, algo, path_filter, memory_budget // 2) as first_tree, \
+                self._external_tree_diff.sort_tree_from_disk(second_path, checksum, algo, path_filter, memory_budget // 2) as second_tree:
+            diff_result = self._external_tree_diff.diff_between_sorted_trees(first_tree, second_tree)
+
+        self._similarity_printer.print_similarity_results(diff_result, _Decorator(first_path, second_path), listing_options)
+
+    def quick_between(self,
+                      first: str,
+                      second: str,
+                      checksum: bool,
+                      algo: str,
+                      path_filter: PathFilter = DEFAULT_PATH_FILTER) -> bool:
+        first_path, second_path = self._validate_paths(first, second)
+
+        difference = self._quick_diff.first_difference(
+            DiskSide(first_path, algo, self._tree_loader, path_filter=path_filter),
+            DiskSide(second_path, algo, self._tree_loader, path_filter=path_filter),
+            checksum
+        )
+        self._similarity_printer.print_first_difference(difference, _Decorator(first_path, second_path))
+        return difference is None
+
+    def _print_scanning(self, *paths: Path):
+        for path in paths:
+            self._print_function(f'Scanning contents of: [{path}]')
+
+    def _validate_paths(self, first: str, second: str) -> Tuple[Path, Path]:
         first_path = Path(first).absolute()
         if not first_path.is_dir():
             raise NotADirectoryException('first path', first_path)
@@ -38,31 +116,30 @@ class CliBetween:
         if first == second:
             raise ValueError('The first path to scan and the second path to scan cannot refer to the same location.')
 
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            first_execution = executor.submit(self._tree_loader.read_tree_from_disk, first_path, checksum, algo)
-            second_execution = executor.submit(self._tree_loader.read_tree_from_disk, second_path, checksum, algo)
-            first_tree = first_execution.result()
-            second_tree = second_execution.result()
-
-        diff_result = self._tree_diff.diff_between_trees(first_tree, second_tree)
-        self._similarity_printer.print_similarity_results(diff_result, _Decorator(first_tree, second_tree))
+        return first_path, second_path
 
 
 class _Decorator(DiffMessageDecorator):
 
-    def __init__(self, first_tree: Node, second_tree: Node):
-        self._first = first_tree
-        self._second = second_tree
+    def __init__(self, first_path: Path, second_path: Path):
+        self._first = first_path
+        self._second = second_path
 
     def first_tree_has_diff_message(self) -> str:
-        return (f'The following files were found in [{self._second.path_to_node()}] '
-                f'but not in [{self._first.path_to_node()}]:')
+        return (f'The following files were found in [{self._second}] '
+                f'but not in [{self._first}]:')
 
     def first_tree_no_diff_message(self) -> str:
-        return f'All files found in [{self._second.path_to_node()}] were also found in [{self._first.path_to_node()}].'
+        return f'All files found in [{self._second}] were also found in [{self._first}].'
 
     def second_tree_has_diff_message(self) -> str:
-        return f'The following files were found in [{self._first.path_to_node()}] but not in [{self._second.path_to_node()}]:'
+        return f'The following files were found in [{self._first}] but not in [{self._second}]:'
 
     def second_tree_no_diff_message(self) -> str:
-        return f'All files found in [{self._first.path_to_node()}] were also found in [{self._second.path_to_node()}].'
+        return f'All files found in [{self._first}] were also found in [{self._second}].'
+
+    def first_tree_label(self) -> str:
+        return f'[{self._first}]'
+
+    def second_tree_label(self) -> str:
+        return f'[{self._second}]'
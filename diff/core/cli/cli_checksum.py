@@ -1,23 +1,104 @@
-from typing import Callable
+from typing import List, Tuple, Callable
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
+import os
 
-from diff.core.errors import NotAFileException
-from diff.core.util import Checksum, CHECKSUM_SINGLETON
+from diff.core.errors import NotAFileException, MissingPathException
+from diff.core.util import (
+    Checksum,
+    CHECKSUM_SINGLETON,
+    ChecksumManifest,
+    CHECKSUM_MANIFEST_SINGLETON,
+    ProgressReporter,
+    PROGRESS_REPORTER_SINGLETON
+)
+from diff.core.tree import TreeLoader, TREE_LOADER_SINGLETON, Node
+from diff.core.tree.diff import ChunkDiff, CHUNK_DIFF_SINGLETON
 
 
 class CliChecksum:
 
     def __init__(self,
                  checksum: Checksum = CHECKSUM_SINGLETON,
-                 print_function: Callable[[str], None] = print):
+                 print_function: Callable[[str], None] = print,
+                 tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
+                 chunk_diff: ChunkDiff = CHUNK_DIFF_SINGLETON,
+                 checksum_manifest: ChecksumManifest = CHECKSUM_MANIFEST_SINGLETON,
+                 progress_reporter: ProgressReporter = PROGRESS_REPORTER_SINGLETON):
         self._checksum = checksum
         self._print_function = print_function
+        self._tree_loader = tree_loader
+        self._chunk_diff = chunk_diff
+        self._checksum_manifest = checksum_manifest
+        self._progress_reporter = progress_reporter
 
     def calculate(self, path: str, algo: str):
         file_hash = self._compute_file_hash(path, algo)
         self._print_function(f'The {algo} file hash is: {file_hash}')
 
+    def calculate_manifest(self, paths: List[str], algo: str, output: str | None, workers: int | None):
+        output_path = Path(output).absolute() if output is not None else None
+        if output_path is not None and output_path.is_file():
+            raise ValueError(f'The output path already exists. Delete the following file and try again: [{output_path}]')
+
+        files = self._collect_files(paths)
+        with self._progress_reporter.stage('Hashing', len(files)) as progress:
+            def compute_checksum(file: Path) -> str:
+                file_checksum = self._checksum.compute_file_checksum(file, algo)
+                progress.file_completed(file.stat().st_size)
+                return file_checksum
+
+            # Deferred, like every use of the pool below, since hashing a single file never needs it.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                checksums = list(executor.map(compute_checksum, files))
+
+        # Paths are written relative to the manifest so the manifest can be verified with sha256sum -c from
+        # the directory the manifest is in.
+        entries = [
+            (file_checksum, os.path.relpath(file.absolute(), output_path.parent) if output_path is not None else str(file))
+            for file, file_checksum in zip(files, checksums, strict=True)
+        ]
+
+        if output_path is None:
+            for file_checksum, file in entries:
+                self._print_function(self._checksum_manifest.format_line(file_checksum, file))
+            return
+
+        self._checksum_manifest.write_manifest(output_path, entries)
+        self._print_function(f'The {algo} hashes of {len(entries)} files saved to: [{output_path}]')
+
+    def verify_manifest(self, manifest: str, algo: str, workers: int | None) -> bool:
+        manifest_path = Path(manifest).absolute()
+        if not manifest_path.is_file():
+            raise NotAFileException('manifest', manifest_path)
+
+        entries = self._checksum_manifest.read_manifest(manifest_path)
+
+        with self._progress_reporter.stage('Verifying', len(entries)) as progress:
+            def verify_entry(entry: Tuple[str, str]) -> str:
+                file = manifest_path.parent.joinpath(entry[1])
+                try:
+                    result = 'OK' if self._checksum.compute_file_checksum(file, algo) == entry[0] else 'FAILED'
+                    progress.file_completed(file.stat().st_size)
+                    return result
+                except OSError:
+                    progress.file_completed()
+                    return 'FAILED open or read'
+
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(verify_entry, entries))
+
+        for entry, result in zip(entries, results, strict=True):
+            if result != 'OK':
+                self._print_function(f'{entry[1]}: {result}')
+
+        failed = sum(1 for result in results if result == 'FAILED')
+        unreadable = sum(1 for result in results if result not in ['OK', 'FAILED'])
+        self._print_function(f'Verified {len(entries)} files: {len(entries) - failed - unreadable} OK, '
+                             f'{failed} FAILED, {unreadable} could not be read.')
+        return failed == 0 and unreadable == 0
+
     def verify(self, path: str, hash: str, algo: str):
         hash = hash.upper()
         file_hash = self._compute_file_hash(path, algo)
@@ -41,6 +122,7 @@ class CliChecksum:
         if first_path == second_path:
             raise ValueError('The first file path and the second file path cannot refer to the same file. Specify different files and try again.')
 
+        from concurrent.futures import ThreadPoolExecutor
         with ThreadPoolExecutor(max_workers=2) as executor:
             first_execution = executor.submit(self._checksum.compute_file_checksum, first_path, algo)
             second_execution = executor.submit(self._checksum.compute_file_checksum, second_path, algo)
@@ -55,6 +137,79 @@ class CliChecksum:
             self._print_function(f'\t{first} -> {first_result}')
             self._print_function(f'\t{second} -> {second_result}')
 
+    def diff_ranges(self, scan: str, relative_path: str, target: str | None, against_scan: str | None):
+        scan_tree = self._read_scan(scan)
+        manifest = self._find_node(scan_tree, relative_path, scan)
+
+        if against_scan is not None:
+            if target is not None:
+                raise ValueError('A file on disk and another scan to compare against cannot both be specified.')
+            other_tree = self._read_scan(against_scan)
+            if other_tree.checksum_algo != scan_tree.checksum_algo:
+                raise ValueError(f'Both scans must use the same checksum algorithm but found [{scan_tree.checksum_algo}] '
+                                 f'and [{other_tree.checksum_algo}].')
+            other_manifest = self._find_node(other_tree, relative_path, against_scan)
+            ranges = self._chunk_diff.diff_manifests(manifest, other_manifest)
+            compared_to = f'[{against_scan}]'
+        else:
+            target_path = Path(target) if target is not None else manifest.path_to_node()
+            if not target_path.is_file():
+                raise NotAFileException('target', target_path)
+            if scan_tree.checksum_algo is None:
+                raise ValueError(f'The scan file does not specify the algorithm used to compute its checksums: [{scan}]')
+            ranges = self._chunk_diff.diff_manifest_against_file(manifest, target_path, scan_tree.checksum_algo)
+            compared_to = f'[{target_path}]'
+
+        if len(ranges) == 0:
+            self._print_function(f'All chunks of [{relative_path}] match {compared_to}.')
+            return
+
+        changed = sum(end - start for start, end in ranges)
+        self._print_function(f'{changed} bytes of [{relative_path}] differ from {compared_to} in the following ranges:')
+        for start, end in ranges:
+            self._print_function(f'\t[{start}, {end}) {end - start} bytes')
+
+    def _collect_files(self, paths: List[str]) -> List[Path]:
+        files: List[Path] = []
+        for path in paths:
+            file_path = Path(path)
+            if file_path.is_file():
+                files.append(file_path)
+            elif file_path.is_dir():
+                files.extend(self._collect_directory(file_path))
+            else:
+                raise MissingPathException('file or directory', 'path', file_path)
+        return files
+
+    def _collect_directory(self, directory: Path) -> List[Path]:
+        """
+        Lists every file nested within a directory, sorted by name within each directory and visiting each directory
+        before its sub-directories. Symbolic links to directories are not followed.
+        """
+        files: List[Path] = []
+        pending = [directory]
+        while len(pending) > 0:
+            with os.scandir(pending.pop()) as entries:
+                sorted_entries = sorted(entries, key=lambda entry: entry.name)
+            files.extend(Path(entry.path) for entry in sorted_entries if not entry.is_dir())
+            pending.extend(
+                Path(entry.path) for entry in reversed(sorted_entries) if entry.is_dir() and not entry.is_symlink()
+            )
+        return files
+
+    def _read_scan(self, scan: str) -> Node:
+        scan_path = Path(scan).absolute()
+        if not scan_path.is_file():
+            raise NotAFileException('scan', scan_path)
+        self._print_function(f'Reading contents of scan file: [{scan_path}]')
+        return self._tree_loader.read_tree_from_yaml(scan_path)
+
+    def _find_node(self, scan_tree: Node, relative_path: str, scan: str) -> Node:
+        node = scan_tree.find_node(relative_path)
+        if node is None or node.size is None:
+            raise ValueError(f'No file with the relative path [{relative_path}] could be found in the scan: [{scan}]')
+        return node
+
     def _compute_file_hash(self, path: str, algo: str) -> str:
         path_to_compute = Path(path)
         if not path_to_compute.is_file():
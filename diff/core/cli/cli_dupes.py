@@ -0,0 +1,52 @@
+from typing import List, Callable
+from pathlib import Path
+
+from diff.core.tree import TreeLoader, TREE_LOADER_SINGLETON, Node
+from diff.core.tree.dupes import DuplicateFinder, DUPLICATE_FINDER_SINGLETON
+from diff.core.errors import NotADirectoryException
+
+
+class CliDupes:
+
+    def __init__(self,
+                 tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
+                 duplicate_finder: DuplicateFinder = DUPLICATE_FINDER_SINGLETON,
+                 print_function: Callable[[str], None] = print):
+        self._tree_loader = tree_loader
+        self._duplicate_finder = duplicate_finder
+        self._print_function = print_function
+
+    def dupes(self, paths: List[str], algo: str, workers: int | None):
+        if len(paths) == 0:
+            raise ValueError('At least one path to scan for duplicates must be specified.')
+
+        root_paths: List[Path] = []
+        for path in paths:
+            root_path = Path(path).absolute()
+            if not root_path.is_dir():
+                raise NotADirectoryException('path to scan', root_path)
+            root_paths.append(root_path)
+
+        for root_path in root_paths:
+            for other_path in root_paths:
+                if root_path is not other_path and root_path.is_relative_to(other_path):
+                    raise ValueError(f'The paths to scan cannot overlap. Remove one of the following paths and try again: [{other_path}], [{root_path}]')
+
+        trees = [self._read_tree(root_path, algo) for root_path in root_paths]
+        groups = self._duplicate_finder.find_duplicates(trees, algo, workers)
+
+        self._print_function('\n----- Duplicates -----')
+        if len(groups) == 0:
+            self._print_function('No duplicate files were found.')
+            return
+
+        reclaimable = sum(group.reclaimable_size() for group in groups)
+        self._print_function(f'Found {len(groups)} groups of duplicate files. Removing the duplicates would free {reclaimable} bytes.')
+        for group in groups:
+            self._print_function(f'\n{len(group.nodes)} files of {group.size} bytes with the {algo} hash {group.checksum}:')
+            for node in group.nodes:
+                self._print_function(f'\t[{node.path_to_node()}]')
+
+    def _read_tree(self, root_path: Path, algo: str) -> Node:
+        self._print_function(f'Scanning contents of: [{root_path}]')
+        return self._tree_loader.read_tree_from_disk(root_path, False, algo)
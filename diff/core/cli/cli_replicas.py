@@ -0,0 +1,73 @@
+from typing import List, Callable
+from pathlib import Path
+
+from diff.core.tree.diff import ReplicaDiff, REPLICA_DIFF_SINGLETON, ReplicaDifference
+from diff.core.tree import TreeLoader, TREE_LOADER_SINGLETON, Node, DEFAULT_READ_ORDER
+from diff.core.errors import NotADirectoryException
+from diff.core.util import IoScheduler, IO_SCHEDULER_SINGLETON
+
+
+class CliReplicas:
+
+    def __init__(self,
+                 replica_diff: ReplicaDiff = REPLICA_DIFF_SINGLETON,
+                 tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
+                 print_function: Callable[[str], None] = print,
+                 io_scheduler: IoScheduler = IO_SCHEDULER_SINGLETON):
+        self._replica_diff = replica_diff
+        self._tree_loader = tree_loader
+        self._print_function = print_function
+        self._io_scheduler = io_scheduler
+
+    def replicas(self, paths: List[str], checksum: bool, algo: str, read_order: str = DEFAULT_READ_ORDER):
+        if len(paths) < 2:
+            raise ValueError('At least two replicas must be specified to compare.')
+
+        root_paths: List[Path] = []
+        for path in paths:
+            root_path = Path(path).absolute()
+            if not root_path.is_dir():
+                raise NotADirectoryException('replica', root_path)
+            if root_path in root_paths:
+                raise ValueError(f'The same replica cannot be specified more than once: [{root_path}]')
+            root_paths.append(root_path)
+
+        for root_path in root_paths:
+            self._print_function(f'Scanning contents of: [{root_path}]')
+        # Replicas on different devices are scanned in parallel while replicas sharing a rotational disk are
+        # scanned one after the other.
+        trees = self._io_scheduler.map(
+            lambda path: self._tree_loader.read_tree_from_disk(path, checksum, algo, read_order),
+            root_paths,
+            len(root_paths)
+        )
+
+        differences = self._replica_diff.diff_between_replicas(trees)
+        self._print_differences(trees, differences)
+
+    def _print_differences(self, trees: List[Node], differences: List[ReplicaDifference]):
+        self._print_function('\n----- Missing -----')
+        missing = [difference for difference in differences if len(difference.missing) > 0]
+        if len(missing) > 0:
+            self._print_function('The following files are missing from one or more replicas:')
+            for difference in missing:
+                replicas = ', '.join(f'[{trees[position].path_to_node()}]' for position in difference.missing)
+                self._print_function(f'\t[{difference.relative_path}] is missing from: {replicas}')
+        else:
+            self._print_function('All files were found in every replica.')
+
+        self._print_function('')
+
+        self._print_function('----- Different -----')
+        different = [difference for difference in differences if difference.different]
+        if len(different) > 0:
+            self._print_function('The following files have a different file size or checksum between replicas:')
+            for difference in different:
+                self._print_function(f'\t[{difference.relative_path}]')
+                for position, node in enumerate(difference.nodes):
+                    if node is not None:
+                        self._print_function(f'\t\t[{trees[position].path_to_node()}] size: {node.size}, checksum: {node.checksum}')
+        else:
+            self._print_function('No files with different checksums or file sizes were found between replicas.')
+
+        self._print_function('')
@@ -1,20 +1,41 @@
-from typing import Callable
+from typing import Dict, Any, Callable, Iterable, Tuple
 from pathlib import Path
+import json
+import os
 
 from diff.core.tree import (
     TreeLoader,
     TREE_LOADER_SINGLETON,
     YamlSerialization,
-    YAML_SERIALIZATION_SINGLETON
+    YAML_SERIALIZATION_SINGLETON,
+    Node,
+    DEFAULT_READ_ORDER,
+    DEFAULT_CHUNK_SIZE,
+    PathFilter,
+    DEFAULT_PATH_FILTER,
+    ScanWatcher,
+    SCAN_WATCHER_SINGLETON,
+    DEFAULT_FLUSH_INTERVAL,
+    ScanJournal,
+    journal_path_for
 )
 from diff.core.tree.diff import (
     DiffMessageDecorator,
     TreeDiff,
     TREE_DIFF_SINGLETON,
     SimilarityPrinter,
-    SIMILARITY_PRINTER_SINGLETON
+    SIMILARITY_PRINTER_SINGLETON,
+    QuickDiff,
+    QUICK_DIFF_SINGLETON,
+    DiskSide,
+    ScanSide,
+    ExternalTreeDiff,
+    EXTERNAL_TREE_DIFF_SINGLETON,
+    ListingOptions,
+    DEFAULT_LISTING_OPTIONS
 )
 from diff.core.errors import NotADirectoryException, NotAFileException
+from diff.core.util import DEFAULT_MEMORY_BUDGET
 
 
 class CliScan:
@@ -24,15 +45,31 @@ class CliScan:
                  tree_diff: TreeDiff = TREE_DIFF_SINGLETON,
                  yaml_serialization: YamlSerialization = YAML_SERIALIZATION_SINGLETON,
                  similarity_printer: SimilarityPrinter = SIMILARITY_PRINTER_SINGLETON,
-                 print_function: Callable[[str], None] = print):
+                 print_function: Callable[[str], None] = print,
+                 quick_diff: QuickDiff = QUICK_DIFF_SINGLETON,
+                 scan_watcher: ScanWatcher = SCAN_WATCHER_SINGLETON,
+                 external_tree_diff: ExternalTreeDiff = EXTERNAL_TREE_DIFF_SINGLETON):
 
         self._tree_loader = tree_loader
         self._tree_diff = tree_diff
         self._yaml_serialization = yaml_serialization
         self._similarity_printer = similarity_printer
         self._print_function = print_function
+        self._quick_diff = quick_diff
+        self._scan_watcher = scan_watcher
+        self._external_tree_diff = external_tree_diff
 
-    def folder(self, path: str, output: str, checksum: bool, algo: str):
+    def folder(self,
+               path: str,
+               output: str,
+               checksum: bool,
+               algo: str,
+               read_order: str = DEFAULT_READ_ORDER,
+               chunk_threshold: int | None = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               path_filter: PathFilter = DEFAULT_PATH_FILTER,
+               resume: bool = False,
+               record_journal: bool = False):
         path_to_scan = Path(path).absolute()
         if not path_to_scan.is_dir():
             raise NotADirectoryException('path to scan', path_to_scan)
@@ -41,25 +78,171 @@ class CliScan:
         if output_path.is_file():
             raise ValueError(f'The output path already exists. Delete the following file and try again: [{output_path}]')
 
-        root_node = self._tree_loader.read_tree_from_disk(path_to_scan, checksum, algo)
+        if chunk_threshold is not None and not checksum:
+            raise ValueError('Chunk checksums can only be recorded when the checksum of each file is also computed.')
+
+        if (resume or record_journal) and not checksum:
+            raise ValueError('A scan can only be journaled and resumed when the checksum of each file is also computed.')
+
+        # Only the checksums are journaled, listing the directory again is quick compared to hashing every file.
+        journal = None
+        if resume or record_journal:
+            journal_path = journal_path_for(output_path)
+            if not resume and journal_path.exists():
+                self._print_function(f'Discarding the journal of an earlier scan, use --resume to continue it instead: [{journal_path}]')
+            journal = ScanJournal(
+                journal_path,
+                self._journal_settings(path_to_scan, algo, chunk_threshold, chunk_size),
+                resume
+            )
+            if journal.resumed > 0:
+                self._print_function(f'Resuming scan with {journal.resumed} checksums from: [{journal.journal_path}]')
+
+        self._print_function(f'Scanning contents of: [{path_to_scan}]')
+        try:
+            root_node = self._tree_loader.read_tree_from_disk(
+                path_to_scan,
+                checksum,
+                algo,
+                read_order,
+                chunk_threshold,
+                chunk_size,
+                path_filter,
+                journal=journal
+            )
+        except KeyboardInterrupt:
+            if journal is not None:
+                self._print_function(f'Scan interrupted. Run the same command with --resume to continue from: [{journal.journal_path}]')
+            raise
+        finally:
+            if journal is not None:
+                journal.close()
 
         self._yaml_serialization.to_yaml_file(output_path, root_node)
+        if journal is not None:
+            journal.remove()
         self._print_function(f'Scan results saved to: [{output_path}]')
 
-    def verify(self, scan: str, checksum: bool):
+    def verify(self,
+               scan: str,
+               checksum: bool,
+               read_order: str = DEFAULT_READ_ORDER,
+               path_filter: PathFilter = DEFAULT_PATH_FILTER,
+               listing_options: ListingOptions = DEFAULT_LISTING_OPTIONS):
+        scan_tree, root_path = self._read_scan(scan)
+
+        self._print_function(f'Scanning contents of: [{root_path}]')
+        disk_tree = self._tree_loader.read_tree_from_disk(
+            root_path,
+            checksum,
+            scan_tree.checksum_algo,
+            read_order,
+            path_filter=path_filter
+        )
+
+        diff_result = self._tree_diff.diff_between_trees(scan_tree, disk_tree)
+        self._similarity_printer.print_similarity_results(diff_result, _Decorator(), listing_options)
+
+    def external_verify(self,
+                        scan: str,
+                        checksum: bool,
+                        path_filter: PathFilter = DEFAULT_PATH_FILTER,
+                        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                        listing_options: ListingOptions = DEFAULT_LISTING_OPTIONS):
+        scan_path = self._scan_path(scan)
+        # The entries of the scan that fit in memory are kept while the directory is sorted, so each is sorted within
+        # half of the budget.
+        self._print_function(f'Reading contents of scan file: [{scan_path}]')
+        with self._external_tree_diff.sort_tree_from_yaml(scan_path, memory_budget // 2) as scan_tree:
+            root_path = self._validate_scanned_directory(scan_tree.root)
+            self._print_function(f'Scanning contents of: [{root_path}]')
+            with self._external_tree_diff.sort_tree_from_disk(
+                    root_path,
+                    checksum,
+                    scan_tree.root.checksum_algo,
+                    path_filter,
+                    memory_budget // 2) as disk_tree:
+                diff_result = self._external_tree_diff.diff_between_sorted_trees(scan_tree, disk_tree)
+
+        self._similarity_printer.print_similarity_results(diff_result, _Decorator(), listing_options)
+
+    def quick_verify(self, scan: str, checksum: bool, path_filter: PathFilter = DEFAULT_PATH_FILTER) -> bool:
+        scan_tree, root_path = self._read_scan(scan)
+
+        difference = self._quick_diff.first_difference(
+            ScanSide(scan_tree),
+            DiskSide(root_path, scan_tree.checksum_algo, self._tree_loader, path_filter=path_filter),
+            checksum and scan_tree.checksum_algo is not None
+        )
+        self._similarity_printer.print_first_difference(difference, _Decorator())
+        return difference is None
+
+    def watch(self,
+              scan: str,
+              flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+              path_filter: PathFilter = DEFAULT_PATH_FILTER):
+        scan_path = self._scan_path(scan)
+        self._print_function(f'Reading contents of scan file: [{scan_path}]')
+        self._print_function(f'Watching for changes, press Ctrl+C to stop. Changes are saved every {flush_interval} seconds.')
+        try:
+            self._scan_watcher.watch(
+                scan_path,
+                flush_interval,
+                path_filter,
+                on_flush=lambda changes: self._print_function(f'Saved {changes} changes to: [{scan_path}]')
+            )
+        except KeyboardInterrupt:
+            self._print_function('Stopped watching for changes.')
+
+    def query(self, scan: str, paths: Iterable[str]):
+        """
+        Prints the size and checksum recorded by a scan for each path, one JSON object per line, in the order the paths
+        were given. Paths can be relative to the scanned directory or absolute paths within it.
+        """
+        # Nothing but the results is printed so the output can be piped to other tools.
+        scan_tree = self._tree_loader.read_tree_from_yaml(self._scan_path(scan))
+        root_path = scan_tree.path_to_node()
+        for path in paths:
+            relative_path = os.path.relpath(path, root_path) if os.path.isabs(path) else path
+            node = None if _is_outside(relative_path) else scan_tree.find_node(relative_path)
+            result: Dict[str, Any] = {'path': path, 'found': node is not None}
+            if node is not None:
+                result['type'] = 'file' if node.size is not None else 'directory'
+                result['size'] = node.size
+                result['checksum'] = node.checksum
+            self._print_function(json.dumps(result))
+
+    def _journal_settings(self,
+                          path_to_scan: Path,
+                          algo: str,
+                          chunk_threshold: int | None,
+                          chunk_size: int) -> Dict[str, Any]:
+        settings: Dict[str, Any] = {'path': str(path_to_scan), 'algo': algo, 'chunk_threshold': chunk_threshold}
+        if chunk_threshold is not None:
+            settings['chunk_size'] = chunk_size
+        return settings
+
+    def _read_scan(self, scan: str) -> Tuple[Node, Path]:
+        scan_path = self._scan_path(scan)
+        self._print_function(f'Reading contents of scan file: [{scan_path}]')
+        scan_tree = self._tree_loader.read_tree_from_yaml(scan_path)
+        return scan_tree, self._validate_scanned_directory(scan_tree)
+
+    def _scan_path(self, scan: str) -> Path:
         scan_path = Path(scan).absolute()
         if not scan_path.is_file():
             raise NotAFileException('previous scan', scan_path)
+        return scan_path
 
-        scan_tree = self._tree_loader.read_tree_from_yaml(scan_path)
+    def _validate_scanned_directory(self, scan_tree: Node) -> Path:
         root_path = scan_tree.path_to_node()
         if not root_path.is_dir():
             raise Exception(f'Could not verify scan because the original scanned directory could not be found at: [{root_path}]')
+        return root_path
 
-        disk_tree = self._tree_loader.read_tree_from_disk(root_path, checksum, scan_tree.checksum_algo)
 
-        diff_result = self._tree_diff.diff_between_trees(scan_tree, disk_tree)
-        self._similarity_printer.print_similarity_results(diff_result, _Decorator())
+def _is_outside(relative_path: str) -> bool:
+    return relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep)
 
 
 class _Decorator(DiffMessageDecorator):
@@ -75,3 +258,9 @@ class _Decorator(DiffMessageDecorator):
 
     def second_tree_no_diff_message(self) -> str:
         return 'All files listed in the previous scan result were found on disk.'
+
+    def first_tree_label(self) -> str:
+        return 'the previous scan result'
+
+    def second_tree_label(self) -> str:
+        return 'the files on disk'
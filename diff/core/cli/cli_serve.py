@@ -0,0 +1,62 @@
+from typing import List, Dict, Any, Callable, Final
+from pathlib import Path
+import json
+import signal
+
+from diff.core.server import ScanService, ScanServer, ScanClient, CachedChecksum, DEFAULT_MAX_CACHED_CHECKSUMS
+
+
+# The arguments of each action that are paths on disk. They are made absolute before being sent since the server
+# resolves relative paths against its own working directory. The path of a lookup or verify is relative to the scan.
+_FILE_ARGUMENTS: Final[Dict[str, List[str]]] = {
+    'load': ['scan'],
+    'lookup': ['scan'],
+    'verify': ['scan'],
+    'diff': ['first', 'second'],
+    'hash': ['path']
+}
+
+
+class CliServe:
+
+    def __init__(self, print_function: Callable[[str], None] = print):
+        self._print_function = print_function
+
+    def serve(self, socket_path: str, workers: int | None = None, max_checksums: int = DEFAULT_MAX_CACHED_CHECKSUMS):
+        service = ScanService(CachedChecksum(max_checksums), hash_workers=workers)
+        # Stopping the server with SIGTERM, as service managers do, cleans up the same way Ctrl+C does.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            with ScanServer(Path(socket_path).absolute(), service) as server:
+                self._print_function(f'Serving requests on: [{server.socket_path}], press Ctrl+C to stop.')
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    self._print_function('Stopped serving requests.')
+        finally:
+            service.close()
+
+    def query(self, socket_path: str, action: str, arguments: List[str]):
+        with ScanClient(Path(socket_path).absolute()) as client:
+            result = client.request(action, **self._parse_arguments(action, arguments))
+        self._print_function(json.dumps(result, indent=2))
+
+    def _parse_arguments(self, action: str, arguments: List[str]) -> Dict[str, Any]:
+        """
+        Parses arguments in the form of name=value. Values that are valid JSON, such as true or 10, are sent as such
+        and every other value is sent as a string. Arguments that are paths on disk are always sent as strings, made
+        absolute relative to the current working directory.
+        """
+        parsed: Dict[str, Any] = {}
+        for argument in arguments:
+            name, separator, value = argument.partition('=')
+            if separator == '' or name == '':
+                raise ValueError(f'Arguments must be in the form of name=value: [{argument}]')
+            if name in _FILE_ARGUMENTS.get(action, []):
+                parsed[name] = str(Path(value).absolute())
+                continue
+            try:
+                parsed[name] = json.loads(value)
+            except ValueError:
+                parsed[name] = value
+        return parsed
@@ -2,3 +2,6 @@ from .files import MissingPathException as MissingPathException, NotADirectoryEx
 from .unsupported_algorithm import UnsupportedAlgorithmException as UnsupportedAlgorithmException
 from .invalid_scan_file import InvalidScanFileException as InvalidScanFileException
 from .invalid_node_properties import InvalidNodePropertiesException as InvalidNodePropertiesException
+from .invalid_checksum_manifest import InvalidChecksumManifestException as InvalidChecksumManifestException
+from .unsupported_platform import UnsupportedPlatformException as UnsupportedPlatformException
+from .server_request import ServerRequestException as ServerRequestException
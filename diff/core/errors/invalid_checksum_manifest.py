@@ -0,0 +1,9 @@
+from pathlib import Path
+
+
+class InvalidChecksumManifestException(Exception):
+
+    _MESSAGE_TEMPLATE = 'Checksum manifest [{}] could not be read. Line {} is not in the expected "<checksum>  <path>" format.'
+
+    def __init__(self, manifest_path: Path, line_number: int):
+        super().__init__(InvalidChecksumManifestException._MESSAGE_TEMPLATE.format(manifest_path, line_number))
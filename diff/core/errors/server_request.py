@@ -0,0 +1,6 @@
+class ServerRequestException(Exception):
+
+    _MESSAGE_TEMPLATE = 'The server could not complete the [{}] request: {}'
+
+    def __init__(self, action: str, error: str):
+        super().__init__(ServerRequestException._MESSAGE_TEMPLATE.format(action, error))
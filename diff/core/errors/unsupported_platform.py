@@ -0,0 +1,6 @@
+class UnsupportedPlatformException(Exception):
+
+    _MESSAGE_TEMPLATE = 'The {} is not available on this system. {}'
+
+    def __init__(self, feature: str, reason: str):
+        super().__init__(UnsupportedPlatformException._MESSAGE_TEMPLATE.format(feature, reason))
@@ -0,0 +1,3 @@
+from .cached_checksum import CachedChecksum as CachedChecksum, DEFAULT_MAX_CACHED_CHECKSUMS as DEFAULT_MAX_CACHED_CHECKSUMS
+from .scan_service import ScanService as ScanService, AVAILABLE_ACTIONS as AVAILABLE_ACTIONS
+from .socket_server import ScanServer as ScanServer, ScanClient as ScanClient, default_socket_path as default_socket_path
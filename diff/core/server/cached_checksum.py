@@ -0,0 +1,59 @@
+from typing import Dict, Tuple, Final
+from collections import OrderedDict
+from pathlib import Path
+import os
+import threading
+
+from diff.core.util import Checksum, Profiler, PROFILER_SINGLETON
+from diff.core.util.compute_file_checksum import TREE_HASH_CHUNK_SIZE
+
+
+DEFAULT_MAX_CACHED_CHECKSUMS: Final[int] = 1_000_000
+
+
+class CachedChecksum(Checksum):
+
+    """
+    A Checksum that remembers the checksum of the files it hashed. A cached checksum is reused as long as the size and
+    modification time of the file are unchanged. The least recently used checksums are evicted once the cache is full.
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_CACHED_CHECKSUMS,
+                 tree_chunk_size: int = TREE_HASH_CHUNK_SIZE,
+                 tree_workers: int | None = None,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        super().__init__(tree_chunk_size, tree_workers, profiler)
+        self._max_entries = max_entries
+        self._cache: OrderedDict[Tuple[str, str], Tuple[int, int, str]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute_file_checksum(self, path: Path, algo: str) -> str:
+        path_stat = os.stat(path)
+        key = (str(path), algo)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == path_stat.st_size and cached[1] == path_stat.st_mtime_ns:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        checksum = super().compute_file_checksum(path, algo)
+
+        with self._cache_lock:
+            self._cache[key] = (path_stat.st_size, path_stat.st_mtime_ns, checksum)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return checksum
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        :return: The number of cached checksums along with the number of cache hits and misses.
+        """
+        with self._cache_lock:
+            return {'entries': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
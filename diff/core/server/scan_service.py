@@ -0,0 +1,258 @@
+from typing import List, Dict, Any, Callable, Tuple, Final
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import threading
+
+from diff.core.errors import NotAFileException, NotADirectoryException
+from diff.core.tree import Node, TreeLoader, DEFAULT_HASH_ALGORITHM, AVAILABLE_HASH_ALGORITHMS
+from diff.core.tree.diff import TreeDiff, TREE_DIFF_SINGLETON, DiffResult
+from diff.core.util import either
+
+from .cached_checksum import CachedChecksum
+
+
+ACTION_LOAD: Final[str] = 'load'
+ACTION_LOOKUP: Final[str] = 'lookup'
+ACTION_VERIFY: Final[str] = 'verify'
+ACTION_DIFF: Final[str] = 'diff'
+ACTION_HASH: Final[str] = 'hash'
+ACTION_STATUS: Final[str] = 'status'
+
+AVAILABLE_ACTIONS: Final[List[str]] = [
+    ACTION_LOAD,
+    ACTION_LOOKUP,
+    ACTION_VERIFY,
+    ACTION_DIFF,
+    ACTION_HASH,
+    ACTION_STATUS
+]
+
+# Diffs between two scans are cheap to keep compared to the scans themselves, only the most recent ones are kept.
+_MAX_CACHED_DIFFS: Final[int] = 64
+
+
+class _LoadedScan:
+
+    def __init__(self, path: str, root: Node, size: int, modification_time: int):
+        self.path = path
+        self.root = root
+        self.size = size
+        self.modification_time = modification_time
+
+
+class ScanService:
+
+    """
+    Answers the requests of the diff serve daemon. Scans are loaded once and kept in memory until their scan file
+    changes, every checksum computed is cached until the file changes, and the diffs between scans are cached until
+    either scan changes, so repeated requests do not have to read anything from disk again.
+    """
+
+    def __init__(self,
+                 checksum: CachedChecksum | None = None,
+                 tree_loader: TreeLoader | None = None,
+                 tree_diff: TreeDiff = TREE_DIFF_SINGLETON,
+                 hash_workers: int | None = None):
+        """
+        :param checksum: The cache of checksums shared by every request.
+        :param tree_loader: Reads the scans and the trees being verified. Defaults to a TreeLoader hashing files with
+            the shared cache of checksums.
+        :param hash_workers: The size of the worker pool shared by every hash request.
+        """
+        self._checksum = checksum if checksum is not None else CachedChecksum()
+        self._tree_loader = tree_loader if tree_loader is not None else TreeLoader(checksum=self._checksum)
+        self._tree_diff = tree_diff
+        self._hash_executor = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix='serve-hash')
+        self._scans: Dict[str, _LoadedScan] = {}
+        self._scans_lock = threading.Lock()
+        # Each scan file is read by at most one request at a time, without blocking the requests for other scans.
+        self._scan_load_locks: Dict[str, threading.Lock] = {}
+        self._diffs: OrderedDict[Tuple[str, int, str, int], Dict[str, List[str]]] = OrderedDict()
+        self._diffs_lock = threading.Lock()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            ACTION_LOAD: self._handle_load,
+            ACTION_LOOKUP: self._handle_lookup,
+            ACTION_VERIFY: self._handle_verify,
+            ACTION_DIFF: self._handle_diff,
+            ACTION_HASH: self._handle_hash,
+            ACTION_STATUS: self._handle_status
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """
+        Answers a single request.
+
+        :param request: The request containing the action to perform along with the arguments of the action.
+        :return: The JSON serializable result of the action.
+        """
+        action = request.get('action')
+        handler = self._handlers.get(action) if isinstance(action, str) else None
+        if handler is None:
+            raise ValueError(f'Unrecognized action [{action}]. Expected one of: {AVAILABLE_ACTIONS}')
+        return handler(request)
+
+    def close(self):
+        self._hash_executor.shutdown()
+
+    def _handle_load(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        root = self._load(_argument(request, 'scan'))
+        files, directories = _count(root)
+        return {'root': root.name, 'checksum_algo': root.checksum_algo, 'files': files, 'directories': directories}
+
+    def _handle_lookup(self, request: Dict[str, Any]) -> Dict[str, Any] | None:
+        root = self._load(_argument(request, 'scan'))
+        node = root.find_node(_argument(request, 'path'))
+        if node is None:
+            return None
+        result: Dict[str, Any] = {
+            'path': _relative_path(root, node),
+            'type': 'file' if node.size is not None else 'directory',
+            'size': node.size,
+            'checksum': node.checksum
+        }
+        if node.size is None:
+            result['children'] = [child.name for child in either(node.children, [])]
+        return result
+
+    def _handle_verify(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        root = self._load(_argument(request, 'scan'))
+        relative_path = request.get('path', '')
+        node = root.find_node(relative_path)
+        if node is None:
+            raise ValueError(f'The path [{relative_path}] is not part of the scan.')
+        disk_path = node.path_to_node()
+        if not disk_path.is_dir():
+            raise NotADirectoryException('path to verify', disk_path)
+
+        compute_checksums = bool(request.get('checksum', False)) and root.checksum_algo is not None
+        disk_tree = self._tree_loader.read_tree_from_disk(disk_path, compute_checksums, root.checksum_algo)
+        diff_result = self._tree_diff.diff_between_trees(_detached_view(node), disk_tree)
+        return {
+            'path': _relative_path(root, node),
+            'changed': [_relative_path(root, first) for first, _ in diff_result.similar],
+            'missing_from_disk': [_relative_path(root, missing) for missing in diff_result.second_tree.missing],
+            'new_on_disk': [
+                os.path.relpath(missing.path_to_node(), root.path_to_node())
+                for missing in diff_result.first_tree.missing
+            ]
+        }
+
+    def _handle_diff(self, request: Dict[str, Any]) -> Dict[str, List[str]]:
+        first = self._load_scan(_argument(request, 'first'))
+        second = self._load_scan(_argument(request, 'second'))
+        first_root = first.root
+        second_root = second.root
+        key = (first.path, first.modification_time, second.path, second.modification_time)
+        with self._diffs_lock:
+            cached = self._diffs.get(key)
+            if cached is not None:
+                self._diffs.move_to_end(key)
+                return cached
+
+        diff_result: DiffResult = self._tree_diff.diff_between_trees(first_root, second_root)
+        result = {
+            'changed': [_relative_path(first_root, first) for first, _ in diff_result.similar],
+            'missing_from_second': [_relative_path(first_root, missing) for missing in diff_result.second_tree.missing],
+            'missing_from_first': [_relative_path(second_root, missing) for missing in diff_result.first_tree.missing]
+        }
+        with self._diffs_lock:
+            self._diffs[key] = result
+            while len(self._diffs) > _MAX_CACHED_DIFFS:
+                self._diffs.popitem(last=False)
+        return result
+
+    def _handle_hash(self, request: Dict[str, Any]) -> Dict[str, str]:
+        path = Path(_argument(request, 'path')).absolute()
+        if not path.is_file():
+            raise NotAFileException('file to hash', path)
+        algo = request.get('algo', DEFAULT_HASH_ALGORITHM)
+        if algo not in AVAILABLE_HASH_ALGORITHMS:
+            raise ValueError(f'Unrecognized algorithm [{algo}]. Expected one of: {AVAILABLE_HASH_ALGORITHMS}')
+        checksum = self._hash_executor.submit(self._checksum.compute_file_checksum, path, algo).result()
+        return {'path': str(path), 'algo': algo, 'checksum': checksum}
+
+    def _handle_status(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._scans_lock:
+            scans = sorted(self._scans)
+        with self._diffs_lock:
+            diffs = len(self._diffs)
+        return {'scans': scans, 'cached_diffs': diffs, 'checksums': self._checksum.statistics()}
+
+    def _load(self, scan: str) -> Node:
+        return self._load_scan(scan).root
+
+    def _load_scan(self, scan: str) -> _LoadedScan:
+        """
+        Gets a scan from memory, reading it from disk if it was never loaded or if its file changed since it was
+        loaded.
+        """
+        scan_path = Path(scan).absolute()
+        try:
+            scan_stat = os.stat(scan_path)
+        except OSError as e:
+            raise NotAFileException('scan', scan_path) from e
+
+        key = str(scan_path)
+        with self._scans_lock:
+            loaded = self._scans.get(key)
+            if _is_current(loaded, scan_stat):
+                return loaded
+            load_lock = self._scan_load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another request may have read the scan while this one was waiting for the lock.
+            with self._scans_lock:
+                loaded = self._scans.get(key)
+            if _is_current(loaded, scan_stat):
+                return loaded
+            loaded = _LoadedScan(
+                key,
+                self._tree_loader.read_tree_from_yaml(scan_path),
+                scan_stat.st_size,
+                scan_stat.st_mtime_ns
+            )
+            with self._scans_lock:
+                self._scans[key] = loaded
+            return loaded
+
+
+def _is_current(loaded: _LoadedScan | None, scan_stat: os.stat_result) -> bool:
+    return (loaded is not None
+            and loaded.size == scan_stat.st_size
+            and loaded.modification_time == scan_stat.st_mtime_ns)
+
+
+def _argument(request: Dict[str, Any], name: str) -> Any:
+    if name not in request:
+        raise ValueError(f'The [{name}] argument is required by the [{request.get("action")}] action.')
+    return request[name]
+
+
+def _relative_path(root: Node, node: Node) -> str:
+    return os.path.relpath(node.path_to_node(), root.path_to_node())
+
+
+def _detached_view(node: Node) -> Node:
+    """
+    Creates a root node sharing the children of a node nested within a scan, named after the full path of the node,
+    so the subtree can be diffed against a tree read from disk the same way a whole scan is.
+    """
+    view = Node(None, str(node.path_to_node()), node.size, node.checksum, node.checksum_algo)
+    view.children = node.children
+    return view
+
+
+def _count(root: Node) -> Tuple[int, int]:
+    files = 0
+    directories = 0
+    pending = list(either(root.children, []))
+    while len(pending) > 0:
+        node = pending.pop()
+        if node.size is not None:
+            files += 1
+        else:
+            directories += 1
+            pending.extend(either(node.children, []))
+    return files, directories
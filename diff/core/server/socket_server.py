@@ -0,0 +1,128 @@
+from typing import Dict, Any, Final
+from pathlib import Path
+import json
+import os
+import socket
+import socketserver
+
+from diff.core.errors import ServerRequestException
+
+from .scan_service import ScanService
+
+
+DEFAULT_SOCKET_NAME: Final[str] = 'diff-tools.sock'
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    """
+    Answers every request sent over a connection. Each request and each response is a single line of JSON.
+    """
+
+    server: 'ScanServer'
+
+    def handle(self):
+        for line in self.rfile:
+            if len(line.strip()) == 0:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('A request must be a JSON object.')
+                response: Dict[str, Any] = {'ok': True, 'result': self.server.service.handle(request)}
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class ScanServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    """
+    Serves the requests of a ScanService over a Unix socket. Every connection is answered on its own thread so a slow
+    verify request does not hold up a quick lookup.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, service: ScanService):
+        """
+        :param socket_path: The path of the socket to listen on. A socket left behind by a server that is no longer
+            running is replaced.
+        :param service: Answers the requests received.
+        :raises ValueError: If another server is already listening on the socket.
+        """
+        _remove_stale_socket(socket_path)
+        self.socket_path = socket_path
+        self.service = service
+        super().__init__(str(socket_path), _RequestHandler)
+        # Only the owner can query the server since it can read and hash any file the owner can.
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class ScanClient:
+
+    """
+    Sends requests to a ScanServer, reusing one connection for every request.
+    """
+
+    def __init__(self, socket_path: Path):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(str(socket_path))
+        self._reader = self._socket.makefile('rb')
+
+    def request(self, action: str, **arguments: Any) -> Any:
+        """
+        Sends a request and waits for its response.
+
+        :param action: The action to perform.
+        :param arguments: The arguments of the action.
+        :return: The result of the action.
+        :raises ServerRequestException: If the server could not complete the request.
+        """
+        self._socket.sendall(json.dumps({**arguments, 'action': action}).encode() + b'\n')
+        line = self._reader.readline()
+        if len(line) == 0:
+            raise ServerRequestException(action, 'The server closed the connection.')
+        response = json.loads(line)
+        if not response['ok']:
+            raise ServerRequestException(action, response['error'])
+        return response['result']
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'ScanClient':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+
+def default_socket_path() -> Path:
+    """
+    Gets the socket path used when none is specified, within the runtime directory of the user when there is one.
+    """
+    runtime_directory = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_directory is not None and os.path.isdir(runtime_directory):
+        return Path(runtime_directory).joinpath(DEFAULT_SOCKET_NAME)
+    return Path.home().joinpath(f'.{DEFAULT_SOCKET_NAME}')
+
+
+def _remove_stale_socket(socket_path: Path):
+    if not socket_path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(socket_path))
+    except OSError:
+        socket_path.unlink()
+        return
+    finally:
+        probe.close()
+    raise ValueError(f'A server is already listening on [{socket_path}].')
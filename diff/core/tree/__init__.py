@@ -1,8 +1,32 @@
-from .node import Node as Node
-from .tree_loader import (
-    TreeLoader as TreeLoader,
-    TREE_LOADER_SINGLETON as TREE_LOADER_SINGLETON,
-    AVAILABLE_HASH_ALGORITHMS as AVAILABLE_HASH_ALGORITHMS,
-    DEFAULT_HASH_ALGORITHM as DEFAULT_HASH_ALGORITHM
-)
-from .yml import YamlSerialization as YamlSerialization, YAML_SERIALIZATION_SINGLETON as YAML_SERIALIZATION_SINGLETON
+from diff.core.util import lazy_exports
+
+
+# Imported on first access so, for example, reading the available hash algorithms does not import the asyncio walker.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'Node': '.node',
+    'TreeLoader': '.tree_loader',
+    'TREE_LOADER_SINGLETON': '.tree_loader',
+    'AVAILABLE_HASH_ALGORITHMS': '.tree_loader',
+    'DEFAULT_HASH_ALGORITHM': '.tree_loader',
+    'AVAILABLE_READ_ORDERS': '.tree_loader',
+    'DEFAULT_READ_ORDER': '.tree_loader',
+    'DEFAULT_CHUNK_SIZE': '.tree_loader',
+    'AsyncTreeLoader': '.async_tree_loader',
+    'DEFAULT_CONCURRENCY': '.async_tree_loader',
+    'PathFilter': '.path_filter',
+    'DEFAULT_PATH_FILTER': '.path_filter',
+    'DEFAULT_EXCLUDES': '.path_filter',
+    'build_path_filter': '.path_filter',
+    'read_ignore_file': '.path_filter',
+    'ScanEntries': '.scan_entries',
+    'TreeEntry': '.scan_entries',
+    'ScanJournal': '.scan_journal',
+    'DEFAULT_CHECKPOINT_INTERVAL': '.scan_journal',
+    'journal_path_for': '.scan_journal',
+    'ScanWatcher': '.scan_watcher',
+    'SCAN_WATCHER_SINGLETON': '.scan_watcher',
+    'WatchedScan': '.scan_watcher',
+    'DEFAULT_FLUSH_INTERVAL': '.scan_watcher',
+    'YamlSerialization': '.yml',
+    'YAML_SERIALIZATION_SINGLETON': '.yml'
+})
@@ -0,0 +1,170 @@
+from typing import List, Dict, Tuple, Deque, Final
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import os
+import stat
+
+from diff.core.util import (
+    Checksum,
+    CHECKSUM_SINGLETON,
+    ProgressReporter,
+    ProgressStage,
+    PROGRESS_REPORTER_SINGLETON,
+    Profiler,
+    PROFILER_SINGLETON,
+    HashPool,
+    HASH_POOL_SINGLETON,
+    either
+)
+
+from .node import Node
+from .path_filter import PathFilter
+from .tree_loader import TreeLoader, _stat_or_none
+from .yml import YamlSerialization, YAML_SERIALIZATION_SINGLETON
+
+
+DEFAULT_CONCURRENCY: Final[int] = 32
+
+_LIST: Final[str] = 'list'
+_STAT: Final[str] = 'stat'
+
+
+class AsyncTreeLoader(TreeLoader):
+
+    """
+    A TreeLoader that lists directories and stats their entries with many requests in flight at once. On network file
+    systems, such as SMB or NFS mounts, every listing and stat is a round trip to the server so a serial walk leaves the
+    link idle most of the time.
+
+    The requests are dispatched from an asyncio event loop to a thread pool. The number of workers pulling requests
+    from the queue, and the size of the pool, are both bounded by the concurrency so at most that many requests are in
+    flight regardless of how wide the tree is. The tree produced is identical to the one produced by a TreeLoader.
+    """
+
+    def __init__(self,
+                 yaml_serialization: YamlSerialization = YAML_SERIALIZATION_SINGLETON,
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 progress_reporter: ProgressReporter = PROGRESS_REPORTER_SINGLETON,
+                 profiler: Profiler = PROFILER_SINGLETON,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 hash_pool: HashPool = HASH_POOL_SINGLETON):
+        """
+        :param concurrency: The maximum number of listings and stats in flight at once.
+        """
+        super().__init__(yaml_serialization, checksum, progress_reporter, profiler, hash_pool)
+        if concurrency < 1:
+            raise ValueError(f'The concurrency must be at least 1 but was [{concurrency}].')
+        self._concurrency = concurrency
+
+    def _walk(self,
+              root_path: Path,
+              root: Node,
+              path_filter: PathFilter,
+              progress: ProgressStage) -> List[Tuple[Node, Path, os.stat_result]]:
+        # A new event loop is run for every walk so the loader can be used from any thread, including the threads
+        # the between command reads both of its trees from.
+        with ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix='async-walk') as executor:
+            files = asyncio.run(self._walk_concurrently(root_path, root, path_filter, progress, executor))
+        return _in_walk_order(root, files)
+
+    async def _walk_concurrently(self,
+                                 root_path: Path,
+                                 root: Node,
+                                 path_filter: PathFilter,
+                                 progress: ProgressStage,
+                                 executor: ThreadPoolExecutor) -> Dict[Node, Tuple[Path, os.stat_result]]:
+        """
+        Walks the tree with a fixed number of workers. Listing a directory attaches a node for each of its entries,
+        in the order they were listed in, and queues a stat of each entry. Stating an entry records the size of
+        files and queues the listing of directories.
+
+        :return: The path and stat result of every regular file keyed by the node of the file.
+        """
+        loop = asyncio.get_running_loop()
+        files: Dict[Node, Tuple[Path, os.stat_result]] = {}
+        pending: Deque[Tuple[str, Path, str, Node]] = deque([(_LIST, root_path, '', root)])
+        # The number of requests that have been queued but not yet completed, including the requests in flight.
+        outstanding = 1
+        wake_up = asyncio.Event()
+
+        async def list_directory(path: Path, relative_path: str, node: Node) -> int:
+            children = await loop.run_in_executor(
+                executor,
+                self._list_children,
+                path,
+                relative_path,
+                path_filter,
+                progress
+            )
+            progress.directory_listed()
+            for child_path, child_relative_path in children:
+                with self._profiler.span('tree_loader.build_node'):
+                    child_node = self._read_node_details(child_path, node, None, None, None)
+                pending.append((_STAT, child_path, child_relative_path, child_node))
+            return len(children)
+
+        async def stat_entry(path: Path, relative_path: str, node: Node) -> int:
+            path_stat = await loop.run_in_executor(executor, self._timed_stat, path)
+            if path_stat is None:
+                return 0
+            if stat.S_ISREG(path_stat.st_mode):
+                node.size = path_stat.st_size
+                files[node] = (path, path_stat)
+                progress.file_completed()
+            elif stat.S_ISDIR(path_stat.st_mode):
+                progress.directory_found()
+                pending.append((_LIST, path, relative_path, node))
+                return 1
+            return 0
+
+        async def worker():
+            nonlocal outstanding
+            while outstanding > 0:
+                if len(pending) == 0:
+                    wake_up.clear()
+                    await wake_up.wait()
+                    continue
+                kind, path, relative_path, node = pending.popleft()
+                if kind == _LIST:
+                    queued = await list_directory(path, relative_path, node)
+                else:
+                    queued = await stat_entry(path, relative_path, node)
+                outstanding += queued - 1
+                # Idle workers are woken up when new requests are queued and, once the walk is complete, so they
+                # can exit.
+                if queued > 0 or outstanding == 0:
+                    wake_up.set()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self._concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for running_worker in workers:
+                running_worker.cancel()
+        return files
+
+    def _timed_stat(self, path: Path) -> os.stat_result | None:
+        with self._profiler.span('tree_loader.stat'):
+            return _stat_or_none(path)
+
+
+def _in_walk_order(root: Node,
+                   files: Dict[Node, Tuple[Path, os.stat_result]]) -> List[Tuple[Node, Path, os.stat_result]]:
+    """
+    Orders the files the same way the serial walk of a TreeLoader finds them in, depth first in listing order, so
+    the listing read order hashes the files in the same order regardless of the loader used.
+    """
+    ordered: List[Tuple[Node, Path, os.stat_result]] = []
+    pending = [iter(either(root.children, []))]
+    while len(pending) > 0:
+        child = next(pending[-1], None)
+        if child is None:
+            pending.pop()
+            continue
+        if child in files:
+            ordered.append((child, *files[child]))
+        elif child.children is not None:
+            pending.append(iter(child.children))
+    return ordered
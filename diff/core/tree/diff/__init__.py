@@ -1,4 +1,32 @@
-from .models import DiffResult as DiffResult, MissingResult as MissingResult
-from .tree_diff import TreeDiff as TreeDiff, TREE_DIFF_SINGLETON as TREE_DIFF_SINGLETON
-from .similarity_printer import SimilarityPrinter as SimilarityPrinter, SIMILARITY_PRINTER_SINGLETON as SIMILARITY_PRINTER_SINGLETON
-from .diff_message_decorator import DiffMessageDecorator as DiffMessageDecorator
+from diff.core.util import lazy_exports
+
+
+# Imported on first access so using one kind of diff does not load the modules of every other kind.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'DiffResult': '.models',
+    'MissingResult': '.models',
+    'ReplicaDifference': '.models',
+    'FirstDifference': '.models',
+    'DirectorySummary': '.models',
+    'TreeDiff': '.tree_diff',
+    'TREE_DIFF_SINGLETON': '.tree_diff',
+    'ExternalTreeDiff': '.external_diff',
+    'EXTERNAL_TREE_DIFF_SINGLETON': '.external_diff',
+    'SortedTree': '.external_diff',
+    'ReplicaDiff': '.replica_diff',
+    'REPLICA_DIFF_SINGLETON': '.replica_diff',
+    'QuickDiff': '.quick_diff',
+    'QUICK_DIFF_SINGLETON': '.quick_diff',
+    'QuickDiffSide': '.quick_diff',
+    'DiskSide': '.quick_diff',
+    'ScanSide': '.quick_diff',
+    'ChunkDiff': '.chunk_diff',
+    'CHUNK_DIFF_SINGLETON': '.chunk_diff',
+    'SimilarityPrinter': '.similarity_printer',
+    'SIMILARITY_PRINTER_SINGLETON': '.similarity_printer',
+    'DiffMessageDecorator': '.diff_message_decorator',
+    'DiffSummary': '.diff_summary',
+    'DIFF_SUMMARY_SINGLETON': '.diff_summary',
+    'ListingOptions': '.listing_options',
+    'DEFAULT_LISTING_OPTIONS': '.listing_options'
+})
@@ -0,0 +1,81 @@
+from typing import List, Tuple, Sequence, Final
+from pathlib import Path
+import os
+
+from diff.core.util import Checksum, CHECKSUM_SINGLETON
+
+from ..node import Node
+
+
+class ChunkDiff:
+
+    def __init__(self, checksum: Checksum = CHECKSUM_SINGLETON):
+        self._checksum = checksum
+
+    def diff_manifests(self, first: Node, second: Node) -> List[Tuple[int, int]]:
+        """
+        Compares the chunk checksums of two nodes representing two versions of the same file.
+
+        :param first: The node with the first list of chunk checksums.
+        :param second: The node with the second list of chunk checksums.
+        :return: The list of byte ranges, as (start, end) tuples with an exclusive end, whose contents differ between
+            the two versions of the file.
+        :raises ValueError: Raised if either node has no chunk checksums or if the chunks are of different sizes.
+        """
+        chunk_size = self._get_chunk_size(first)
+        if self._get_chunk_size(second) != chunk_size:
+            raise ValueError(f'The chunk sizes of both files must match but found [{first.chunk_size}] and [{second.chunk_size}].')
+        return self._changed_ranges(first.chunks or [], second.chunks or [], max(first.size or 0, second.size or 0), chunk_size)
+
+    def diff_manifest_against_file(self, manifest: Node, path: Path, checksum_algo: str) -> List[Tuple[int, int]]:
+        """
+        Compares the chunk checksums of a node against the current contents of a file on disk.
+
+        Only the chunks that exist both in the manifest and on disk are read and hashed. Chunks that only exist on one
+        side, because the file grew or shrank, are reported as changed without being read.
+
+        :param manifest: The node with the list of chunk checksums to compare against.
+        :param path: The path to the file on disk.
+        :param checksum_algo: The algorithm that was used to compute the chunk checksums of the manifest.
+        :return: The list of byte ranges, as (start, end) tuples with an exclusive end, whose contents differ between
+            the manifest and the file on disk.
+        :raises ValueError: Raised if the node has no chunk checksums.
+        """
+        chunk_size = self._get_chunk_size(manifest)
+        manifest_chunks = manifest.chunks or []
+        file_size = os.stat(path).st_size
+        file_chunk_count = (file_size + chunk_size - 1) // chunk_size
+
+        readable_count = min(len(manifest_chunks), file_chunk_count)
+        file_chunks: List[str | None] = list(self._checksum.compute_chunk_digests(path, checksum_algo, chunk_size, readable_count))
+        file_chunks.extend([None] * (file_chunk_count - readable_count))
+
+        return self._changed_ranges(manifest_chunks, file_chunks, max(manifest.size or 0, file_size), chunk_size)
+
+    def _get_chunk_size(self, node: Node) -> int:
+        if node.chunks is None or node.chunk_size is None:
+            raise ValueError(f'No chunk checksums were recorded for [{node.path_to_node()}]. '
+                             'Scan the file again with a chunk threshold below its size and try again.')
+        return node.chunk_size
+
+    def _changed_ranges(self,
+                        first_chunks: Sequence[str | None],
+                        second_chunks: Sequence[str | None],
+                        total_size: int,
+                        chunk_size: int) -> List[Tuple[int, int]]:
+        ranges: List[Tuple[int, int]] = []
+        for index in range(max(len(first_chunks), len(second_chunks))):
+            first_chunk = first_chunks[index] if index < len(first_chunks) else None
+            second_chunk = second_chunks[index] if index < len(second_chunks) else None
+            if first_chunk is not None and first_chunk == second_chunk:
+                continue
+            start = index * chunk_size
+            end = min(start + chunk_size, total_size)
+            if len(ranges) > 0 and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+
+CHUNK_DIFF_SINGLETON: Final[ChunkDiff] = ChunkDiff()
@@ -18,3 +18,11 @@ class DiffMessageDecorator(ABC):
     @abstractmethod
     def second_tree_no_diff_message(self) -> str:
         pass
+
+    @abstractmethod
+    def first_tree_label(self) -> str:
+        pass
+
+    @abstractmethod
+    def second_tree_label(self) -> str:
+        pass
@@ -0,0 +1,101 @@
+from typing import List, Dict, Tuple, Final
+import os
+
+from diff.core.util import Profiler, PROFILER_SINGLETON, either
+
+from .models import DiffResult, DirectorySummary
+from ..node import Node
+
+
+_ADDED: Final[int] = 0
+_REMOVED: Final[int] = 1
+_CHANGED: Final[int] = 2
+
+
+class DiffSummary:
+
+    """
+    Rolls the entries of a diff up into the number of files, and bytes, added, removed and changed per directory.
+    """
+
+    def __init__(self, profiler: Profiler = PROFILER_SINGLETON):
+        self._profiler = profiler
+
+    def summarize(self, diff_result: DiffResult, depth: int) -> List[DirectorySummary]:
+        """
+        Summarizes a diff in a single pass over its entries.
+
+        Files missing from the first tree are counted as added and files missing from the second tree as removed. The
+        files nested within a missing directory are counted individually. Every entry is attributed to the directory
+        containing it or, if that directory is nested more than depth directories deep, to its ancestor at that depth.
+
+        :param diff_result: The diff to summarize.
+        :param depth: The number of directories below the root to roll the entries up to. A depth of 0 rolls every
+            entry up to the root.
+        :return: The summary of every directory containing at least one difference, ordered by path.
+        """
+        with self._profiler.span('diff_summary.summarize'):
+            summaries: Dict[Tuple[str, ...], DirectorySummary] = {}
+            for _, second_node in diff_result.similar:
+                self._add(summaries, second_node, depth, _CHANGED)
+            for node in diff_result.first_tree.missing:
+                self._add(summaries, node, depth, _ADDED)
+            for node in diff_result.second_tree.missing:
+                self._add(summaries, node, depth, _REMOVED)
+            return [summaries[key] for key in sorted(summaries)]
+
+    def _add(self, summaries: Dict[Tuple[str, ...], DirectorySummary], node: Node, depth: int, kind: int):
+        parts = _relative_parts(node)
+        # A missing directory is attributed to itself since every file it holds is nested within it.
+        directory = parts if node.size is None else parts[:-1]
+        key = tuple(directory[:depth])
+        summary = summaries.get(key)
+        if summary is None:
+            summary = DirectorySummary(os.path.join(*key) if len(key) > 0 else os.curdir)
+            summaries[key] = summary
+
+        files, size = _count_files(node)
+        if kind == _ADDED:
+            summary.added += files
+            summary.added_bytes += size
+        elif kind == _REMOVED:
+            summary.removed += files
+            summary.removed_bytes += size
+        else:
+            summary.changed += files
+            summary.changed_bytes += size
+
+
+def _relative_parts(node: Node) -> List[str]:
+    """
+    The names of the directories leading to a node, from the root down, followed by the name of the node itself. Nodes
+    created by the external diff are attached directly to the root using their full relative path as their name.
+    """
+    names: List[str] = []
+    current = node
+    while current.parent is not None:
+        names.append(current.name)
+        current = current.parent
+    parts: List[str] = []
+    for name in reversed(names):
+        parts.extend(name.split(os.sep))
+    return parts
+
+
+def _count_files(node: Node) -> Tuple[int, int]:
+    if node.size is not None:
+        return 1, node.size
+    files = 0
+    size = 0
+    pending = list(either(node.children, []))
+    while len(pending) > 0:
+        current = pending.pop()
+        if current.size is not None:
+            files += 1
+            size += current.size
+        else:
+            pending.extend(either(current.children, []))
+    return files, size
+
+
+DIFF_SUMMARY_SINGLETON: Final[DiffSummary] = DiffSummary()
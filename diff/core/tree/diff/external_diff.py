@@ -0,0 +1,168 @@
+from typing import List, Tuple, Iterator, Iterable, Any, Final
+from pathlib import Path
+import os
+
+from diff.core.util import Profiler, PROFILER_SINGLETON, ExternalSorter, DEFAULT_MEMORY_BUDGET
+
+from .models import DiffResult, MissingResult
+from ..node import Node
+from ..path_filter import PathFilter, DEFAULT_PATH_FILTER
+from ..scan_entries import TreeEntry
+from ..tree_loader import TreeLoader, TREE_LOADER_SINGLETON
+
+
+# Replacing the separator with a character that sorts before every other character makes the keys sort the same way
+# the paths would when compared one name at a time, so every directory is directly followed by its contents.
+_KEY_SEPARATOR: Final[str] = '\0'
+
+_Record = Tuple[str, int | None, str | None]
+
+
+class SortedTree:
+
+    """
+    The entries of a tree sorted by path, held in temporary files when they do not fit within the memory budget.
+    """
+
+    def __init__(self, root: Node, sorter: ExternalSorter):
+        self.root = root
+        self._sorter = sorter
+
+    def records(self) -> Iterator[_Record]:
+        return self._sorter.sorted()
+
+    def close(self):
+        self._sorter.close()
+
+    def __enter__(self) -> 'SortedTree':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+
+class ExternalTreeDiff:
+
+    """
+    Identifies the same differences as the TreeDiff for trees too large to fit in memory.
+
+    The entries of each tree are read one at a time, from disk or from a scan file, and sorted by path with an external
+    merge sort. The diff is then computed with a single merge-join of both sorted streams. Only the entries that
+    differ are kept in memory.
+    """
+
+    def __init__(self, tree_loader: TreeLoader = TREE_LOADER_SINGLETON, profiler: Profiler = PROFILER_SINGLETON):
+        self._tree_loader = tree_loader
+        self._profiler = profiler
+
+    def sort_tree_from_disk(self,
+                            path: Path,
+                            compute_checksums: bool,
+                            checksum_algo: str | None,
+                            path_filter: PathFilter = DEFAULT_PATH_FILTER,
+                            memory_budget: int = DEFAULT_MEMORY_BUDGET) -> SortedTree:
+        """
+        Walks a directory and sorts its entries.
+
+        :param memory_budget: The number of bytes the entries held in memory while sorting can use.
+        """
+        sorter = ExternalSorter(memory_budget, profiler=self._profiler)
+        try:
+            self._add_entries(sorter, self._tree_loader.read_entries_from_disk(path, compute_checksums, checksum_algo, path_filter))
+        except BaseException:
+            sorter.close()
+            raise
+        return SortedTree(Node(None, str(path), None, None, checksum_algo), sorter)
+
+    def sort_tree_from_yaml(self, file_path: Path, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> SortedTree:
+        """
+        Reads the entries of a scan file and sorts them.
+
+        :param memory_budget: The number of bytes the entries held in memory while sorting can use.
+        """
+        sorter = ExternalSorter(memory_budget, profiler=self._profiler)
+        try:
+            entries = self._tree_loader.read_entries_from_yaml(file_path, sorter.spill_file)
+            self._add_entries(sorter, entries)
+        except BaseException:
+            sorter.close()
+            raise
+        if entries.root is None:
+            sorter.close()
+            raise ValueError(f'The scan file does not contain a tree: [{file_path}]')
+        return SortedTree(entries.root, sorter)
+
+    def diff_between_sorted_trees(self, first_tree: SortedTree, second_tree: SortedTree) -> DiffResult:
+        """
+        Identifies the diff between two sorted trees. The diff contains the same entries the TreeDiff would identify,
+        ordered by path.
+
+        The nodes of the diff are only created for the entries that differ. Each is attached to the root of its tree
+        by its full relative path, without the directories in between, so its path is the same as that of the node
+        the TreeDiff would report.
+
+        :param first_tree: The first tree to compare.
+        :param second_tree: The second tree to compare.
+        :return: The diff between both trees.
+        """
+        with self._profiler.span('external_diff.merge_join'):
+            return self._merge_join(first_tree.root, first_tree.records(), second_tree.root, second_tree.records())
+
+    def _add_entries(self, sorter: ExternalSorter, entries: Iterable[TreeEntry]):
+        for path, size, checksum in entries:
+            sorter.add((path.replace(os.sep, _KEY_SEPARATOR), size, checksum))
+
+    def _merge_join(self,
+                    first_root: Node,
+                    first_records: Iterator[_Record],
+                    second_root: Node,
+                    second_records: Iterator[_Record]) -> DiffResult:
+        similar: List[Tuple[Node, Node]] = []
+        nodes_not_in_first_tree: List[Node] = []
+        nodes_not_in_second_tree: List[Node] = []
+        # The prefix of the last directory reported missing from each tree. Since the contents of a directory directly
+        # follow it, the entries starting with the prefix are within a directory that was already reported.
+        first_missing_prefix: str | None = None
+        second_missing_prefix: str | None = None
+
+        first = next(first_records, None)
+        second = next(second_records, None)
+        while first is not None or second is not None:
+            if second is None or (first is not None and first[0] < second[0]):
+                if first is not None and not _is_within(first[0], second_missing_prefix):
+                    nodes_not_in_second_tree.append(_to_node(first_root, first))
+                    second_missing_prefix = first[0] + _KEY_SEPARATOR
+                first = next(first_records, None)
+            elif first is None or second[0] < first[0]:
+                if not _is_within(second[0], first_missing_prefix):
+                    nodes_not_in_first_tree.append(_to_node(second_root, second))
+                    first_missing_prefix = second[0] + _KEY_SEPARATOR
+                second = next(second_records, None)
+            else:
+                if _are_records_different(first, second):
+                    similar.append((_to_node(first_root, first), _to_node(second_root, second)))
+                first = next(first_records, None)
+                second = next(second_records, None)
+
+        return DiffResult(
+            similar,
+            MissingResult(first_root, nodes_not_in_first_tree),
+            MissingResult(second_root, nodes_not_in_second_tree)
+        )
+
+
+def _is_within(key: str, prefix: str | None) -> bool:
+    return prefix is not None and key.startswith(prefix)
+
+
+def _are_records_different(first: _Record, second: _Record) -> bool:
+    if first[2] is not None and second[2] is not None and first[2] != second[2]:
+        return True
+    return first[1] != second[1]
+
+
+def _to_node(root: Node, record: _Record) -> Node:
+    return Node(root, record[0].replace(_KEY_SEPARATOR, os.sep), record[1], record[2], None)
+
+
+EXTERNAL_TREE_DIFF_SINGLETON: Final[ExternalTreeDiff] = ExternalTreeDiff()
@@ -0,0 +1,24 @@
+from typing import Final
+from pathlib import Path
+
+
+class ListingOptions:
+
+    """
+    Decides how much of a diff is printed.
+    """
+
+    def __init__(self, summary_depth: int | None = None, limit: int | None = None, full_listing: Path | None = None):
+        """
+        :param summary_depth: If specified, the number of files added, removed and changed is printed per directory,
+            rolled up to this many directories below the root, instead of listing every difference. The differences
+            are then only listed when a limit is also specified.
+        :param limit: If specified, at most this many entries are listed in each section of the listing.
+        :param full_listing: If specified, the complete listing is written to this file regardless of the limit.
+        """
+        self.summary_depth = summary_depth
+        self.limit = limit
+        self.full_listing = full_listing
+
+
+DEFAULT_LISTING_OPTIONS: Final[ListingOptions] = ListingOptions()
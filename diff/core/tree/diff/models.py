@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Tuple, Final
 
 from ..node import Node
 
@@ -16,3 +16,42 @@ class DiffResult:
         self.similar = similar
         self.first_tree = first_tree
         self.second_tree = second_tree
+
+
+class DirectorySummary:
+
+    """
+    The number of files, and their total size in bytes, added, removed and changed within a directory. The path of the
+    directory is relative to the root of the trees being compared, with . being the root itself.
+    """
+
+    def __init__(self, relative_path: str):
+        self.relative_path = relative_path
+        self.added = 0
+        self.added_bytes = 0
+        self.removed = 0
+        self.removed_bytes = 0
+        self.changed = 0
+        self.changed_bytes = 0
+
+
+class ReplicaDifference:
+
+    def __init__(self, relative_path: str, nodes: List[Node | None], missing: List[int], different: bool):
+        self.relative_path = relative_path
+        self.nodes = nodes
+        self.missing = missing
+        self.different = different
+
+
+class FirstDifference:
+
+    MISSING_FROM_FIRST: Final[str] = 'missing_from_first'
+    MISSING_FROM_SECOND: Final[str] = 'missing_from_second'
+    TYPE: Final[str] = 'type'
+    SIZE: Final[str] = 'size'
+    CHECKSUM: Final[str] = 'checksum'
+
+    def __init__(self, relative_path: str, reason: str):
+        self.relative_path = relative_path
+        self.reason = reason
@@ -0,0 +1,189 @@
+from typing import List, Dict, Callable, Final
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, Future, wait
+from pathlib import Path
+import os
+import threading
+
+from diff.core.util import Checksum, CHECKSUM_SINGLETON
+
+from .models import FirstDifference
+from ..node import Node
+from ..tree_loader import TreeLoader, TREE_LOADER_SINGLETON
+from ..path_filter import PathFilter, DEFAULT_PATH_FILTER
+
+
+class _Entry:
+
+    def __init__(self, is_dir: bool, size: int | None, checksum: Callable[[], str | None]):
+        self.is_dir = is_dir
+        self.size = size
+        self.checksum = checksum
+
+
+class QuickDiffSide(ABC):
+
+    """
+    One of the two sides being compared by the QuickDiff. A side lists the contents of a single directory, identified
+    by its path relative to the root of the side, at a time.
+    """
+
+    @abstractmethod
+    def list_directory(self, relative_path: str) -> Dict[str, _Entry]:
+        pass
+
+
+class DiskSide(QuickDiffSide):
+
+    def __init__(self,
+                 root: Path,
+                 checksum_algo: str | None,
+                 tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 path_filter: PathFilter = DEFAULT_PATH_FILTER):
+        self._root = root
+        self._path_filter = path_filter
+        self._checksum_algo = checksum_algo
+        self._tree_loader = tree_loader
+        self._checksum = checksum
+
+    def list_directory(self, relative_path: str) -> Dict[str, _Entry]:
+        entries: Dict[str, _Entry] = {}
+        child_paths = self._tree_loader.list_children(
+            self._root.joinpath(relative_path),
+            relative_path.replace(os.sep, '/'),
+            self._path_filter
+        )
+        for child_path in child_paths:
+            if child_path.is_dir():
+                entries[child_path.name] = _Entry(True, None, lambda: None)
+            else:
+                entries[child_path.name] = _Entry(False, os.stat(child_path).st_size, self._checksum_of(child_path))
+        return entries
+
+    def _checksum_of(self, path: Path) -> Callable[[], str | None]:
+        checksum_algo = self._checksum_algo
+        if checksum_algo is None:
+            return lambda: None
+        return lambda: self._checksum.compute_file_checksum(path, checksum_algo)
+
+
+class ScanSide(QuickDiffSide):
+
+    def __init__(self, root: Node):
+        self._directories: Dict[str, Node] = {'': root}
+
+    def list_directory(self, relative_path: str) -> Dict[str, _Entry]:
+        entries: Dict[str, _Entry] = {}
+        directory = self._directories.pop(relative_path)
+        for child in directory.children or []:
+            is_dir = child.size is None
+            if is_dir:
+                self._directories[os.path.join(relative_path, child.name)] = child
+            entries[child.name] = _Entry(is_dir, child.size, self._checksum_of(child))
+        return entries
+
+    def _checksum_of(self, node: Node) -> Callable[[], str | None]:
+        return lambda: node.checksum
+
+
+class QuickDiff:
+
+    def __init__(self, max_workers: int | None = None, executor: Executor | None = None):
+        """
+        :param max_workers: The number of workers computing checksums when a pool is created for each comparison.
+        :param executor: If specified, checksums are computed by this pool instead, which is left running once the
+            comparison completes so it can be reused.
+        """
+        self._max_workers = max_workers
+        self._executor = executor
+
+    def first_difference(self,
+                         first: QuickDiffSide,
+                         second: QuickDiffSide,
+                         compare_checksums: bool) -> FirstDifference | None:
+        """
+        Walks both sides in lockstep, one directory at a time, and stops as soon as the first difference between them
+        is found.
+
+        Directory listings and file sizes are compared as each directory is listed. If checksums are being compared
+        then the checksums of every pair of files with the same size are computed by a pool of workers while the walk
+        continues. As soon as any difference is found the walk stops and all the checksums that have yet to be
+        computed are cancelled.
+
+        :param first: The first side to compare.
+        :param second: The second side to compare.
+        :param compare_checksums: If true the checksums of the files on each side will be compared in addition to
+            their sizes. Checksums are only compared when both sides provide one.
+        :return: The first difference that was found or None if both sides are identical.
+        """
+        stop = threading.Event()
+        found: List[FirstDifference] = []
+
+        def report(difference: FirstDifference):
+            found.append(difference)
+            stop.set()
+
+        def compare_checksum(relative_path: str, first_entry: _Entry, second_entry: _Entry):
+            if stop.is_set():
+                return
+            first_checksum = first_entry.checksum()
+            if first_checksum is None or stop.is_set():
+                return
+            second_checksum = second_entry.checksum()
+            if second_checksum is not None and first_checksum != second_checksum:
+                report(FirstDifference(relative_path, FirstDifference.CHECKSUM))
+
+        executor = self._executor if self._executor is not None else ThreadPoolExecutor(max_workers=self._max_workers)
+        futures: List[Future] = []
+        try:
+            pending = deque([''])
+            while len(pending) > 0 and not stop.is_set():
+                directory = pending.popleft()
+                first_entries = first.list_directory(directory)
+                second_entries = second.list_directory(directory)
+
+                for name in first_entries:
+                    if name not in second_entries:
+                        report(FirstDifference(os.path.join(directory, name), FirstDifference.MISSING_FROM_SECOND))
+                        break
+                if stop.is_set():
+                    break
+                for name in second_entries:
+                    if name not in first_entries:
+                        report(FirstDifference(os.path.join(directory, name), FirstDifference.MISSING_FROM_FIRST))
+                        break
+                if stop.is_set():
+                    break
+
+                for name, first_entry in first_entries.items():
+                    relative_path = os.path.join(directory, name)
+                    second_entry = second_entries[name]
+                    if first_entry.is_dir != second_entry.is_dir:
+                        report(FirstDifference(relative_path, FirstDifference.TYPE))
+                        break
+                    if first_entry.is_dir:
+                        pending.append(relative_path)
+                    elif first_entry.size != second_entry.size:
+                        report(FirstDifference(relative_path, FirstDifference.SIZE))
+                        break
+                    elif compare_checksums:
+                        futures.append(executor.submit(compare_checksum, relative_path, first_entry, second_entry))
+
+            for future in futures:
+                if stop.is_set():
+                    break
+                future.result()
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+            else:
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+
+        return found[0] if len(found) > 0 else None
+
+
+QUICK_DIFF_SINGLETON: Final[QuickDiff] = QuickDiff()
@@ -0,0 +1,58 @@
+from typing import List, Dict, Tuple, Final
+import os
+
+from .models import ReplicaDifference
+from ..node import Node
+
+
+class ReplicaDiff:
+
+    def diff_between_replicas(self, trees: List[Node]) -> List[ReplicaDifference]:
+        """
+        Compares any number of trees that are expected to be exact replicas of one another.
+
+        All the trees are indexed into a single map keyed by the path of each node relative to the root of its tree.
+        Every path that is either missing from at least one replica or whose size or checksum is not the same across
+        all the replicas that contain it will be reported. If a directory is missing from a replica then only the
+        directory, and none of its contents, will be reported as missing from said replica.
+
+        :param trees: The root nodes of the replicas to compare.
+        :return: The list of paths that are not identical across all replicas, in the order they were first found.
+        """
+        index = self._index(trees)
+        differences: List[ReplicaDifference] = []
+        for relative_path, nodes in index.items():
+            parent_nodes = index.get(os.path.dirname(relative_path))
+            missing = [
+                position for position, node in enumerate(nodes)
+                if node is None and (parent_nodes is None or parent_nodes[position] is not None)
+            ]
+            different = self._are_nodes_different([node for node in nodes if node is not None])
+            if len(missing) > 0 or different:
+                differences.append(ReplicaDifference(relative_path, nodes, missing, different))
+        return differences
+
+    def _index(self, trees: List[Node]) -> Dict[str, List[Node | None]]:
+        index: Dict[str, List[Node | None]] = {}
+        for position, tree in enumerate(trees):
+            pending: List[Tuple[str, Node]] = [
+                (child.name, child) for child in reversed(tree.children or [])
+            ]
+            while len(pending) > 0:
+                relative_path, node = pending.pop()
+                nodes = index.get(relative_path)
+                if nodes is None:
+                    nodes = [None] * len(trees)
+                    index[relative_path] = nodes
+                nodes[position] = node
+                for child in reversed(node.children or []):
+                    pending.append((os.path.join(relative_path, child.name), child))
+        return index
+
+    def _are_nodes_different(self, nodes: List[Node]) -> bool:
+        if len({node.size for node in nodes}) > 1:
+            return True
+        return len({node.checksum for node in nodes if node.checksum is not None}) > 1
+
+
+REPLICA_DIFF_SINGLETON: Final[ReplicaDiff] = ReplicaDiff()
@@ -1,43 +1,136 @@
-from typing import Callable, Final
+from typing import List, Callable, Final
+import os
 
-from .models import DiffResult
+from diff.core.util import Profiler, PROFILER_SINGLETON
+
+from .models import DiffResult, FirstDifference, DirectorySummary
 from .diff_message_decorator import DiffMessageDecorator
+from .diff_summary import DiffSummary, DIFF_SUMMARY_SINGLETON
+from .listing_options import ListingOptions, DEFAULT_LISTING_OPTIONS
+from ..node import Node
 
 
 class SimilarityPrinter:
 
-    def __init__(self, print_function: Callable[[str], None] = print):
+    def __init__(self,
+                 print_function: Callable[[str], None] = print,
+                 profiler: Profiler = PROFILER_SINGLETON,
+                 diff_summary: DiffSummary = DIFF_SUMMARY_SINGLETON):
         self._print_function = print_function
+        self._profiler = profiler
+        self._diff_summary = diff_summary
+
+    def print_similarity_results(self,
+                                 diff_result: DiffResult,
+                                 message_decorator: DiffMessageDecorator,
+                                 listing_options: ListingOptions = DEFAULT_LISTING_OPTIONS):
+        with self._profiler.span('similarity_printer.print'):
+            if listing_options.full_listing is not None:
+                with open(listing_options.full_listing, 'w', encoding='utf-8') as file:
+                    self._print_listing(diff_result, message_decorator, lambda line: file.write(line + '\n'), None)
+
+            if listing_options.summary_depth is not None:
+                summaries = self._diff_summary.summarize(diff_result, listing_options.summary_depth)
+                self._print_summary(summaries, listing_options.summary_depth)
+                if listing_options.limit is not None:
+                    self._print_listing(diff_result, message_decorator, self._print_function, listing_options.limit)
+            else:
+                self._print_listing(diff_result, message_decorator, self._print_function, listing_options.limit)
 
-    def print_similarity_results(self, diff_result: DiffResult, message_decorator: DiffMessageDecorator):
-        self._print_function('\n----- Similar -----')
+            if listing_options.full_listing is not None:
+                self._print_function(f'The full listing of the differences was saved to: [{listing_options.full_listing}]')
+
+    def _print_listing(self,
+                       diff_result: DiffResult,
+                       message_decorator: DiffMessageDecorator,
+                       print_function: Callable[[str], None],
+                       limit: int | None):
+        print_function('\n----- Similar -----')
         if len(diff_result.similar) > 0:
-            self._print_function('The following files have a similar path but a different file size or checksum:')
-            for similar in diff_result.similar:
-                self._print_function(f'\t[{similar[0].path_to_node()}] -> [{similar[1].path_to_node()}]')
+            print_function('The following files have a similar path but a different file size or checksum:')
+            for similar in _limited(diff_result.similar, limit):
+                print_function(f'\t[{similar[0].path_to_node()}] -> [{similar[1].path_to_node()}]')
+            _print_remaining(print_function, len(diff_result.similar), limit)
         else:
-            self._print_function('No files with similar paths but different checksums or file sizes were found.')
+            print_function('No files with similar paths but different checksums or file sizes were found.')
 
-        self._print_function('')
+        print_function('')
 
-        self._print_function('----- Different -----')
+        print_function('----- Different -----')
         if len(diff_result.first_tree.missing) > 0:
-            self._print_function(message_decorator.first_tree_has_diff_message())
-            for missing in diff_result.first_tree.missing:
-                self._print_function(f'\t[{missing.path_to_node()}]')
+            print_function(message_decorator.first_tree_has_diff_message())
+            _print_nodes(print_function, diff_result.first_tree.missing, limit)
         else:
-            self._print_function(message_decorator.first_tree_no_diff_message())
+            print_function(message_decorator.first_tree_no_diff_message())
 
-        self._print_function('')
+        print_function('')
 
         if len(diff_result.second_tree.missing) > 0:
-            self._print_function(message_decorator.second_tree_has_diff_message())
-            for missing in diff_result.second_tree.missing:
-                self._print_function(f'\t[{missing.path_to_node()}]')
+            print_function(message_decorator.second_tree_has_diff_message())
+            _print_nodes(print_function, diff_result.second_tree.missing, limit)
         else:
-            self._print_function(message_decorator.second_tree_no_diff_message())
+            print_function(message_decorator.second_tree_no_diff_message())
+
+        print_function('')
+
+    def _print_summary(self, summaries: List[DirectorySummary], depth: int):
+        self._print_function('\n----- Summary -----')
+        if len(summaries) == 0:
+            self._print_function('No differences were found.')
+            self._print_function('')
+            return
 
+        self._print_function(f'Differences per directory, rolled up to a depth of {depth}:')
+        # Every directory rolls up to the root, so the total is the summary of the root with nothing left out.
+        total = DirectorySummary(os.curdir)
+        for summary in summaries:
+            self._print_function(f'\t[{summary.relative_path}] {_format_summary(summary)}')
+            total.added += summary.added
+            total.added_bytes += summary.added_bytes
+            total.removed += summary.removed
+            total.removed_bytes += summary.removed_bytes
+            total.changed += summary.changed
+            total.changed_bytes += summary.changed_bytes
+        self._print_function(f'Total: {_format_summary(total)}')
         self._print_function('')
 
+    def print_first_difference(self, difference: FirstDifference | None, message_decorator: DiffMessageDecorator):
+        first = message_decorator.first_tree_label()
+        second = message_decorator.second_tree_label()
+        if difference is None:
+            self._print_function(f'No differences were found between {first} and {second}.')
+            return
+
+        path = difference.relative_path
+        if difference.reason == FirstDifference.MISSING_FROM_FIRST:
+            self._print_function(f'Difference found: [{path}] was found in {second} but not in {first}.')
+        elif difference.reason == FirstDifference.MISSING_FROM_SECOND:
+            self._print_function(f'Difference found: [{path}] was found in {first} but not in {second}.')
+        elif difference.reason == FirstDifference.TYPE:
+            self._print_function(f'Difference found: [{path}] is a file in one of {first} or {second} and a directory in the other.')
+        else:
+            self._print_function(f'Difference found: [{path}] has a different {difference.reason} in {first} and {second}.')
+
+
+def _limited(entries: List, limit: int | None) -> List:
+    return entries if limit is None else entries[:limit]
+
+
+def _print_nodes(print_function: Callable[[str], None], nodes: List[Node], limit: int | None):
+    for node in _limited(nodes, limit):
+        print_function(f'\t[{node.path_to_node()}]')
+    _print_remaining(print_function, len(nodes), limit)
+
+
+def _print_remaining(print_function: Callable[[str], None], count: int, limit: int | None):
+    if limit is not None and count > limit:
+        print_function(f'\t... and {count - limit:,} more not listed.')
+
+
+def _format_summary(summary: DirectorySummary) -> str:
+    return (f'added {summary.added:,} files ({summary.added_bytes:,} bytes), '
+            f'removed {summary.removed:,} files ({summary.removed_bytes:,} bytes), '
+            f'changed {summary.changed:,} files ({summary.changed_bytes:,} bytes)')
+
 
 SIMILARITY_PRINTER_SINGLETON: Final[SimilarityPrinter] = SimilarityPrinter()
@@ -1,6 +1,7 @@
-from typing import List, Dict, Generator, Tuple, Final
+from typing import List, Dict, Set, Iterator, Tuple, Final
+import os
 
-from diff.core.util import has_elements
+from diff.core.util import has_elements, Profiler, PROFILER_SINGLETON
 
 from .models import DiffResult, MissingResult
 from ..node import Node
@@ -9,6 +10,9 @@ from diff.core.util import either
 
 class TreeDiff:
 
+    def __init__(self, profiler: Profiler = PROFILER_SINGLETON):
+        self._profiler = profiler
+
     def diff_between_trees(self, first_tree: Node, second_tree: Node) -> DiffResult:
         """
         Identifies the diff between two different trees.
@@ -21,11 +25,13 @@ class TreeDiff:
         :param second_tree: The second tree to compare.
         :return: The diff between both trees.
         """
-        first_tree_nodes = self._flatten(first_tree)
-        second_tree_nodes = self._flatten(second_tree)
-        similar = self._find_similar_nodes(first_tree_nodes, second_tree_nodes)
-        nodes_not_in_second_tree = self._find_missing(first_tree_nodes, second_tree_nodes)
-        nodes_not_in_first_tree = self._find_missing(second_tree_nodes, first_tree_nodes)
+        with self._profiler.span('tree_diff.flatten'):
+            first_tree_nodes = self._flatten(first_tree)
+            second_tree_nodes = self._flatten(second_tree)
+        with self._profiler.span('tree_diff.compare'):
+            similar = self._find_similar_nodes(first_tree_nodes, second_tree_nodes)
+            nodes_not_in_second_tree = self._find_missing(first_tree_nodes, second_tree_nodes)
+            nodes_not_in_first_tree = self._find_missing(second_tree_nodes, first_tree_nodes)
         return DiffResult(
             similar,
             MissingResult(first_tree, nodes_not_in_first_tree),
@@ -37,15 +43,31 @@ class TreeDiff:
         return node_path[len(root_node.name):]
 
     def _flatten(self, root_node: Node) -> Dict[str, Node]:
-        def flatten(node: Node) -> Generator[Tuple[str, Node], None, None]:
-            for child in either(node.children, []):
-                yield self._path_to_node_without_root(root_node, child), child
-                if has_elements(child.children):
-                    yield from flatten(child)
-
+        """
+        Maps the path, relative to the root, of every nested node to said node. The nodes are visited depth first
+        using an explicit stack so the depth of the tree is not limited by the recursion limit. Only the paths of the
+        direct children of the root are computed from scratch, the path of every other node is built from the path of
+        its parent.
+        """
+        flattened: Dict[str, Node] = {}
         if len(either(root_node.children, [])) == 0:
-            return {}
-        return {value[0]: value[1] for value in flatten(root_node)}
+            return flattened
+
+        pending: List[Tuple[str | None, Iterator[Node]]] = [(None, iter(either(root_node.children, [])))]
+        while len(pending) > 0:
+            parent_path, children = pending[-1]
+            child = next(children, None)
+            if child is None:
+                pending.pop()
+                continue
+            if parent_path is None:
+                child_path = self._path_to_node_without_root(root_node, child)
+            else:
+                child_path = parent_path + os.sep + child.name
+            flattened[child_path] = child
+            if has_elements(child.children):
+                pending.append((child_path, iter(either(child.children, []))))
+        return flattened
 
     def _are_nodes_different(self, first: Node, second: Node) -> bool:
         if first.checksum is not None and second.checksum is not None and first.checksum != second.checksum:
@@ -71,7 +93,7 @@ class TreeDiff:
                 similarities.append((first_node, second_node))
         return similarities
 
-    def _has_parent_in_missing_list(self, all_missing_nodes: List[Node], node: Node) -> bool:
+    def _has_parent_in_missing_set(self, all_missing_nodes: Set[Node], node: Node) -> bool:
         while node.parent is not None:
             if node.parent in all_missing_nodes:
                 return True
@@ -81,8 +103,10 @@ class TreeDiff:
     def _find_missing(self, first_tree_nodes: Dict[str, Node], second_tree_nodes: Dict[str, Node]) -> List[Node]:
         all_missing_nodes = [first_tree_nodes[path] for path in first_tree_nodes.keys() if path not in second_tree_nodes]
         # If the parent directory of a file is missing from the second tree then we should just list
-        # the parent directory as missing instead of all the files within said directory.
-        return [node for node in all_missing_nodes if not self._has_parent_in_missing_list(all_missing_nodes, node)]
+        # the parent directory as missing instead of all the files within said directory. Nodes are hashed by identity
+        # so each parent is looked up in constant time, even when millions of nodes are missing.
+        missing_set = set(all_missing_nodes)
+        return [node for node in all_missing_nodes if not self._has_parent_in_missing_set(missing_set, node)]
 
 
 TREE_DIFF_SINGLETON: Final[TreeDiff] = TreeDiff()
@@ -0,0 +1,2 @@
+from .models import DuplicateGroup as DuplicateGroup
+from .duplicate_finder import DuplicateFinder as DuplicateFinder, DUPLICATE_FINDER_SINGLETON as DUPLICATE_FINDER_SINGLETON
@@ -0,0 +1,116 @@
+from typing import List, Dict, Tuple, Callable, Hashable, Final
+from pathlib import Path
+
+from diff.core.util import (
+    Checksum,
+    CHECKSUM_SINGLETON,
+    IoScheduler,
+    IO_SCHEDULER_SINGLETON,
+    ProgressReporter,
+    PROGRESS_REPORTER_SINGLETON,
+    either
+)
+
+from .models import DuplicateGroup
+from ..node import Node
+
+
+class DuplicateFinder:
+
+    def __init__(self,
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 io_scheduler: IoScheduler = IO_SCHEDULER_SINGLETON,
+                 progress_reporter: ProgressReporter = PROGRESS_REPORTER_SINGLETON):
+        self._checksum = checksum
+        self._io_scheduler = io_scheduler
+        self._progress_reporter = progress_reporter
+
+    def find_duplicates(self, trees: List[Node], checksum_algo: str, max_workers: int | None = None) -> List[DuplicateGroup]:
+        """
+        Identifies all the files, across all the input trees, that have identical contents.
+
+        Files are first bucketed by their size, the files that share a size with at least one other file then have a
+        partial checksum computed from their first and last block, and only the files that still collide after that
+        have their full checksum computed. Empty files are never reported as duplicates.
+
+        The full checksum of every file that was fully hashed will be attached to the Node representing said file.
+
+        :param trees: The trees, previously read from disk, to search for duplicates.
+        :param checksum_algo: The algorithm to use to compute the partial and full checksums of the files.
+        :param max_workers: The maximum number of files on the same non-rotational device to hash in parallel. If
+            None the default limit of the IoScheduler will be used. Files on a rotational device are always hashed
+            one at a time in inode order.
+        :return: The groups of duplicate files ordered from the most to the least reclaimable space.
+        """
+        by_size: Dict[Hashable, List[Node]] = {}
+        for node in self._file_nodes(trees):
+            if either(node.size, 0) > 0:
+                by_size.setdefault(node.size, []).append(node)
+
+        by_partial = self._regroup(
+            'Partial hashing',
+            by_size,
+            lambda path: self._checksum.compute_partial_checksum(path, checksum_algo),
+            False,
+            max_workers
+        )
+        by_checksum = self._regroup(
+            'Hashing',
+            by_partial,
+            lambda path: self._checksum.compute_file_checksum(path, checksum_algo),
+            True,
+            max_workers
+        )
+        for checksum_key, nodes in by_checksum.items():
+            for node in nodes:
+                node.checksum = checksum_key[1]
+
+        groups = [
+            DuplicateGroup(nodes[0].size, nodes[0].checksum, nodes)
+            for nodes in by_checksum.values() if len(nodes) > 1
+        ]
+        groups.sort(key=lambda group: group.reclaimable_size(), reverse=True)
+        return groups
+
+    def _regroup(self,
+                 stage_name: str,
+                 buckets: Dict[Hashable, List[Node]],
+                 compute_key: Callable[[Path], str],
+                 reads_whole_file: bool,
+                 max_workers: int | None) -> Dict[Tuple[Hashable, str], List[Node]]:
+        """
+        Splits every bucket containing more than one node into smaller buckets using the key computed for each node.
+        Buckets containing a single node are dropped since said node cannot have a duplicate.
+
+        The progress of the stage is only reported in bytes when computing the key reads the whole file.
+        """
+        candidates = [(bucket_key, node) for bucket_key, nodes in buckets.items() if len(nodes) > 1 for node in nodes]
+        paths = [candidate[1].path_to_node() for candidate in candidates]
+        sizes = {path: candidate[1].size for path, candidate in zip(paths, candidates, strict=True)}
+        total_bytes = sum(either(size, 0) for size in sizes.values()) if reads_whole_file else None
+        with self._progress_reporter.stage(stage_name, len(candidates), total_bytes) as progress:
+            def compute_and_report(path: Path) -> str:
+                key = compute_key(path)
+                progress.file_completed(sizes[path] if reads_whole_file else None)
+                return key
+
+            keys = self._io_scheduler.map(compute_and_report, paths, max_workers)
+
+        regrouped: Dict[Tuple[Hashable, str], List[Node]] = {}
+        for candidate, key in zip(candidates, keys, strict=True):
+            regrouped.setdefault((candidate[0], key), []).append(candidate[1])
+        return regrouped
+
+    def _file_nodes(self, trees: List[Node]) -> List[Node]:
+        files: List[Node] = []
+        pending = list(reversed(trees))
+        while len(pending) > 0:
+            node = pending.pop()
+            if node.children is not None:
+                pending.extend(reversed(node.children))
+            elif node.size is not None:
+                files.append(node)
+        return files
+
+
+DUPLICATE_FINDER_SINGLETON: Final[DuplicateFinder] = DuplicateFinder()
@@ -0,0 +1,19 @@
+from typing import List
+
+from ..node import Node
+
+
+class DuplicateGroup:
+
+    def __init__(self, size: int, checksum: str, nodes: List[Node]):
+        self.size = size
+        self.checksum = checksum
+        self.nodes = nodes
+
+    def reclaimable_size(self) -> int:
+        """
+        The number of bytes that could be freed by keeping only one copy of the duplicated file.
+
+        :return: The size of the file multiplied by the number of redundant copies.
+        """
+        return self.size * (len(self.nodes) - 1)
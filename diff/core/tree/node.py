@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Final
 from pathlib import Path
 import os
 
@@ -7,24 +7,18 @@ from diff.core.errors import InvalidNodePropertiesException
 from diff.core.util import has_elements, either
 
 
-_VALID_NODE_KEYS = ['name', 'size', 'checksum', 'checksum_algo', 'children', 'alternate_name']
+_VALID_NODE_KEYS: Final[FrozenSet[str]] = frozenset([
+    'name', 'size', 'checksum', 'checksum_algo', 'children', 'alternate_name', 'chunks', 'chunk_size'
+])
 
 
 def _validate_properties(value: Dict[str, Any]):
-    unrecognized_key = next((key for key in value if key not in _VALID_NODE_KEYS), None)
-    if unrecognized_key is not None:
-        raise InvalidNodePropertiesException(unrecognized_key)
-
-
-def _get_size(value: Dict[str, Any]) -> int | None:
-    size = value.get('size')
-    return int(size) if size is not None else None
-
-
-def _get_name(values: Dict[str, Any]) -> str:
-    if 'alternate_name' in values:
-        return values['alternate_name']
-    return values['name']
+    # The set lookup is done in C for the whole dict. The unrecognized key is only searched for once it is known
+    # that one exists.
+    if _VALID_NODE_KEYS.issuperset(value):
+        return
+    unrecognized_key = next(key for key in value if key not in _VALID_NODE_KEYS)
+    raise InvalidNodePropertiesException(unrecognized_key)
 
 
 class Node:
@@ -47,6 +41,10 @@ class Node:
         self.checksum = checksum
         self.children: List[Node] | None = None
         self.checksum_algo = checksum_algo
+        self.chunks: List[str] | None = None
+        self.chunk_size: int | None = None
+        # Built the first time a child is looked up by name so trees that are only traversed never pay for it.
+        self._children_by_name: Dict[str, Node] | None = None
 
     def attach_child(self, node: Node):
         """
@@ -57,6 +55,59 @@ class Node:
         if self.children is None:
             self.children = []
         self.children.append(node)
+        if self._children_by_name is not None:
+            self._children_by_name.setdefault(node.name, node)
+
+    def detach_child(self, node: Node):
+        """
+        Removes a single node from the list of child nodes this node currently has. The list of child nodes is reset
+        to None once its last node is removed.
+
+        :param node: The node to be removed from the current list of child nodes.
+        """
+        if self.children is None:
+            return
+        try:
+            self.children.remove(node)
+        except ValueError:
+            return
+        if len(self.children) == 0:
+            self.children = None
+        if self._children_by_name is not None and self._children_by_name.get(node.name) is node:
+            del self._children_by_name[node.name]
+
+    def find_child(self, name: str) -> Node | None:
+        """
+        Finds a direct child of this node by its name.
+
+        The children are indexed by name the first time this is called so every following lookup takes constant time.
+        The index is kept up to date by attach_child and detach_child.
+
+        :param name: The name of the child to find.
+        :return: The child with the name or None if this node has no such child.
+        """
+        if self.children is None:
+            return None
+        if self._children_by_name is None:
+            children_by_name: Dict[str, Node] = {}
+            for child in self.children:
+                children_by_name.setdefault(child.name, child)
+            self._children_by_name = children_by_name
+        return self._children_by_name.get(name)
+
+    def find_node(self, relative_path: str) -> Node | None:
+        """
+        Finds a node nested within this node using its path relative to this node.
+
+        :param relative_path: The path of the node to find relative to this node.
+        :return: The node at the relative path or None if no such node exists.
+        """
+        node: Node | None = self
+        for name in Path(relative_path).parts:
+            if node is None:
+                return None
+            node = node.find_child(name)
+        return node
 
     def path_to_node(self) -> Path:
         """
@@ -76,10 +127,27 @@ class Node:
 
     def to_dict(self) -> Dict[str, Any]:
         """
-        Serializes this Node to a dictionary.
+        Serializes this Node, and all of its nested children, to a dictionary.
+
+        The tree is traversed using an explicit stack so the depth of the tree is not limited by the recursion limit.
 
         :return: A dictionary representation of this Node.
         """
+        root_dict = self._to_dict_without_children()
+        pending = [(self, root_dict)]
+        while len(pending) > 0:
+            node, node_dict = pending.pop()
+            if not has_elements(node.children):
+                continue
+            child_dicts: List[Dict[str, Any]] = []
+            node_dict['children'] = child_dicts
+            for child in either(node.children, []):
+                child_dict = child._to_dict_without_children()
+                child_dicts.append(child_dict)
+                pending.append((child, child_dict))
+        return root_dict
+
+    def _to_dict_without_children(self) -> Dict[str, Any]:
         node_dict: Dict[str, Any] = {
             'name': self.name
         }
@@ -87,15 +155,16 @@ class Node:
         if self.size is not None:
             node_dict['size'] = self.size
 
-        if has_elements(self.children):
-            node_dict['children'] = [child.to_dict() for child in either(self.children, [])]
-
         if self.checksum is not None:
             node_dict['checksum'] = self.checksum
 
         if self.checksum_algo is not None:
             node_dict['checksum_algo'] = self.checksum_algo
 
+        if self.chunks is not None:
+            node_dict['chunks'] = self.chunks
+            node_dict['chunk_size'] = self.chunk_size
+
         return node_dict
 
     @staticmethod
@@ -103,25 +172,39 @@ class Node:
         """
         Initializes a Node instance from the values in a dictionary.
 
+        The nested children are read using an explicit stack so the depth of the tree is not limited by the recursion
+        limit.
+
         :param parent: The parent Node the newly created node will be a child of. If this value is not None then
             the attach_child function of the parent Node will be invoked.
         :param values: The dictionary containing the values to initialize the new Node.
         :return: A newly initialized Node with the constructor values pulled from the values dict.
         """
+        root = Node._from_dict_without_children(parent, values)
+        pending = [(root, values)]
+        while len(pending) > 0:
+            node, node_values = pending.pop()
+            children = node_values.get('children')
+            if has_elements(children):
+                for child_values in either(children, []):
+                    pending.append((Node._from_dict_without_children(node, child_values), child_values))
+        return root
+
+    @staticmethod
+    def _from_dict_without_children(parent: Node | None, values: Dict[str, Any]) -> Node:
         _validate_properties(values)
 
+        size = values.get('size')
         node = Node(
             parent,
-            _get_name(values),
-            _get_size(values),
+            values['alternate_name'] if 'alternate_name' in values else values['name'],
+            int(size) if size is not None else None,
             values.get('checksum'),
             values.get('checksum_algo')
         )
+        node.chunks = values.get('chunks')
+        node.chunk_size = values.get('chunk_size')
 
         if parent is not None:
             parent.attach_child(node)
-        children = values.get('children')
-        if has_elements(children):
-            for child in either(children, []):
-                Node.from_dict(node, child)
         return node
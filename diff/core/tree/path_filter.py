@@ -0,0 +1,138 @@
+from typing import List, Sequence, Pattern, Final
+from pathlib import Path
+import re
+
+from diff.core.errors import NotAFileException
+
+
+# Directories created by Windows on every drive that should never be scanned.
+DEFAULT_EXCLUDES: Final[List[str]] = [
+    'System Volume Information/',
+    '$RECYCLE.BIN/'
+]
+
+
+class PathFilter:
+
+    """
+    Decides which files and directories should be skipped while walking a tree. Every pattern is compiled once, all
+    the patterns of the same kind being combined into a single regular expression, so checking an entry costs at most
+    a few regex matches regardless of how many patterns there are.
+
+    Patterns follow a subset of the gitignore syntax:
+        * A pattern without a slash, such as node_modules or *.tmp, matches the name of an entry at any depth.
+        * A pattern containing a slash, such as build/output or docs/**/*.md, matches the path of an entry relative
+          to the root of the walk. A leading slash is ignored.
+        * A pattern ending with a slash only matches directories.
+        * * matches anything but a slash, ? matches a single character other than a slash, ** matches any number of
+          directories, and [abc] matches one of the enclosed characters.
+    """
+
+    def __init__(self, excludes: Sequence[str] = (), includes: Sequence[str] = ()):
+        """
+        :param excludes: The patterns of the files and directories to skip. Excluded directories are not listed.
+        :param includes: If specified only the files matching at least one of these patterns are kept. Directories are
+            always walked, unless excluded, since a file nested within them may match. Excludes take precedence.
+        """
+        self._name_excludes = _combine([pattern for pattern in excludes if not _is_directory_only(pattern) and not _is_path(pattern)])
+        self._name_directory_excludes = _combine([pattern for pattern in excludes if _is_directory_only(pattern) and not _is_path(pattern)])
+        self._path_excludes = _combine([pattern for pattern in excludes if not _is_directory_only(pattern) and _is_path(pattern)])
+        self._path_directory_excludes = _combine([pattern for pattern in excludes if _is_directory_only(pattern) and _is_path(pattern)])
+        self._name_includes = _combine([pattern for pattern in includes if not _is_path(pattern)])
+        self._path_includes = _combine([pattern for pattern in includes if _is_path(pattern)])
+        self._has_includes = len(includes) > 0
+
+    def should_skip(self, name: str, relative_path: str, is_dir: bool) -> bool:
+        """
+        Checks if an entry should be skipped.
+
+        :param name: The name of the entry.
+        :param relative_path: The path of the entry relative to the root of the walk, using / as the separator.
+        :param is_dir: True if the entry is a directory.
+        :return: True if the entry is excluded or, for files, if includes were specified and none of them match.
+        """
+        if _matches(self._name_excludes, name) or _matches(self._path_excludes, relative_path):
+            return True
+        if is_dir:
+            return _matches(self._name_directory_excludes, name) or _matches(self._path_directory_excludes, relative_path)
+        if self._has_includes:
+            return not (_matches(self._name_includes, name) or _matches(self._path_includes, relative_path))
+        return False
+
+
+def read_ignore_file(path: Path) -> List[str]:
+    """
+    Reads the exclude patterns from an ignore file. Every non-empty line is a pattern, lines starting with # are
+    comments.
+
+    :param path: The path to the ignore file.
+    :return: The patterns read from the file.
+    """
+    if not path.is_file():
+        raise NotAFileException('ignore file', path)
+    with open(path, 'r') as file:
+        lines = [line.strip() for line in file]
+    return [line for line in lines if len(line) > 0 and not line.startswith('#')]
+
+
+def build_path_filter(excludes: Sequence[str], includes: Sequence[str], ignore_file: str | None) -> PathFilter:
+    """
+    Creates the PathFilter used by the commands, combining the default excludes, the excludes specified on the command
+    line, and the excludes read from the ignore file, if any.
+    """
+    all_excludes = [*DEFAULT_EXCLUDES, *excludes]
+    if ignore_file is not None:
+        all_excludes.extend(read_ignore_file(Path(ignore_file)))
+    return PathFilter(all_excludes, includes)
+
+
+def _is_directory_only(pattern: str) -> bool:
+    return pattern.endswith('/')
+
+
+def _is_path(pattern: str) -> bool:
+    return '/' in pattern.rstrip('/')
+
+
+def _combine(patterns: List[str]) -> Pattern[str] | None:
+    if len(patterns) == 0:
+        return None
+    return re.compile('|'.join(f'(?:{_glob_to_regex(pattern.strip("/"))})' for pattern in patterns))
+
+
+def _matches(pattern: Pattern[str] | None, value: str) -> bool:
+    return pattern is not None and pattern.fullmatch(value) is not None
+
+
+def _glob_to_regex(pattern: str) -> str:
+    parts: List[str] = []
+    position = 0
+    while position < len(pattern):
+        character = pattern[position]
+        if pattern.startswith('**/', position):
+            parts.append('(?:.*/)?')
+            position += 3
+            continue
+        if pattern.startswith('**', position):
+            parts.append('.*')
+            position += 2
+            continue
+        if character == '*':
+            parts.append('[^/]*')
+        elif character == '?':
+            parts.append('[^/]')
+        elif character == '[' and ']' in pattern[position + 1:]:
+            end = pattern.index(']', position + 1)
+            content = pattern[position + 1:end]
+            if content.startswith('!'):
+                content = '^' + content[1:]
+            parts.append('[' + content.replace('\\', '\\\\') + ']')
+            position = end + 1
+            continue
+        else:
+            parts.append(re.escape(character))
+        position += 1
+    return ''.join(parts)
+
+
+DEFAULT_PATH_FILTER: Final[PathFilter] = PathFilter(DEFAULT_EXCLUDES)
@@ -0,0 +1,180 @@
+from typing import TYPE_CHECKING, List, Dict, Tuple, Iterator, Callable, Any, FrozenSet, Final
+from pathlib import Path
+import os
+
+from diff.core.errors import InvalidScanFileException, InvalidNodePropertiesException
+
+from .node import Node, _VALID_NODE_KEYS
+from .yml import _yaml
+
+if TYPE_CHECKING:
+    # Only used in annotations, the temporary files are only needed by external diffs.
+    from diff.core.util import SpillFile
+
+
+# The path relative to the root, the size, which is None for directories, and the checksum of a file or directory.
+TreeEntry = Tuple[str, int | None, str | None]
+
+_NULL_SCALARS: Final[FrozenSet[str]] = frozenset(['', '~', 'null', 'Null', 'NULL'])
+
+
+class _Mapping:
+
+    """
+    The state of a node whose mapping is being read.
+    """
+
+    def __init__(self, parent: '_Mapping | None', identifier: int):
+        self.parent = parent
+        self.identifier = identifier
+        self.values: Dict[str, Any] = {}
+        self.key: str | None = None
+        self.in_children = False
+        self.has_unresolved_children = False
+        # The path relative to the root, which is only known once the names of the node and all its parents are.
+        self.path: str | None = '' if parent is None else None
+
+    def name(self) -> str | None:
+        return self.values.get('alternate_name', self.values.get('name'))
+
+    def resolve_path(self):
+        if self.path is not None or self.parent is None or self.parent.path is None:
+            return
+        name = self.name()
+        if name is not None:
+            self.path = os.path.join(self.parent.path, name)
+
+
+class ScanEntries:
+
+    """
+    Reads the entries of a scan file one at a time from the stream of events of the YAML parser, so the scan never has
+    to be loaded into memory.
+
+    The path of an entry can only be known once the names of all its parents have been read. Scans are written with
+    the name of every node ahead of its children so every entry is read with its path. Scans written with their keys
+    sorted, where the children of a node come before its name, have the entries whose path is not yet known written
+    to a temporary file, along with the name and parent of each of their directories. Their paths are resolved once
+    the whole scan has been read.
+    """
+
+    def __init__(self, file_path: Path, spill_file: Callable[[], 'SpillFile']):
+        self._file_path = file_path
+        self._spill_file = spill_file
+        self.root: Node | None = None
+
+    def __iter__(self) -> Iterator[TreeEntry]:
+        try:
+            yield from self._read()
+        except Exception as e:
+            raise InvalidScanFileException(self._file_path, e) from e
+
+    def _read(self) -> Iterator[TreeEntry]:
+        yaml = _yaml()
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+        unresolved: 'SpillFile | None' = None
+        # The parent and name of every directory whose path was not known when it was read, and the path of every
+        # directory whose path was only known after some of its children were read.
+        late_directories: Dict[int, Tuple[int, str]] = {}
+        resolved_directories: Dict[int, str] = {}
+
+        stack: List[_Mapping] = []
+        skipped_depth = 0
+        next_identifier = 0
+        with open(self._file_path, 'rb') as file:
+            for event in yaml.parse(file, Loader=loader):
+                if skipped_depth > 0:
+                    if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+                        skipped_depth += 1
+                    elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                        skipped_depth -= 1
+                elif isinstance(event, yaml.MappingStartEvent):
+                    parent = stack[-1] if len(stack) > 0 else None
+                    if parent is not None and not parent.in_children:
+                        raise ValueError(f'Expected a value for the [{parent.key}] property but found a mapping.')
+                    stack.append(_Mapping(parent, next_identifier))
+                    next_identifier += 1
+                elif isinstance(event, yaml.ScalarEvent):
+                    mapping = stack[-1]
+                    if mapping.in_children:
+                        raise ValueError('Expected every child to be a mapping but found a scalar.')
+                    if mapping.key is None:
+                        if event.value not in _VALID_NODE_KEYS:
+                            raise InvalidNodePropertiesException(event.value)
+                        mapping.key = event.value
+                        continue
+                    mapping.values[mapping.key] = _scalar_value(mapping.key, event)
+                    mapping.key = None
+                    mapping.resolve_path()
+                elif isinstance(event, yaml.SequenceStartEvent):
+                    mapping = stack[-1]
+                    if mapping.key == 'children':
+                        mapping.in_children = True
+                    else:
+                        skipped_depth = 1
+                    mapping.key = None
+                elif isinstance(event, yaml.SequenceEndEvent):
+                    stack[-1].in_children = False
+                elif isinstance(event, yaml.MappingEndEvent):
+                    mapping = stack.pop()
+                    name = mapping.name()
+                    if name is None:
+                        raise ValueError('Every node must have a name.')
+                    if mapping.parent is None:
+                        self.root = Node(
+                            None,
+                            name,
+                            mapping.values.get('size'),
+                            mapping.values.get('checksum'),
+                            mapping.values.get('checksum_algo')
+                        )
+                        continue
+
+                    mapping.resolve_path()
+                    size = mapping.values.get('size')
+                    checksum = mapping.values.get('checksum')
+                    if mapping.path is not None:
+                        if mapping.has_unresolved_children:
+                            resolved_directories[mapping.identifier] = mapping.path
+                        yield mapping.path, size, checksum
+                    else:
+                        if unresolved is None:
+                            unresolved = self._spill_file()
+                        unresolved.write((mapping.parent.identifier, name, size, checksum))
+                        mapping.parent.has_unresolved_children = True
+                        if mapping.has_unresolved_children:
+                            late_directories[mapping.identifier] = (mapping.parent.identifier, name)
+                elif isinstance(event, yaml.AliasEvent):
+                    raise ValueError('Aliases are not supported in scan files.')
+
+        if unresolved is None:
+            return
+        for parent_identifier, name, size, checksum in unresolved.read():
+            parent_path = _resolve(parent_identifier, late_directories, resolved_directories)
+            yield os.path.join(parent_path, name), size, checksum
+        unresolved.path.unlink()
+
+
+def _resolve(identifier: int, late_directories: Dict[int, Tuple[int, str]], resolved_directories: Dict[int, str]) -> str:
+    """
+    Resolves the path of a directory from the names of its parents, remembering the path of every directory along the
+    way. The parents are followed with a loop so the depth of the tree is not limited by the recursion limit.
+    """
+    chain: List[int] = []
+    while identifier not in resolved_directories:
+        chain.append(identifier)
+        identifier = late_directories[identifier][0]
+    path = resolved_directories[identifier]
+    for directory in reversed(chain):
+        path = os.path.join(path, late_directories[directory][1])
+        resolved_directories[directory] = path
+    return path
+
+
+def _scalar_value(key: str, event: Any) -> Any:
+    if event.style is None and event.value in _NULL_SCALARS:
+        return None
+    if key in ('size', 'chunk_size'):
+        return int(event.value)
+    return event.value
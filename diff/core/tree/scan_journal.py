@@ -0,0 +1,171 @@
+from typing import List, Dict, Tuple, Any, Callable, Final
+from pathlib import Path
+import json
+import os
+import time
+
+from diff.core.util import Profiler, PROFILER_SINGLETON
+
+
+DEFAULT_CHECKPOINT_INTERVAL: Final[float] = 30.0
+
+_JOURNAL_SUFFIX: Final[str] = '.journal'
+
+
+class _Completed:
+
+    def __init__(self, size: int, modification_time: int, checksum: str, chunks: List[str] | None, chunk_size: int | None):
+        self.size = size
+        self.modification_time = modification_time
+        self.checksum = checksum
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+
+
+class ScanJournal:
+
+    """
+    Records the checksum of every file hashed by a scan to a journal file next to the output of the scan, so a scan
+    that was interrupted can be resumed without hashing the files it already hashed.
+
+    The first line of the journal holds the settings of the scan and every other line holds the checksum of one file,
+    along with the size and modification time the file had when it was hashed. Lines are appended as each file is
+    hashed and the journal is flushed to disk at every checkpoint. A line that was only partially written when the scan
+    was interrupted is discarded when the journal is resumed.
+    """
+
+    def __init__(self,
+                 journal_path: Path,
+                 settings: Dict[str, Any],
+                 resume: bool,
+                 checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        """
+        :param journal_path: The path of the journal file.
+        :param settings: The settings of the scan. A journal can only be resumed by a scan with the same settings.
+        :param resume: If true the checksums recorded by the existing journal are reused. Otherwise an existing journal
+            is discarded.
+        :param checkpoint_interval: The number of seconds between flushing the journal to disk.
+        :raises ValueError: If the journal is being resumed but was created with different settings.
+        """
+        self.journal_path = journal_path
+        self._checkpoint_interval = checkpoint_interval
+        self._clock = clock
+        self._profiler = profiler
+        self._completed: Dict[str, _Completed] = {}
+
+        if resume and journal_path.exists():
+            complete_length = self._read(settings)
+            self._file = open(journal_path, 'r+b')
+            self._file.truncate(complete_length)
+            self._file.seek(complete_length)
+        else:
+            self._file = open(journal_path, 'wb')
+            self._write_line(settings)
+        self._last_checkpoint = self._clock()
+
+    @property
+    def resumed(self) -> int:
+        """
+        The number of files whose checksum was read from the journal when it was resumed.
+        """
+        return len(self._completed)
+
+    def restore(self, path: Path, path_stat: os.stat_result) -> Tuple[str, List[str] | None, int | None] | None:
+        """
+        Gets the checksum recorded for a file, as long as the file was not modified since it was hashed.
+
+        :return: The checksum, chunk checksums and chunk size recorded for the file or None if the file must be hashed.
+        """
+        completed = self._completed.get(str(path))
+        if completed is None or completed.size != path_stat.st_size or completed.modification_time != path_stat.st_mtime_ns:
+            return None
+        return completed.checksum, completed.chunks, completed.chunk_size
+
+    def record(self,
+               path: Path,
+               path_stat: os.stat_result,
+               checksum: str,
+               chunks: List[str] | None = None,
+               chunk_size: int | None = None):
+        """
+        Records the checksum of a file that was just hashed, and flushes the journal to disk once the checkpoint
+        interval has elapsed since the last checkpoint.
+        """
+        entry = {
+            'path': str(path),
+            'size': path_stat.st_size,
+            'mtime_ns': path_stat.st_mtime_ns,
+            'checksum': checksum,
+            'chunks': chunks,
+            'chunk_size': chunk_size
+        }
+        self._write_line(entry)
+        if self._clock() - self._last_checkpoint >= self._checkpoint_interval:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Flushes every checksum recorded so far to disk.
+        """
+        with self._profiler.span('scan_journal.checkpoint'):
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_checkpoint = self._clock()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.checkpoint()
+        self._file.close()
+
+    def remove(self):
+        """
+        Removes the journal once the scan it belongs to has been saved.
+        """
+        self.close()
+        self.journal_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'ScanJournal':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def _write_line(self, values: Dict[str, Any]):
+        # Non ASCII characters are escaped so names that cannot be encoded, such as undecodable file names, are kept.
+        self._file.write(json.dumps(values).encode('ascii') + b'\n')
+
+    def _read(self, settings: Dict[str, Any]) -> int:
+        """
+        Reads the checksums recorded by the journal one line at a time.
+
+        :return: The length, in bytes, of the journal up to the end of its last complete line.
+        """
+        with open(self.journal_path, 'rb') as file:
+            header = file.readline()
+            if not header.endswith(b'\n') or json.loads(header) != settings:
+                raise ValueError(f'The journal was created by a scan with different settings. Scan again with the same '
+                                 f'settings or delete the following file and try again: [{self.journal_path}]')
+            complete_length = len(header)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                entry = json.loads(line)
+                self._completed[entry['path']] = _Completed(
+                    entry['size'],
+                    entry['mtime_ns'],
+                    entry['checksum'],
+                    entry['chunks'],
+                    entry['chunk_size']
+                )
+                complete_length += len(line)
+        return complete_length
+
+
+def journal_path_for(output_path: Path) -> Path:
+    """
+    Gets the path of the journal kept next to the output of a scan while the scan is running.
+    """
+    return output_path.with_name(output_path.name + _JOURNAL_SUFFIX)
@@ -0,0 +1,434 @@
+from typing import List, Dict, Tuple, Callable, Final
+from pathlib import Path
+import errno
+import os
+import stat
+import time
+
+from diff.core.errors import NotADirectoryException
+from diff.core.util import Checksum, CHECKSUM_SINGLETON, either
+from diff.core.util.inotify import (
+    Inotify,
+    InotifyEvent,
+    IN_MODIFY,
+    IN_ATTRIB,
+    IN_CLOSE_WRITE,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_MOVE_SELF,
+    IN_Q_OVERFLOW,
+    IN_IGNORED,
+    IN_ONLYDIR,
+    IN_DONT_FOLLOW,
+    IN_ISDIR
+)
+
+from .node import Node
+from .path_filter import PathFilter, DEFAULT_PATH_FILTER
+from .tree_loader import TreeLoader, TREE_LOADER_SINGLETON
+from .yml import YamlSerialization, YAML_SERIALIZATION_SINGLETON
+
+
+DEFAULT_FLUSH_INTERVAL: Final[float] = 30.0
+
+_WATCH_MASK: Final[int] = (IN_CREATE | IN_DELETE | IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+                           | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+
+# The longest time spent waiting for events before checking if the watch should stop.
+_STOP_CHECK_INTERVAL: Final[float] = 0.5
+
+
+class WatchedScan:
+
+    """
+    A scan tree kept up to date by applying the inotify events of every directory within it.
+
+    Files that are created or modified are only rehashed when the scan is flushed, so a file written in many small
+    writes is hashed once. Renames within the tree move the existing nodes, along with their checksums, without
+    rehashing them.
+
+    Two situations lose events, in which case a targeted rescan lists the affected directories again and only rehashes
+    the files whose size or modification time changed:
+        * The event queue of the kernel overflowed. Every directory is rescanned.
+        * A directory could not be watched because the limit of watches, fs.inotify.max_user_watches, was reached.
+          That directory is rescanned on every flush instead.
+    """
+
+    def __init__(self,
+                 root: Node,
+                 inotify: Inotify,
+                 tree_loader: TreeLoader,
+                 checksum: Checksum,
+                 path_filter: PathFilter):
+        self.root = root
+        self._inotify = inotify
+        self._tree_loader = tree_loader
+        self._checksum = checksum
+        self._path_filter = path_filter
+        self._directories: Dict[int, Node] = {}
+        self._watches: Dict[Node, int] = {}
+        self._unwatched: Dict[Node, None] = {}
+        self._moved: Dict[int, Node] = {}
+        self._missed: Dict[Tuple[Node, str], None] = {}
+        self._dirty: Dict[Node, None] = {}
+        self._modification_times: Dict[Node, int] = {}
+        self._compute_checksums = any(node.checksum is not None for node in _files(root))
+        self._changes = 0
+        self.overflows = 0
+
+    def start(self):
+        """
+        Watches every directory of the tree and catches up on the files that were added, deleted or resized since
+        the scan was created.
+        """
+        self._add_directory_watch(self.root)
+        self._rescan(self.root)
+
+    def apply_events(self, events: List[InotifyEvent]):
+        """
+        Applies a batch of events to the tree.
+        """
+        for event in events:
+            self._apply_event(event)
+        # A directory moved out of the tree only produces a moved from event. Its nodes can be discarded once no
+        # matching moved to event was found in the same batch.
+        for node in self._moved.values():
+            self._forget(node)
+        self._moved.clear()
+        # An entry that could not be stat'ed may have been moved, along with its directory, by a later event of the
+        # batch. Its directory now has the path the entry can be found at.
+        missed, self._missed = self._missed, {}
+        for directory, name in missed:
+            if _is_attached(directory, self.root):
+                self._add_or_update(directory, name)
+        self._missed.clear()
+
+    def flush(self) -> int:
+        """
+        Rescans the directories that could not be watched and rehashes the files that changed since they were last
+        hashed.
+
+        :return: The number of changes applied to the tree since the previous flush.
+        """
+        for directory in list(self._unwatched):
+            # Watches may have been freed since so the directory is only polled while it still cannot be watched.
+            del self._unwatched[directory]
+            self._add_directory_watch(directory)
+            self._rescan(directory)
+
+        algo = self.root.checksum_algo
+        for node in self._dirty:
+            node_stat = _stat_or_none(_path(node))
+            if node_stat is None or not stat.S_ISREG(node_stat.st_mode):
+                continue
+            if node.size == node_stat.st_size and self._modification_times.get(node) == node_stat.st_mtime_ns:
+                continue
+            node.size = node_stat.st_size
+            self._modification_times[node] = node_stat.st_mtime_ns
+            self._changes += 1
+            if not self._compute_checksums or algo is None:
+                continue
+            try:
+                if node.chunk_size is not None:
+                    node.checksum, node.chunks = self._checksum.compute_file_checksum_and_chunk_digests(
+                        _path(node),
+                        algo,
+                        node.chunk_size
+                    )
+                else:
+                    node.checksum = self._checksum.compute_file_checksum(_path(node), algo)
+            except OSError:
+                # The file was deleted, or replaced, while it was being read. The following event will update it.
+                continue
+        self._dirty.clear()
+
+        changes, self._changes = self._changes, 0
+        return changes
+
+    def close(self):
+        for wd in self._watches.values():
+            self._inotify.remove_watch(wd)
+        self._watches.clear()
+        self._directories.clear()
+
+    def _apply_event(self, event: InotifyEvent):
+        if event.mask & IN_Q_OVERFLOW:
+            self.overflows += 1
+            self._rescan(self.root)
+            return
+
+        directory = self._directories.get(event.wd)
+        if directory is None:
+            return
+        if event.mask & IN_IGNORED:
+            self._directories.pop(event.wd, None)
+            self._watches.pop(directory, None)
+            return
+        if event.mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            if directory is self.root:
+                raise NotADirectoryException('scanned directory', _path(self.root))
+            return
+
+        is_dir = event.mask & IN_ISDIR != 0
+        if self._path_filter.should_skip(event.name, _relative_path(directory, event.name), is_dir):
+            return
+
+        child = directory.find_child(event.name)
+        if event.mask & IN_MOVED_FROM:
+            if child is not None:
+                _detach(child)
+                self._changes += 1
+                self._moved[event.cookie] = child
+        elif event.mask & IN_DELETE:
+            if child is not None:
+                self._remove(child)
+        elif event.mask & IN_MOVED_TO and event.cookie in self._moved:
+            moved = self._moved.pop(event.cookie)
+            if child is not None:
+                self._remove(child)
+            moved.name = event.name
+            moved.parent = directory
+            directory.attach_child(moved)
+        elif event.mask & (IN_CREATE | IN_MOVED_TO):
+            self._add_or_update(directory, event.name)
+        elif child is not None and child.size is not None:
+            self._dirty[child] = None
+
+    def _add_or_update(self, directory: Node, name: str):
+        child_stat = _stat_or_none(_path(directory).joinpath(name))
+        if child_stat is None:
+            self._missed[(directory, name)] = None
+            return
+        child = directory.find_child(name)
+        if child is not None and (child.size is not None) != stat.S_ISREG(child_stat.st_mode):
+            self._remove(child)
+            child = None
+        if child is None:
+            child = self._attach(directory, name, child_stat)
+        elif child.size is not None:
+            self._dirty[child] = None
+        if stat.S_ISDIR(child_stat.st_mode):
+            # Entries created before the watch of a new directory was added do not produce any event so the new
+            # directory is listed once its watch is in place.
+            self._rescan(child)
+
+    def _rescan(self, directory: Node):
+        """
+        Lists a directory, and every directory nested within it, adding and removing nodes to match the disk and
+        marking the files whose size or modification time changed as dirty.
+        """
+        pending = [directory]
+        while len(pending) > 0:
+            current = pending.pop()
+            try:
+                children = self._tree_loader.list_children(_path(current), _relative_path(current), self._path_filter)
+            except OSError:
+                continue
+
+            names = {child_path.name for child_path in children}
+            for existing in list(either(current.children, [])):
+                if existing.name not in names:
+                    self._remove(existing)
+
+            for child_path in children:
+                child_stat = _stat_or_none(child_path)
+                if child_stat is None:
+                    continue
+                is_file = stat.S_ISREG(child_stat.st_mode)
+                child = current.find_child(child_path.name)
+                if child is not None and (child.size is not None) != is_file:
+                    self._remove(child)
+                    child = None
+                if child is None:
+                    child = self._attach(current, child_path.name, child_stat)
+                elif is_file:
+                    recorded = self._modification_times.get(child)
+                    if child.size != child_stat.st_size or (recorded is not None and recorded != child_stat.st_mtime_ns):
+                        self._dirty[child] = None
+                    elif recorded is None:
+                        self._modification_times[child] = child_stat.st_mtime_ns
+                if stat.S_ISDIR(child_stat.st_mode):
+                    if child not in self._watches and child not in self._unwatched:
+                        self._add_directory_watch(child)
+                    pending.append(child)
+
+    def _attach(self, directory: Node, name: str, child_stat: os.stat_result) -> Node:
+        is_file = stat.S_ISREG(child_stat.st_mode)
+        child = Node(directory, name, child_stat.st_size if is_file else None, None, None)
+        directory.attach_child(child)
+        # New files are counted as a change once they are hashed by the next flush.
+        if is_file:
+            self._dirty[child] = None
+            return child
+        self._changes += 1
+        if stat.S_ISDIR(child_stat.st_mode):
+            self._add_directory_watch(child)
+        return child
+
+    def _remove(self, node: Node):
+        _detach(node)
+        self._forget(node)
+        self._changes += 1
+
+    def _add_directory_watch(self, directory: Node):
+        try:
+            wd = self._inotify.add_watch(_path(directory), _WATCH_MASK)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                self._unwatched[directory] = None
+            return
+        self._directories[wd] = directory
+        self._watches[directory] = wd
+
+    def _forget(self, node: Node):
+        """
+        Removes the watches and the bookkeeping of a node, and of every node nested within it, that is no longer part
+        of the tree.
+        """
+        pending = [node]
+        while len(pending) > 0:
+            current = pending.pop()
+            self._dirty.pop(current, None)
+            self._modification_times.pop(current, None)
+            self._unwatched.pop(current, None)
+            wd = self._watches.pop(current, None)
+            if wd is not None:
+                self._directories.pop(wd, None)
+                self._inotify.remove_watch(wd)
+            pending.extend(either(current.children, []))
+
+
+class ScanWatcher:
+
+    def __init__(self,
+                 tree_loader: TreeLoader = TREE_LOADER_SINGLETON,
+                 yaml_serialization: YamlSerialization = YAML_SERIALIZATION_SINGLETON,
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 inotify_factory: Callable[[], Inotify] = Inotify,
+                 clock: Callable[[], float] = time.monotonic):
+        self._tree_loader = tree_loader
+        self._yaml_serialization = yaml_serialization
+        self._checksum = checksum
+        self._inotify_factory = inotify_factory
+        self._clock = clock
+
+    def open(self, scan_path: Path, path_filter: PathFilter = DEFAULT_PATH_FILTER) -> Tuple[WatchedScan, Inotify]:
+        """
+        Loads a scan and starts watching the directory it was created from.
+
+        :param scan_path: The path to the scan file.
+        :param path_filter: The filter the scan was created with.
+        :return: The watched scan along with the inotify instance delivering its events, which must be closed once
+            the scan is no longer watched.
+        """
+        root = self._tree_loader.read_tree_from_yaml(scan_path)
+        root_path = _path(root)
+        if not root_path.is_dir():
+            raise NotADirectoryException('scanned directory', root_path)
+        inotify = self._inotify_factory()
+        try:
+            watched_scan = WatchedScan(root, inotify, self._tree_loader, self._checksum, path_filter)
+            watched_scan.start()
+        except BaseException:
+            inotify.close()
+            raise
+        return watched_scan, inotify
+
+    def save(self, scan_path: Path, watched_scan: WatchedScan):
+        """
+        Writes the tree of a watched scan to a temporary file that then replaces the scan file, so the scan file is
+        never left partially written.
+        """
+        temporary_path = scan_path.with_name(scan_path.name + '.tmp')
+        self._yaml_serialization.to_yaml_file(temporary_path, watched_scan.root)
+        os.replace(temporary_path, scan_path)
+
+    def watch(self,
+              scan_path: Path,
+              flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+              path_filter: PathFilter = DEFAULT_PATH_FILTER,
+              should_stop: Callable[[], bool] = lambda: False,
+              on_flush: Callable[[int], None] = lambda changes: None):
+        """
+        Keeps a scan file up to date until should_stop returns True or the watch is interrupted.
+
+        :param scan_path: The path to the scan file to update.
+        :param flush_interval: The number of seconds between the flushes of the changes to the scan file.
+        :param path_filter: The filter the scan was created with.
+        :param should_stop: Checked at least every half second, the watch stops once it returns True.
+        :param on_flush: Called with the number of changes every time the changes are written to the scan file.
+        """
+        watched_scan, inotify = self.open(scan_path, path_filter)
+        try:
+            next_flush = self._clock() + flush_interval
+            while not should_stop():
+                timeout = min(max(next_flush - self._clock(), 0.0), _STOP_CHECK_INTERVAL)
+                watched_scan.apply_events(inotify.read_events(timeout))
+                if self._clock() >= next_flush:
+                    self._flush(scan_path, watched_scan, on_flush)
+                    next_flush = self._clock() + flush_interval
+        finally:
+            try:
+                self._flush(scan_path, watched_scan, on_flush)
+            finally:
+                watched_scan.close()
+                inotify.close()
+
+    def _flush(self, scan_path: Path, watched_scan: WatchedScan, on_flush: Callable[[int], None]):
+        changes = watched_scan.flush()
+        if changes > 0:
+            self.save(scan_path, watched_scan)
+            on_flush(changes)
+
+
+def _path(node: Node) -> Path:
+    return node.path_to_node()
+
+
+def _relative_path(directory: Node, name: str | None = None) -> str:
+    names = [name] if name is not None else []
+    current: Node | None = directory
+    while current is not None and current.parent is not None:
+        names.append(current.name)
+        current = current.parent
+    return '/'.join(reversed(names))
+
+
+def _is_attached(node: Node, root: Node) -> bool:
+    # Detached nodes keep a reference to their former parent so the children of every parent are checked.
+    current = node
+    while current is not root:
+        parent = current.parent
+        if parent is None or current not in either(parent.children, []):
+            return False
+        current = parent
+    return True
+
+
+def _detach(node: Node):
+    if node.parent is not None:
+        node.parent.detach_child(node)
+
+
+def _files(root: Node) -> List[Node]:
+    files: List[Node] = []
+    pending = [root]
+    while len(pending) > 0:
+        current = pending.pop()
+        if current.size is not None:
+            files.append(current)
+        pending.extend(either(current.children, []))
+    return files
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+SCAN_WATCHER_SINGLETON: Final[ScanWatcher] = ScanWatcher()
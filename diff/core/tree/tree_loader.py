@@ -1,28 +1,59 @@
-from typing import List, Dict, Any, Final
+from typing import TYPE_CHECKING, List, Dict, Tuple, Iterator, Callable, TypeVar, Final
 import os
+import stat
 from pathlib import Path
 
 from diff.core.errors import InvalidScanFileException
-from diff.core.util import Checksum, CHECKSUM_SINGLETON
+from diff.core.util import (
+    Checksum,
+    CHECKSUM_SINGLETON,
+    HashPool,
+    HASH_POOL_SINGLETON,
+    TREE_HASH_ALGORITHMS,
+    ProgressReporter,
+    ProgressStage,
+    PROGRESS_REPORTER_SINGLETON,
+    Profiler,
+    PROFILER_SINGLETON,
+    either
+)
+from diff.core.util.physical_order import physical_offset
 
 from .node import Node
+from .path_filter import PathFilter, DEFAULT_PATH_FILTER
+from .scan_entries import ScanEntries, TreeEntry
 from .yml import YamlSerialization, YAML_SERIALIZATION_SINGLETON
 
+if TYPE_CHECKING:
+    # Only used in annotations, the temporary files are only needed by external diffs.
+    from diff.core.util import SpillFile
+    from .scan_journal import ScanJournal
+
+
+# The value representing each entry of a walk, such as its node or its relative path.
+W = TypeVar('W')
 
 DEFAULT_HASH_ALGORITHM: Final[str] = 'sha256'
 
 AVAILABLE_HASH_ALGORITHMS: Final[List[str]] = [
     'md5',
     DEFAULT_HASH_ALGORITHM,
-    'sha512'
+    'sha512',
+    *TREE_HASH_ALGORITHMS
 ]
 
-_SKIPPABLE_FILES: Final[List[str]] = [
-]
+READ_ORDER_LISTING: Final[str] = 'listing'
+READ_ORDER_INODE: Final[str] = 'inode'
+READ_ORDER_PHYSICAL: Final[str] = 'physical'
+
+DEFAULT_READ_ORDER: Final[str] = READ_ORDER_LISTING
 
-_SKIPPABLE_FOLDERS: Final[List[str]] = [
-    'System Volume Information',
-    '$RECYCLE.BIN'
+DEFAULT_CHUNK_SIZE: Final[int] = 4 * 1024 * 1024
+
+AVAILABLE_READ_ORDERS: Final[List[str]] = [
+    READ_ORDER_LISTING,
+    READ_ORDER_INODE,
+    READ_ORDER_PHYSICAL
 ]
 
 
@@ -30,9 +61,15 @@ class TreeLoader:
 
     def __init__(self,
                  yaml_serialization: YamlSerialization = YAML_SERIALIZATION_SINGLETON,
-                 checksum: Checksum = CHECKSUM_SINGLETON):
+                 checksum: Checksum = CHECKSUM_SINGLETON,
+                 progress_reporter: ProgressReporter = PROGRESS_REPORTER_SINGLETON,
+                 profiler: Profiler = PROFILER_SINGLETON,
+                 hash_pool: HashPool = HASH_POOL_SINGLETON):
         self._yaml_serialization = yaml_serialization
         self._checksum = checksum
+        self._progress_reporter = progress_reporter
+        self._profiler = profiler
+        self._hash_pool = hash_pool
 
     def read_tree_from_yaml(self, file_path: Path) -> Node:
         """
@@ -42,13 +79,22 @@ class TreeLoader:
         :param file_path: The path to the yaml file to read.
         :return: A Node instance deserialized from the yaml file content.
         """
-        print(f'Reading contents of scan file: [{file_path}]')
         try:
-            return Node.from_dict(None, self._yaml_serialization.read_yaml_file(file_path))
+            values = self._yaml_serialization.read_yaml_file(file_path)
+            with self._profiler.span('tree_loader.from_dict'):
+                return Node.from_dict(None, values)
         except Exception as e:
             raise InvalidScanFileException(file_path, e) from e
 
-    def read_tree_from_disk(self, path: Path, compute_checksums: bool, checksum_algo: str | None) -> Node:
+    def read_tree_from_disk(self,
+                            path: Path,
+                            compute_checksums: bool,
+                            checksum_algo: str | None,
+                            read_order: str = DEFAULT_READ_ORDER,
+                            chunk_threshold: int | None = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            path_filter: PathFilter = DEFAULT_PATH_FILTER,
+                            journal: 'ScanJournal | None' = None) -> Node:
         """
         Initializes a full Node tree from the contents of a path on disk.
 
@@ -56,66 +102,324 @@ class TreeLoader:
         file and directory identified.
 
         If compute_checksums is specified as True then this will also compute the checksum of all files and attach
-        said checksum to each Node representing said files.
+        said checksum to each Node representing said files. The checksums are only computed once the full tree has
+        been read so the files can be hashed in the order specified by read_order.
 
         :param path: The path to the directory whose contents are to be scanned by this function.
         :param compute_checksums: If true this will compute the checksum of all files within the specified path.
         :param checksum_algo: The algorithm to use to compute the checksum of the files on disk.
+        :param read_order: The order in which the files should be hashed. Either listing, to hash the files in the
+            order they were listed in, inode, to hash the files ordered by inode number, or physical, to hash the files
+            ordered by the physical location of their first extent on disk falling back to the inode number for files
+            whose location cannot be determined.
+        :param chunk_threshold: If specified, and checksums are being computed, then every file whose size is at
+            least this many bytes will also have the checksum of each of its chunks attached to its Node so the byte
+            ranges that changed can later be located.
+        :param chunk_size: The size, in bytes, of each chunk when computing chunk checksums.
+        :param path_filter: Decides which files and directories are skipped. Skipped directories are never listed.
+        :param journal: If specified, the checksum of every file hashed is recorded to the journal, and the checksums
+            already recorded by the journal are reused for the files that were not modified since they were hashed.
         :return: The new Node instance initialized from the disk contents.
         """
-        def attach_children(current_path: Path, current_node: Node):
-            if not current_path.is_dir():
-                return
-            child_paths = self._get_non_skippable_files(current_path)
-            if len(child_paths) == 0:
-                return
-            for child_path in child_paths:
-                child_node = self._read_node_details(child_path, current_node, compute_checksums, checksum_algo, None)
-                attach_children(child_path, child_node)
-
-        print(f'Scanning contents of: [{path}]')
-        root_node = self._read_node_details(path, None, False, checksum_algo, str(path))
-        attach_children(path, root_node)
+        if read_order not in AVAILABLE_READ_ORDERS:
+            raise ValueError(f'Unrecognized read order [{read_order}]. Expected one of: {AVAILABLE_READ_ORDERS}')
+
+        root_stat = _stat_or_none(path)
+        root_node = self._read_node_details(path, None, root_stat, checksum_algo, str(path))
+        files_to_hash: List[Tuple[Node, Path, os.stat_result]] = []
+        if root_stat is not None and stat.S_ISDIR(root_stat.st_mode):
+            with self._progress_reporter.stage('Listing') as listing_progress:
+                listing_progress.directory_found()
+                files_to_hash = self._walk(path, root_node, path_filter, listing_progress)
+
+        if compute_checksums and checksum_algo is not None:
+            total_bytes = sum(either(file[0].size, 0) for file in files_to_hash)
+            with self._progress_reporter.stage('Hashing', len(files_to_hash), total_bytes) as hashing_progress:
+                self._compute_checksums(
+                    self._order_for_reading(files_to_hash, read_order),
+                    checksum_algo,
+                    chunk_threshold,
+                    chunk_size,
+                    hashing_progress,
+                    journal,
+                    read_order != READ_ORDER_LISTING
+                )
+
         return root_node
 
+    def read_entries_from_yaml(self, file_path: Path, spill_file: Callable[[], 'SpillFile']) -> ScanEntries:
+        """
+        Reads the entries of a scan file one at a time, without loading the scan into memory.
+
+        :param file_path: The path to the yaml file to read.
+        :param spill_file: Creates the temporary files holding the entries of scans written before the name of each
+            node was written ahead of its children.
+        :return: The entries of the scan. The root of the scan is available once every entry has been read.
+        """
+        return ScanEntries(file_path, spill_file)
+
+    def read_entries_from_disk(self,
+                               path: Path,
+                               compute_checksums: bool,
+                               checksum_algo: str | None,
+                               path_filter: PathFilter = DEFAULT_PATH_FILTER) -> Iterator[TreeEntry]:
+        """
+        Walks the contents of a path on disk one entry at a time, without building a tree, so trees too large to fit
+        in memory can be diffed.
+
+        Unlike read_tree_from_disk the files are hashed as soon as they are found, in the order they were listed in,
+        since ordering them for reading would require holding every file in memory.
+
+        :param path: The path to the directory whose contents are to be walked.
+        :param compute_checksums: If true this will compute the checksum of all files within the specified path.
+        :param checksum_algo: The algorithm to use to compute the checksum of the files on disk.
+        :param path_filter: Decides which files and directories are skipped. Skipped directories are never listed.
+        :return: The path relative to the root, the size, which is None for directories, and the checksum of every
+            file and directory nested within the path.
+        """
+        hash_algo = checksum_algo if compute_checksums else None
+        with self._progress_reporter.stage('Listing') as progress:
+            progress.directory_found()
+            for child_path, child_stat, relative_path in self._walk_paths(
+                    path,
+                    '',
+                    path_filter,
+                    progress,
+                    lambda child_path, _, parent_relative_path: os.path.join(parent_relative_path, child_path.name)):
+                if child_stat is None or not stat.S_ISREG(child_stat.st_mode):
+                    yield relative_path, None, None
+                    continue
+                checksum = None
+                if hash_algo is not None:
+                    with self._profiler.span('tree_loader.hash') as span:
+                        checksum = self._checksum.compute_file_checksum(child_path, hash_algo)
+                        span.add_bytes(child_stat.st_size)
+                progress.file_completed(child_stat.st_size)
+                yield relative_path, child_stat.st_size, checksum
+
+    def _walk(self,
+              root_path: Path,
+              root: Node,
+              path_filter: PathFilter,
+              progress: ProgressStage) -> List[Tuple[Node, Path, os.stat_result]]:
+        """
+        Attaches a node for every file and directory nested within the root directory.
+
+        :return: The node, path and stat result of every regular file, in the order the files were found in.
+        """
+        def build_node(child_path: Path, child_stat: os.stat_result | None, parent: Node) -> Node:
+            with self._profiler.span('tree_loader.build_node'):
+                return self._read_node_details(child_path, parent, child_stat, None, None)
+
+        files: List[Tuple[Node, Path, os.stat_result]] = []
+        for child_path, child_stat, child_node in self._walk_paths(root_path, root, path_filter, progress, build_node):
+            if child_stat is not None and child_node.size is not None:
+                files.append((child_node, child_path, child_stat))
+                progress.file_completed()
+        return files
+
+    def _walk_paths(self,
+                    root_path: Path,
+                    root: W,
+                    path_filter: PathFilter,
+                    progress: ProgressStage,
+                    create: Callable[[Path, os.stat_result | None, W], W]) -> Iterator[Tuple[Path, os.stat_result | None, W]]:
+        """
+        Visits every file and directory nested within the root directory that is not skipped by the path filter.
+
+        :param root: The value representing the root directory, such as its node.
+        :param create: Creates the value representing an entry, from its path, its stat result, which is None if it
+            could not be stat'ed, and the value representing its parent.
+        :return: The path, stat result and value of every entry, in the order they were found in.
+        """
+        # Each entry of the stack holds the remaining children of a directory. A directory is descended into as soon
+        # as it is found, the same order a recursive walk would visit it in, without being limited by the recursion
+        # limit on deep trees.
+        pending: List[Tuple[Iterator[Tuple[Path, str]], W]] = [
+            (self._list_directory(root_path, '', path_filter, progress), root)
+        ]
+        while len(pending) > 0:
+            child_paths, parent = pending[-1]
+            child = next(child_paths, None)
+            if child is None:
+                pending.pop()
+                continue
+            child_path, child_relative_path = child
+            with self._profiler.span('tree_loader.stat'):
+                child_stat = _stat_or_none(child_path)
+            value = create(child_path, child_stat, parent)
+            yield child_path, child_stat, value
+            if child_stat is not None and stat.S_ISDIR(child_stat.st_mode):
+                progress.directory_found()
+                pending.append((self._list_directory(child_path, child_relative_path, path_filter, progress), value))
+
+    def _compute_checksums(self,
+                           files: List[Tuple[Node, Path, os.stat_result]],
+                           checksum_algo: str,
+                           chunk_threshold: int | None,
+                           chunk_size: int,
+                           progress: ProgressStage,
+                           journal: 'ScanJournal | None',
+                           ordered: bool):
+        """
+        Computes the checksum of every file. Files with multiple hard links are only read once, the checksum computed
+        for the first path is reused for every other path that refers to the same inode. Files whose checksum was
+        recorded by the journal, and that were not modified since, are not read at all.
+
+        Files that only need their checksum are hashed by the hash pool while files that also need the checksums of
+        their chunks are hashed one at a time. If ordered is true the files were sorted to be read one after the other,
+        which the auto hash backend honours by hashing them one at a time.
+        """
+        hashed_inodes: Dict[Tuple[int, int], Node] = {}
+        # Hard links to a file that is still waiting in the hash pool are resolved once every file has been hashed.
+        linked: List[Tuple[Node, Node]] = []
+        pooled: List[Tuple[Node, Path, os.stat_result]] = []
+        for node, node_path, node_stat in files:
+            inode = (node_stat.st_dev, node_stat.st_ino)
+            if node_stat.st_nlink > 1 and inode in hashed_inodes:
+                linked.append((node, hashed_inodes[inode]))
+                continue
+
+            if node_stat.st_nlink > 1:
+                hashed_inodes[inode] = node
+
+            restored = journal.restore(node_path, node_stat) if journal is not None else None
+            if restored is not None:
+                node.checksum, node.chunks, node.chunk_size = restored
+                progress.file_completed(node.size)
+                self._profiler.count('tree_loader.journal_reused')
+                continue
+
+            if chunk_threshold is None or either(node.size, 0) < chunk_threshold:
+                pooled.append((node, node_path, node_stat))
+                continue
+
+            with self._profiler.span('tree_loader.hash') as span:
+                node.checksum, node.chunks = self._checksum.compute_file_checksum_and_chunk_digests(
+                    node_path,
+                    checksum_algo,
+                    chunk_size
+                )
+                node.chunk_size = chunk_size
+                span.add_bytes(either(node.size, 0))
+            self._file_hashed(node, node_path, node_stat, progress, journal)
+
+        pooled_files = [(node_path, either(node.size, 0)) for node, node_path, _ in pooled]
+        with self._profiler.span('tree_loader.hash') as span:
+            for index, checksum in self._hash_pool.hash_files(pooled_files, checksum_algo, self._checksum, ordered):
+                node, node_path, node_stat = pooled[index]
+                node.checksum = checksum
+                span.add_bytes(either(node.size, 0))
+                self._file_hashed(node, node_path, node_stat, progress, journal)
+
+        for node, linked_node in linked:
+            node.checksum = linked_node.checksum
+            node.chunks = linked_node.chunks
+            node.chunk_size = linked_node.chunk_size
+            progress.file_completed(node.size)
+            self._profiler.count('tree_loader.hard_links_reused')
+
+    def _file_hashed(self,
+                     node: Node,
+                     node_path: Path,
+                     node_stat: os.stat_result,
+                     progress: ProgressStage,
+                     journal: 'ScanJournal | None'):
+        if journal is not None:
+            journal.record(node_path, node_stat, either(node.checksum, ''), node.chunks, node.chunk_size)
+        progress.file_completed(node.size)
+
+    def _order_for_reading(self,
+                           files: List[Tuple[Node, Path, os.stat_result]],
+                           read_order: str) -> List[Tuple[Node, Path, os.stat_result]]:
+        if read_order == READ_ORDER_INODE:
+            return sorted(files, key=lambda file: file[2].st_ino)
+        if read_order == READ_ORDER_PHYSICAL:
+            def physical_key(file: Tuple[Node, Path, os.stat_result]) -> Tuple[bool, int, int]:
+                offset = physical_offset(file[1])
+                return offset is None, offset if offset is not None else 0, file[2].st_ino
+            return sorted(files, key=physical_key)
+        return files
+
     def _read_node_details(self,
                            path: Path,
                            parent: Node | None,
-                           compute_checksum: bool,
+                           path_stat: os.stat_result | None,
                            checksum_algo: str | None,
                            alternate_name: str | None) -> Node:
 
-        values: Dict[str, Any] = {
-            'name': path.name,
-            'size': os.stat(path).st_size if path.is_file() else None,
-        }
+        # The values come straight from the file system so the node is constructed directly instead of going through
+        # the validation done by Node.from_dict.
+        node = Node(
+            parent,
+            alternate_name if alternate_name is not None else path.name,
+            path_stat.st_size if path_stat is not None and stat.S_ISREG(path_stat.st_mode) else None,
+            None,
+            checksum_algo if parent is None else None
+        )
+        if parent is not None:
+            parent.attach_child(node)
+        return node
+
+    def list_children(self,
+                      path: Path,
+                      relative_path: str = '',
+                      path_filter: PathFilter = DEFAULT_PATH_FILTER) -> List[Path]:
+        """
+        Lists the contents of a directory excluding any files or folders that are skipped by the path filter.
+
+        :param path: The path to the directory whose contents are to be listed.
+        :param relative_path: The path of the directory relative to the root of the walk, using / as the separator.
+        :param path_filter: Decides which files and directories are skipped.
+        :return: The paths of all the files and folders within the directory that should be scanned.
+        """
+        return [child[0] for child in self._list_children(path, relative_path, path_filter, None)]
 
-        if alternate_name is not None:
-            values['alternate_name'] = alternate_name
+    def _list_directory(self,
+                        path: Path,
+                        relative_path: str,
+                        path_filter: PathFilter,
+                        progress: ProgressStage) -> Iterator[Tuple[Path, str]]:
+        children = self._list_children(path, relative_path, path_filter, progress)
+        progress.directory_listed()
+        return iter(children)
 
-        if compute_checksum and checksum_algo is not None and path.is_file():
-            values['checksum'] = self._checksum.compute_file_checksum(path, checksum_algo)
+    def _list_children(self,
+                       path: Path,
+                       relative_path: str,
+                       path_filter: PathFilter,
+                       progress: ProgressStage | None) -> List[Tuple[Path, str]]:
+        """
+        Lists the contents of a directory along with the path of each entry relative to the root of the walk. The
+        type of each entry comes from the directory listing itself, where supported, so skipped entries are never
+        stat'ed.
+        """
+        children: List[Tuple[Path, str]] = []
+        prefix = relative_path + '/' if len(relative_path) > 0 else ''
+        with self._profiler.span('tree_loader.list_directory'), os.scandir(path) as entries:
+            for entry in entries:
+                child_relative_path = prefix + entry.name
+                if not path_filter.should_skip(entry.name, child_relative_path, _is_dir(entry)):
+                    children.append((path.joinpath(entry.name), child_relative_path))
+                else:
+                    self._profiler.count('tree_loader.skipped')
+                    if progress is not None:
+                        progress.entry_skipped()
+        return children
 
-        if parent is None:
-            values['checksum_algo'] = checksum_algo
 
-        return Node.from_dict(parent, values)
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
 
-    def _should_skip_file(self, path: Path) -> bool:
-        return (
-                (path.is_dir() and path.name in _SKIPPABLE_FOLDERS)
-                or (path.is_file() and path.name in _SKIPPABLE_FILES)
-        )
 
-    def _get_non_skippable_files(self, path: Path) -> List[Path]:
-        all_files = path.iterdir()
-        non_skippable_files: List[Path] = []
-        for file in all_files:
-            if self._should_skip_file(file):
-                print(f'Skipping file since it has an excluded name: [{file.name}]')
-            else:
-                non_skippable_files.append(file)
-        return non_skippable_files
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
 
 
 TREE_LOADER_SINGLETON: Final[TreeLoader] = TreeLoader()
@@ -1,12 +1,65 @@
-from typing import Dict, Any, Final
+from typing import List, Dict, Tuple, Iterator, Any, Final
 from pathlib import Path
-import yaml
+import io
+import itertools
+
+from diff.core.util import Profiler, PROFILER_SINGLETON
 
 from .node import Node
 
 
+# The tag PyYAML gives to, and expects for, plain mappings and sequences.
+_MAPPING_TAG: Final[str] = 'tag:yaml.org,2002:map'
+_SEQUENCE_TAG: Final[str] = 'tag:yaml.org,2002:seq'
+
+_EXHAUSTED: Final[object] = object()
+
+
+class _Collection:
+
+    """
+    A mapping or sequence whose contents are being read, along with the key of the mapping entry whose value is
+    being read.
+    """
+
+    def __init__(self, container: Dict[Any, Any] | List[Any]):
+        self.container = container
+        self.key: Any = None
+        self.has_key = False
+
+    def add(self, value: Any):
+        if isinstance(self.container, list):
+            self.container.append(value)
+        elif self.has_key:
+            self.container[self.key] = value
+            self.has_key = False
+        else:
+            self.key = value
+            self.has_key = True
+
+    def expects_key(self) -> bool:
+        return isinstance(self.container, dict) and not self.has_key
+
+
+def _yaml() -> Any:
+    # PyYAML is one of the slowest modules to import and most commands never read or write a scan file.
+    import yaml
+    return yaml
+
+
 class YamlSerialization:
 
+    """
+    Reads and writes scan files.
+
+    PyYAML represents and constructs documents recursively, using several Python frames for every level of the tree,
+    so documents are instead written from, and read into, plain dicts and lists through the event API of PyYAML, which
+    keeps its state on explicit stacks. The output is the same as that of safe_dump and safe_load for any depth.
+    """
+
+    def __init__(self, profiler: Profiler = PROFILER_SINGLETON):
+        self._profiler = profiler
+
     def to_yaml_string(self, root_node: Node) -> str:
         """
         Serializes the input Node instance to yaml.
@@ -14,7 +67,14 @@ class YamlSerialization:
         :param root_node: The node to be serialized to yaml.
         :return: A formatted yaml string ready to be written to a file.
         """
-        return yaml.safe_dump(root_node.to_dict())
+        with self._profiler.span('yaml.to_dict'):
+            values = root_node.to_dict()
+        # The keys are written in the order of the dict, which puts the name of every node ahead of its children, so
+        # the path of every entry is known as soon as it is read when the scan is read as a stream.
+        with self._profiler.span('yaml.dump'):
+            stream = io.StringIO()
+            _emit(values, stream)
+            return stream.getvalue()
 
     def to_yaml_file(self, file_path: Path, root_node: Node):
         """
@@ -23,8 +83,10 @@ class YamlSerialization:
         :param file_path: The path to the yaml file to create/write to.
         :param root_node: The Node to be serialized to yaml.
         """
-        with open(file_path, 'w') as file:
-            file.write(self.to_yaml_string(root_node))
+        content = self.to_yaml_string(root_node)
+        with self._profiler.span('yaml.write') as span, open(file_path, 'w') as file:
+            file.write(content)
+            span.add_bytes(len(content))
 
     def read_yaml_file(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -33,8 +95,97 @@ class YamlSerialization:
         :param file_path: The path to the Yaml file.
         :return: The deserialized dictionary contents of the file.
         """
-        with open(file_path, 'r') as file:
-            return yaml.safe_load(file.read())
+        with self._profiler.span('yaml.read') as span, open(file_path, 'r') as file:
+            content = file.read()
+            span.add_bytes(len(content))
+        with self._profiler.span('yaml.load'):
+            return _compose(content)
+
+
+def _emit(values: Any, stream: io.StringIO):
+    """
+    Writes the same document as safe_dump, with sort_keys disabled, by emitting the events of every value in the
+    order they are visited in.
+    """
+    yaml = _yaml()
+    dumper = yaml.SafeDumper(stream, default_flow_style=False, sort_keys=False)
+    try:
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(explicit=False))
+        # Every level has an iterator over its values along with the event that closes it once they are exhausted.
+        pending: List[Tuple[Iterator[Any], Any]] = [(iter([values]), None)]
+        while len(pending) > 0:
+            iterator, end_event = pending[-1]
+            value = next(iterator, _EXHAUSTED)
+            if value is _EXHAUSTED:
+                pending.pop()
+                if end_event is not None:
+                    dumper.emit(end_event())
+            elif isinstance(value, dict):
+                dumper.emit(yaml.MappingStartEvent(None, _MAPPING_TAG, True, flow_style=False))
+                pending.append((itertools.chain.from_iterable(value.items()), yaml.MappingEndEvent))
+            elif isinstance(value, list):
+                dumper.emit(yaml.SequenceStartEvent(None, _SEQUENCE_TAG, True, flow_style=False))
+                pending.append((iter(value), yaml.SequenceEndEvent))
+            else:
+                node = dumper.represent_data(value)
+                implicit = (
+                    node.tag == dumper.resolve(yaml.ScalarNode, node.value, (True, False)),
+                    node.tag == dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+                )
+                dumper.emit(yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+        dumper.emit(yaml.DocumentEndEvent(explicit=False))
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+
+def _compose(content: str) -> Any:
+    """
+    Reads the same values as safe_load by building the dicts and lists of the document from its events.
+    """
+    yaml = _yaml()
+    # Only used to resolve and construct scalars, the events are read with the faster libyaml parser when available.
+    resolver = yaml.SafeLoader('')
+    constructors = resolver.yaml_constructors
+    documents: List[Any] = []
+    anchors: Dict[str, Any] = {}
+    stack: List[_Collection] = []
+
+    def add(value: Any, anchor: str | None):
+        if anchor is not None:
+            anchors[anchor] = value
+        if len(stack) > 0:
+            stack[-1].add(value)
+        else:
+            documents.append(value)
+
+    for event in yaml.parse(content, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+        if isinstance(event, yaml.ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+            node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+            add(constructors.get(tag, constructors[None])(resolver, node), event.anchor)
+        elif isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            if len(stack) > 0 and stack[-1].expects_key():
+                raise ValueError('Only scalars are supported as the keys of a mapping.')
+            is_mapping = isinstance(event, yaml.MappingStartEvent)
+            if event.tag not in (None, '!', _MAPPING_TAG if is_mapping else _SEQUENCE_TAG):
+                raise ValueError(f'Unsupported tag [{event.tag}].')
+            collection = _Collection({} if is_mapping else [])
+            add(collection.container, event.anchor)
+            stack.append(collection)
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+        elif isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise ValueError(f'Found undefined alias [{event.anchor}].')
+            add(anchors[event.anchor], None)
+
+    if len(documents) > 1:
+        raise ValueError('Expected a single document but found more than one.')
+    return documents[0] if len(documents) > 0 else None
 
 
 YAML_SERIALIZATION_SINGLETON: Final[YamlSerialization] = YamlSerialization()
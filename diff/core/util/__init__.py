@@ -1,2 +1,34 @@
 from .functions import has_elements as has_elements, either as either
-from .compute_file_checksum import Checksum as Checksum, CHECKSUM_SINGLETON as CHECKSUM_SINGLETON
+from .lazy_exports import lazy_exports as lazy_exports
+
+
+# The remaining exports are imported on first access so a command only loads the modules it uses.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'Checksum': '.compute_file_checksum',
+    'CHECKSUM_SINGLETON': '.compute_file_checksum',
+    'TREE_HASH_ALGORITHMS': '.compute_file_checksum',
+    'IoScheduler': '.io_scheduler',
+    'IO_SCHEDULER_SINGLETON': '.io_scheduler',
+    'is_rotational_device': '.io_scheduler',
+    'ChecksumManifest': '.checksum_manifest',
+    'CHECKSUM_MANIFEST_SINGLETON': '.checksum_manifest',
+    'ProgressReporter': '.progress',
+    'ProgressStage': '.progress',
+    'PROGRESS_REPORTER_SINGLETON': '.progress',
+    'AVAILABLE_PROGRESS_MODES': '.progress',
+    'PROGRESS_MODE_AUTO': '.progress',
+    'Profiler': '.profiler',
+    'PROFILER_SINGLETON': '.profiler',
+    'AVAILABLE_PROFILE_FORMATS': '.profiler',
+    'AVAILABLE_PROFILE_CAPTURES': '.profiler',
+    'ExternalSorter': '.external_sort',
+    'SpillFile': '.external_sort',
+    'DEFAULT_MEMORY_BUDGET': '.external_sort',
+    'HashPool': '.hash_pool',
+    'HASH_POOL_SINGLETON': '.hash_pool',
+    'AVAILABLE_HASH_BACKENDS': '.hash_pool',
+    'HASH_BACKEND_AUTO': '.hash_pool',
+    'Inotify': '.inotify',
+    'InotifyEvent': '.inotify',
+    'is_inotify_available': '.inotify'
+})
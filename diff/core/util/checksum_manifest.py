@@ -0,0 +1,67 @@
+from typing import List, Tuple, Final
+from pathlib import Path
+import re
+
+from diff.core.errors import InvalidChecksumManifestException
+
+
+_LINE_PATTERN: Final[re.Pattern] = re.compile(r'^(\\?)([0-9a-fA-F]+) [ *](.+)$')
+
+
+class ChecksumManifest:
+
+    """
+    Reads and writes checksum manifests in the format used by the sha256sum family of tools, one
+    "<checksum>  <path>" line per file.
+    """
+
+    def write_manifest(self, file_path: Path, entries: List[Tuple[str, str]]):
+        """
+        Writes a checksum manifest file.
+
+        :param file_path: The path to the manifest file to create/write to.
+        :param entries: The (checksum, path) tuples to write to the manifest.
+        """
+        with open(file_path, 'w', encoding='utf-8', newline='\n') as file:
+            for checksum, path in entries:
+                file.write(self.format_line(checksum, path) + '\n')
+
+    def format_line(self, checksum: str, path: str) -> str:
+        """
+        Formats a single manifest line. Like sha256sum, paths containing a backslash or a new line are escaped and the
+        line is prefixed with a backslash.
+
+        :param checksum: The checksum of the file.
+        :param path: The path to the file.
+        :return: The formatted manifest line without a trailing new line.
+        """
+        if '\\' in path or '\n' in path:
+            escaped_path = path.replace('\\', '\\\\').replace('\n', '\\n')
+            return f'\\{checksum.lower()}  {escaped_path}'
+        return f'{checksum.lower()}  {path}'
+
+    def read_manifest(self, file_path: Path) -> List[Tuple[str, str]]:
+        """
+        Reads all the entries from a checksum manifest file. Blank lines are ignored.
+
+        :param file_path: The path to the manifest file.
+        :return: The (checksum, path) tuples listed in the manifest with the checksums in upper case.
+        :raises InvalidChecksumManifestException: Raised if any line of the manifest is not in the expected format.
+        """
+        entries: List[Tuple[str, str]] = []
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.rstrip('\r\n')
+                if len(line.strip()) == 0:
+                    continue
+                match = _LINE_PATTERN.match(line)
+                if match is None:
+                    raise InvalidChecksumManifestException(file_path, line_number)
+                escaped, checksum, path = match.groups()
+                if escaped:
+                    path = re.sub(r'\\(.)', lambda escape: '\n' if escape.group(1) == 'n' else escape.group(1), path)
+                entries.append((checksum.upper(), path))
+        return entries
+
+
+CHECKSUM_MANIFEST_SINGLETON: Final[ChecksumManifest] = ChecksumManifest()
@@ -1,29 +1,210 @@
-from typing import Any, Final
+from typing import Any, List, Dict, Tuple, Final, TYPE_CHECKING
+import bisect
+import errno
 import hashlib
+import os
+import threading
 from pathlib import Path
 
 from diff.core.errors import UnsupportedAlgorithmException
 
+from .profiler import Profiler, PROFILER_SINGLETON
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+PARTIAL_CHECKSUM_BLOCK_SIZE: Final[int] = 64 * 1024
+
+TREE_HASH_SUFFIX: Final[str] = '-tree'
+
+# The chunk size is part of the definition of the tree hash algorithms. Changing it changes every tree checksum.
+TREE_HASH_CHUNK_SIZE: Final[int] = 4 * 1024 * 1024
+
+TREE_HASH_ALGORITHMS: Final[List[str]] = [
+    'sha256' + TREE_HASH_SUFFIX,
+    'sha512' + TREE_HASH_SUFFIX
+]
+
+_READ_BUFFER_SIZE: Final[int] = 1024 * 1024
+
+_ZEROS: Final[memoryview] = memoryview(bytes(_READ_BUFFER_SIZE))
+
+# Files smaller than this are always read in full since locating their holes would cost more than reading them.
+_SPARSE_MINIMUM_SIZE: Final[int] = 1024 * 1024
+
 
 class Checksum:
 
+    def __init__(self,
+                 tree_chunk_size: int = TREE_HASH_CHUNK_SIZE,
+                 tree_workers: int | None = None,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        self._tree_chunk_size = tree_chunk_size
+        self._profiler = profiler
+        self._tree_workers = tree_workers if tree_workers is not None else os.cpu_count()
+        self._tree_executor: 'ThreadPoolExecutor | None' = None
+        self._tree_executor_lock = threading.Lock()
+        self._zero_digests: Dict[Tuple[str, int], bytes] = {}
+
+    @property
+    def tree_chunk_size(self) -> int:
+        """
+        The size, in bytes, of each chunk hashed by the tree algorithms.
+        """
+        return self._tree_chunk_size
+
     def compute_file_checksum(self, path: Path, algo: str) -> str:
         """
         Computes the hash of a file at the given path using the specified hash algorithm.
 
+        If the algorithm ends with the -tree suffix then the file is split into fixed size chunks, each chunk is hashed
+        in parallel by a pool of threads, and the final hash is computed over the concatenated digests of the chunks.
+
+        Sparse files, whose allocated blocks cover less than half of their size, only have their data regions read
+        from disk. The holes are located with SEEK_DATA and SEEK_HOLE and hashed as zeros without being read.
+
         :param path: The absolute path to the file on disk whose hash is to be computed.
         :param algo: The algorithm to use to compute the hash of the file.
         :return: The computed hash of the file.
         :raises UnsupportedAlgorithmException: Raised if the specified hashing algorithm does not
             exist with the hashlib module.
         """
-        print(f'Computing checksum of file: [{path}]')
+        if algo.endswith(TREE_HASH_SUFFIX):
+            return self._compute_tree_checksum(path, algo[:-len(TREE_HASH_SUFFIX)])
         file_hash = self._get_hash_function(algo)
+        with self._profiler.span('checksum.file') as span, open(path, 'rb', buffering=0) as file:
+            data_segments = _find_data_segments(file.fileno())
+            if data_segments is None:
+                _update_from_file(file_hash, file, None)
+            else:
+                position = 0
+                for start, end in data_segments:
+                    _update_with_zeros(file_hash, start - position)
+                    file.seek(start)
+                    position = start + _update_from_file(file_hash, file, end - start)
+                _update_with_zeros(file_hash, os.fstat(file.fileno()).st_size - position)
+            span.add_bytes(os.fstat(file.fileno()).st_size)
+        return file_hash.hexdigest().upper()
+
+    def compute_partial_checksum(self, path: Path, algo: str, block_size: int = PARTIAL_CHECKSUM_BLOCK_SIZE) -> str:
+        """
+        Computes a cheap hash of a file using only the first and the last block of its contents.
+
+        Two files with different partial checksums are guaranteed to be different but two files with the same
+        partial checksum may still differ somewhere in the middle so this should only be used to rule out candidates
+        before computing the full checksum.
+
+        :param path: The absolute path to the file on disk whose partial hash is to be computed.
+        :param algo: The algorithm to use to compute the hash of the file.
+        :param block_size: The number of bytes to read from the start and from the end of the file.
+        :return: The computed partial hash of the file.
+        :raises UnsupportedAlgorithmException: Raised if the specified hashing algorithm does not
+            exist with the hashlib module.
+        """
+        file_hash = self._get_hash_function(algo.removesuffix(TREE_HASH_SUFFIX))
         with open(path, 'rb') as file:
-            while chunk := file.read(file_hash.block_size):
-                file_hash.update(chunk)
+            file_hash.update(file.read(block_size))
+            file_size = os.fstat(file.fileno()).st_size
+            if file_size > block_size:
+                file.seek(max(block_size, file_size - block_size))
+                file_hash.update(file.read(block_size))
         return file_hash.hexdigest().upper()
 
+    def compute_chunk_digests(self, path: Path, algo: str, chunk_size: int, chunk_count: int | None = None) -> List[str]:
+        """
+        Computes the hash of every fixed size chunk of a file. The chunks are hashed in parallel.
+
+        :param path: The absolute path to the file on disk whose chunks are to be hashed.
+        :param algo: The algorithm to use to compute the hash of each chunk. If a tree algorithm is specified then the
+            underlying hash algorithm will be used.
+        :param chunk_size: The size, in bytes, of each chunk. The last chunk may be smaller.
+        :param chunk_count: If specified only the first chunk_count chunks of the file will be read and hashed.
+        :return: The hash of each chunk in the order the chunks appear in the file.
+        """
+        digests = self._compute_chunk_digests(path, algo.removesuffix(TREE_HASH_SUFFIX), chunk_size, chunk_count)
+        return [digest.hex().upper() for digest in digests]
+
+    def compute_file_checksum_and_chunk_digests(self, path: Path, algo: str, chunk_size: int) -> Tuple[str, List[str]]:
+        """
+        Computes both the hash of a file and the hash of every fixed size chunk of the file, reading the file only once
+        whenever possible.
+
+        :param path: The absolute path to the file on disk whose hashes are to be computed.
+        :param algo: The algorithm to use to compute the hash of the file. The chunks are hashed using the same
+            algorithm, or the underlying algorithm if a tree algorithm is specified.
+        :param chunk_size: The size, in bytes, of each chunk.
+        :return: A tuple containing the hash of the file and the list of hashes of each chunk.
+        """
+        if algo.endswith(TREE_HASH_SUFFIX):
+            base_algo = algo[:-len(TREE_HASH_SUFFIX)]
+            if chunk_size != self._tree_chunk_size:
+                return self.compute_file_checksum(path, algo), self.compute_chunk_digests(path, base_algo, chunk_size)
+            digests = self._compute_chunk_digests(path, base_algo, chunk_size)
+            root_hash = self._get_hash_function(base_algo)
+            for digest in digests:
+                root_hash.update(digest)
+            return root_hash.hexdigest().upper(), [digest.hex().upper() for digest in digests]
+
+        file_hash = self._get_hash_function(algo)
+        chunk_digests: List[str] = []
+        with open(path, 'rb') as file:
+            while chunk := file.read(chunk_size):
+                file_hash.update(chunk)
+                chunk_hash = self._get_hash_function(algo)
+                chunk_hash.update(chunk)
+                chunk_digests.append(chunk_hash.hexdigest().upper())
+        return file_hash.hexdigest().upper(), chunk_digests
+
+    def _compute_tree_checksum(self, path: Path, algo: str) -> str:
+        root_hash = self._get_hash_function(algo)
+        for chunk_digest in self._compute_chunk_digests(path, algo, self._tree_chunk_size):
+            root_hash.update(chunk_digest)
+        return root_hash.hexdigest().upper()
+
+    def _compute_chunk_digests(self, path: Path, algo: str, chunk_size: int, chunk_count: int | None = None) -> List[bytes]:
+        """
+        Computes the digest of every fixed size chunk of a file in parallel. Every worker reads its own chunk with
+        pread, where available, so no file position has to be shared between the workers.
+        """
+        self._get_hash_function(algo)
+        with self._profiler.span('checksum.chunks') as span, open(path, 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            span.add_bytes(file_size)
+
+            data_segments = _find_data_segments(file.fileno())
+
+            def digest(offset: int) -> bytes:
+                length = min(chunk_size, file_size - offset)
+                if data_segments is not None and not _overlaps_data(data_segments, offset, offset + length):
+                    return self._get_zero_digest(algo, length)
+                chunk_hash = self._get_hash_function(algo)
+                chunk_hash.update(_read_chunk(file, path, offset, length))
+                return chunk_hash.digest()
+
+            offsets = range(0, file_size, chunk_size)
+            if chunk_count is not None:
+                offsets = offsets[:chunk_count]
+            return list(self._get_tree_executor().map(digest, offsets))
+
+    def _get_zero_digest(self, algo: str, length: int) -> bytes:
+        key = (algo, length)
+        zero_digest = self._zero_digests.get(key)
+        if zero_digest is None:
+            zero_hash = self._get_hash_function(algo)
+            _update_with_zeros(zero_hash, length)
+            zero_digest = zero_hash.digest()
+            self._zero_digests[key] = zero_digest
+        return zero_digest
+
+    def _get_tree_executor(self) -> 'ThreadPoolExecutor':
+        with self._tree_executor_lock:
+            if self._tree_executor is None:
+                # Only the tree algorithms need the pool so the import is deferred until one of them is used.
+                from concurrent.futures import ThreadPoolExecutor
+                self._tree_executor = ThreadPoolExecutor(max_workers=self._tree_workers, thread_name_prefix='tree-hash')
+            return self._tree_executor
+
     def _get_hash_function(self, algo: str) -> Any:
         if not hasattr(hashlib, algo):
             raise UnsupportedAlgorithmException(algo)
@@ -36,4 +217,87 @@ class Checksum:
         return hash_function()
 
 
+def _read_chunk(file: Any, path: Path, offset: int, size: int) -> bytes:
+    if hasattr(os, 'pread'):
+        parts: List[bytes] = []
+        while size > 0:
+            part = os.pread(file.fileno(), size, offset)
+            if len(part) == 0:
+                break
+            parts.append(part)
+            offset += len(part)
+            size -= len(part)
+        return b''.join(parts)
+    with open(path, 'rb') as chunk_file:
+        chunk_file.seek(offset)
+        return chunk_file.read(size)
+
+
+def _update_from_file(file_hash: Any, file: Any, length: int | None) -> int:
+    """
+    Reads from the current position of an unbuffered file into the hash until either length bytes have been read or
+    the end of the file is reached.
+
+    :return: The number of bytes that were read.
+    """
+    buffer = bytearray(_READ_BUFFER_SIZE)
+    view = memoryview(buffer)
+    total = 0
+    while length is None or total < length:
+        wanted = _READ_BUFFER_SIZE if length is None else min(_READ_BUFFER_SIZE, length - total)
+        read = file.readinto(view[:wanted])
+        if not read:
+            break
+        file_hash.update(view[:read])
+        total += read
+    return total
+
+
+def _update_with_zeros(file_hash: Any, length: int):
+    while length > 0:
+        block = min(length, _READ_BUFFER_SIZE)
+        file_hash.update(_ZEROS[:block])
+        length -= block
+
+
+def _find_data_segments(file_descriptor: int) -> List[Tuple[int, int]] | None:
+    """
+    Locates the regions of a sparse file that contain data using SEEK_DATA and SEEK_HOLE.
+
+    :return: The (start, end) offsets of each data region, or None if the file is not sparse or the platform or file
+        system does not support locating holes. The file position is reset to the start of the file.
+    """
+    if not hasattr(os, 'SEEK_DATA'):
+        return None
+    file_stat = os.fstat(file_descriptor)
+    allocated = getattr(file_stat, 'st_blocks', None)
+    if allocated is None or file_stat.st_size < _SPARSE_MINIMUM_SIZE or allocated * 512 >= file_stat.st_size // 2:
+        return None
+
+    segments: List[Tuple[int, int]] = []
+    offset = 0
+    try:
+        while offset < file_stat.st_size:
+            try:
+                start = os.lseek(file_descriptor, offset, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    break
+                raise
+            offset = min(os.lseek(file_descriptor, start, os.SEEK_HOLE), file_stat.st_size)
+            segments.append((start, offset))
+    except OSError:
+        return None
+    finally:
+        os.lseek(file_descriptor, 0, os.SEEK_SET)
+    return segments
+
+
+def _overlaps_data(data_segments: List[Tuple[int, int]], start: int, end: int) -> bool:
+    position = bisect.bisect_right(data_segments, (start, float('inf'))) - 1
+    if position >= 0 and data_segments[position][1] > start:
+        return True
+    return position + 1 < len(data_segments) and data_segments[position + 1][0] < end
+
+
 CHECKSUM_SINGLETON: Final[Checksum] = Checksum()
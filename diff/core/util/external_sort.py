@@ -0,0 +1,200 @@
+from typing import List, Tuple, Iterator, Iterable, Any, Final
+from operator import itemgetter
+from pathlib import Path
+import heapq
+import os
+import pickle
+import sys
+import tempfile
+
+from .profiler import Profiler, PROFILER_SINGLETON
+
+
+DEFAULT_MEMORY_BUDGET: Final[int] = 256 * 1024 * 1024
+
+# Records are pickled in batches, a single pickle per record spends more time in the pickle module than in the sort.
+_BATCH_RECORDS: Final[int] = 1024
+
+_IO_BUFFER_SIZE: Final[int] = 64 * 1024
+
+# The number of runs merged at once is also limited by the number of files that can be kept open.
+_MAX_FAN_IN: Final[int] = 256
+
+_sort_key = itemgetter(0)
+
+
+class SpillFile:
+
+    """
+    A temporary file records are appended to and later read back from, in the order they were written.
+    """
+
+    def __init__(self, directory: str):
+        descriptor, path = tempfile.mkstemp(dir=directory, suffix='.run')
+        self.path = Path(path)
+        self.records = 0
+        self._file = os.fdopen(descriptor, 'wb', buffering=_IO_BUFFER_SIZE)
+        self._batch: List[Any] = []
+
+    def write(self, record: Any):
+        self._batch.append(record)
+        if len(self._batch) >= _BATCH_RECORDS:
+            self._write_batch()
+
+    def write_all(self, records: Iterable[Any]):
+        for record in records:
+            self.write(record)
+
+    def finish(self):
+        """
+        Writes the records that are still buffered and closes the file for writing.
+        """
+        if self._file.closed:
+            return
+        self._write_batch()
+        self._file.close()
+
+    def close(self):
+        """
+        Closes the file for writing, discarding the records that are still buffered.
+        """
+        self._batch = []
+        self._file.close()
+
+    def read(self) -> Iterator[Any]:
+        """
+        Reads the records back, only keeping one batch of records in memory at a time.
+        """
+        self.finish()
+        with open(self.path, 'rb', buffering=_IO_BUFFER_SIZE) as file:
+            while True:
+                try:
+                    batch = pickle.load(file)
+                except EOFError:
+                    return
+                yield from batch
+
+    def _write_batch(self):
+        if len(self._batch) == 0:
+            return
+        pickle.dump(self._batch, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.records += len(self._batch)
+        self._batch = []
+
+
+class ExternalSorter:
+
+    """
+    Sorts records, tuples whose first value is the key to sort on, that may not all fit in memory.
+
+    Records are kept in memory until their estimated size reaches the memory budget. They are then sorted and written
+    to a temporary file as a sorted run. Once every record has been added the runs are merged with a k-way merge. When
+    there are more runs than can be read at once within the budget the runs are first merged in groups into longer
+    runs.
+    """
+
+    def __init__(self,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 directory: str | None = None,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        """
+        :param memory_budget: The number of bytes the records held in memory can use before being written to disk.
+        :param directory: The directory the runs are written to. Defaults to the system temporary directory.
+        """
+        if memory_budget < 1:
+            raise ValueError(f'The memory budget must be at least one byte but was: [{memory_budget}]')
+        self._memory_budget = memory_budget
+        self._directory = directory
+        self._profiler = profiler
+        self._temporary_directory: tempfile.TemporaryDirectory | None = None
+        self._records: List[Tuple] = []
+        self._records_size = 0
+        self._runs: List[SpillFile] = []
+        # Every file created, including those of callers, so the files left unfinished are closed along with the runs.
+        self._spill_files: List[SpillFile] = []
+        self._largest_record_size = 0
+
+    def add(self, record: Tuple):
+        record_size = _estimate_size(record)
+        self._records.append(record)
+        self._records_size += record_size
+        self._largest_record_size = max(self._largest_record_size, record_size)
+        if self._records_size >= self._memory_budget:
+            self._spill()
+
+    def add_all(self, records: Iterable[Tuple]):
+        for record in records:
+            self.add(record)
+
+    def sorted(self) -> Iterator[Tuple]:
+        """
+        Gets every record added, ordered by key. Can only be called once.
+        """
+        if len(self._runs) == 0:
+            records = sorted(self._records, key=_sort_key)
+            self._records = []
+            return iter(records)
+
+        self._spill()
+        fan_in = self._fan_in()
+        while len(self._runs) > fan_in:
+            with self._profiler.span('external_sort.merge_runs'):
+                merged_run = self.spill_file()
+                merged_run.write_all(heapq.merge(*[run.read() for run in self._runs[:fan_in]], key=_sort_key))
+                merged_run.finish()
+            for run in self._runs[:fan_in]:
+                run.path.unlink()
+            self._runs = self._runs[fan_in:] + [merged_run]
+        return heapq.merge(*[run.read() for run in self._runs], key=_sort_key)
+
+    def spill_file(self) -> SpillFile:
+        """
+        Creates a temporary file, removed along with the runs, that callers can use to hold records of their own.
+        """
+        if self._temporary_directory is None:
+            self._temporary_directory = tempfile.TemporaryDirectory(prefix='diff-sort-', dir=self._directory)
+        spill_file = SpillFile(self._temporary_directory.name)
+        self._spill_files.append(spill_file)
+        return spill_file
+
+    @property
+    def runs(self) -> int:
+        return len(self._runs)
+
+    def close(self):
+        self._records = []
+        for spill_file in self._spill_files:
+            spill_file.close()
+        self._spill_files = []
+        if self._temporary_directory is not None:
+            self._temporary_directory.cleanup()
+            self._temporary_directory = None
+
+    def __enter__(self) -> 'ExternalSorter':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def _spill(self):
+        if len(self._records) == 0:
+            return
+        with self._profiler.span('external_sort.write_run'):
+            self._records.sort(key=_sort_key)
+            run = self.spill_file()
+            run.write_all(self._records)
+            run.finish()
+        self._runs.append(run)
+        self._profiler.count('external_sort.runs')
+        self._records = []
+        self._records_size = 0
+
+    def _fan_in(self) -> int:
+        # Every run being merged holds one batch of records, plus its read buffer, in memory.
+        run_size = self._largest_record_size * _BATCH_RECORDS + _IO_BUFFER_SIZE
+        return max(2, min(_MAX_FAN_IN, self._memory_budget // run_size))
+
+
+def _estimate_size(record: Tuple) -> int:
+    # The size of the record, the values it holds, and the slot of the list holding it.
+    return sys.getsizeof(record) + sum(map(sys.getsizeof, record)) + 8
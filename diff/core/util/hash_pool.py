@@ -0,0 +1,221 @@
+from typing import TYPE_CHECKING, List, Tuple, Iterator, Final
+from pathlib import Path
+import os
+import signal
+
+from .compute_file_checksum import Checksum, TREE_HASH_CHUNK_SIZE
+from .profiler import Profiler, PROFILER_SINGLETON
+
+if TYPE_CHECKING:
+    # Only used in annotations, the pools are imported once a backend that needs them is used.
+    from concurrent.futures import Future
+    from multiprocessing.context import BaseContext
+
+
+HASH_BACKEND_AUTO: Final[str] = 'auto'
+HASH_BACKEND_SERIAL: Final[str] = 'serial'
+HASH_BACKEND_THREAD: Final[str] = 'thread'
+HASH_BACKEND_PROCESS: Final[str] = 'process'
+
+AVAILABLE_HASH_BACKENDS: Final[List[str]] = [
+    HASH_BACKEND_AUTO,
+    HASH_BACKEND_SERIAL,
+    HASH_BACKEND_THREAD,
+    HASH_BACKEND_PROCESS
+]
+
+# Files whose median size is below this are dominated by the per file overhead of the interpreter, which only a pool
+# of processes can run in parallel, rather than by reading and hashing their contents.
+DEFAULT_SMALL_FILE_SIZE: Final[int] = 64 * 1024
+
+# Starting the processes and sending them the paths only pays off once there are enough files to hash.
+DEFAULT_MINIMUM_PROCESS_FILES: Final[int] = 2000
+
+# Each task sent to a worker process holds up to this many files, or this many bytes, whichever is reached first, so
+# the cost of sending a task and its results between processes is shared by every file of the batch.
+DEFAULT_BATCH_FILES: Final[int] = 256
+DEFAULT_BATCH_BYTES: Final[int] = 64 * 1024 * 1024
+
+
+class HashPool:
+
+    """
+    Hashes many files at once with a pool of threads or processes.
+
+    Threads suit large files since hashlib and file reads release the GIL while the data is processed. The hashing of
+    small files is dominated by interpreter overhead, which holds the GIL, so small files are hashed by a pool of
+    processes instead. Files are sent to the processes in batches and only the checksums are sent back, the caller
+    stays responsible for attaching each checksum to its file. Threads are given batches of files as well so hashing
+    millions of files does not queue millions of tasks.
+    """
+
+    def __init__(self,
+                 backend: str = HASH_BACKEND_AUTO,
+                 workers: int | None = None,
+                 small_file_size: int = DEFAULT_SMALL_FILE_SIZE,
+                 minimum_process_files: int = DEFAULT_MINIMUM_PROCESS_FILES,
+                 batch_files: int = DEFAULT_BATCH_FILES,
+                 batch_bytes: int = DEFAULT_BATCH_BYTES,
+                 profiler: Profiler = PROFILER_SINGLETON):
+        self.set_backend(backend)
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._small_file_size = small_file_size
+        self._minimum_process_files = minimum_process_files
+        self._batch_files = batch_files
+        self._batch_bytes = batch_bytes
+        self._profiler = profiler
+
+    def set_backend(self, backend: str):
+        """
+        Sets how the files will be hashed.
+
+        :param backend: Either auto, to select a backend from the files being hashed, serial, to hash one file at a
+            time on the calling thread, thread, to hash files with a pool of threads, or process, to hash batches of
+            files with a pool of processes.
+        """
+        if backend not in AVAILABLE_HASH_BACKENDS:
+            raise ValueError(f'Unrecognized hash backend [{backend}]. Expected one of: {AVAILABLE_HASH_BACKENDS}')
+        self._backend = backend
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def choose_backend(self, files: List[Tuple[Path, int]], checksum: Checksum, ordered: bool = False) -> str:
+        """
+        Selects the backend to hash the files with.
+
+        In auto mode files that must be read in order, or that are on a spinning disk, are hashed one at a time, so
+        they are read in the order they were given in, a small number of files are hashed one at a time and files with
+        a small median size are hashed by processes. Every other set of files is hashed by threads. Processes are only
+        used with a Checksum of the exact Checksum type, since a subclass cannot be recreated in the worker processes.
+
+        :param files: The path and size of every file to hash.
+        :param checksum: The checksum used to hash the files on the calling thread or by the threads.
+        :param ordered: True if the files were ordered to be read one after the other. Only considered in auto mode,
+            an explicitly selected backend is always used.
+        :return: The name of the backend.
+        """
+        process_capable = type(checksum) is Checksum
+        if self._backend != HASH_BACKEND_AUTO:
+            if self._backend == HASH_BACKEND_PROCESS and not process_capable:
+                return HASH_BACKEND_THREAD
+            return self._backend
+
+        if ordered or len(files) < 2 or self._workers < 2 or _is_on_rotational_device(files[0][0]):
+            return HASH_BACKEND_SERIAL
+        if (process_capable
+                and len(files) >= self._minimum_process_files
+                and _median_size(files) < self._small_file_size):
+            return HASH_BACKEND_PROCESS
+        return HASH_BACKEND_THREAD
+
+    def hash_files(self,
+                   files: List[Tuple[Path, int]],
+                   algo: str,
+                   checksum: Checksum,
+                   ordered: bool = False) -> Iterator[Tuple[int, str]]:
+        """
+        Computes the checksum of every file.
+
+        :param files: The path and size of every file to hash.
+        :param algo: The algorithm to hash the files with.
+        :param checksum: The checksum used to hash the files on the calling thread or by the threads.
+        :param ordered: True if the files were ordered to be read one after the other. See choose_backend.
+        :return: The index of each file within files along with its checksum, in the order the files are hashed in.
+            An error raised while hashing a file is raised once that file is reached.
+        """
+        backend = self.choose_backend(files, checksum, ordered)
+        self._profiler.count(f'hash_pool.{backend}')
+        if backend == HASH_BACKEND_SERIAL:
+            for index, (path, _) in enumerate(files):
+                yield index, checksum.compute_file_checksum(path, algo)
+        elif backend == HASH_BACKEND_THREAD:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='hash') as executor:
+                yield from _completed([
+                    (indexes, executor.submit(_hash_paths, checksum, [files[index][0] for index in indexes], algo))
+                    for indexes in self._batches(files)
+                ])
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=_process_context(),
+                initializer=_initialize_worker,
+                initargs=(checksum.tree_chunk_size,)
+            )
+            with executor:
+                yield from _completed([
+                    (indexes, executor.submit(_hash_batch, [str(files[index][0]) for index in indexes], algo))
+                    for indexes in self._batches(files)
+                ])
+
+    def _batches(self, files: List[Tuple[Path, int]]) -> Iterator[List[int]]:
+        batch: List[int] = []
+        batch_bytes = 0
+        for index, (_, size) in enumerate(files):
+            batch.append(index)
+            batch_bytes += size
+            if len(batch) >= self._batch_files or batch_bytes >= self._batch_bytes:
+                yield batch
+                batch = []
+                batch_bytes = 0
+        if len(batch) > 0:
+            yield batch
+
+
+def _completed(tasks: List[Tuple[List[int], 'Future[List[str]]']]) -> Iterator[Tuple[int, str]]:
+    from concurrent.futures import as_completed
+    indexes_by_future = {future: indexes for indexes, future in tasks}
+    try:
+        for future in as_completed(indexes_by_future):
+            yield from zip(indexes_by_future[future], future.result(), strict=True)
+    finally:
+        # Stopping early, because of an error or an interruption, cancels every task that has yet to start.
+        for future in indexes_by_future:
+            future.cancel()
+
+
+def _hash_paths(checksum: Checksum, paths: List[Path], algo: str) -> List[str]:
+    return [checksum.compute_file_checksum(path, algo) for path in paths]
+
+
+_worker_checksum: Checksum | None = None
+
+
+def _initialize_worker(tree_chunk_size: int = TREE_HASH_CHUNK_SIZE):
+    global _worker_checksum
+    _worker_checksum = Checksum(tree_chunk_size)
+    # Ctrl+C is handled by the main process, which cancels the batches that have yet to start, instead of by every
+    # worker at once.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _hash_batch(paths: List[str], algo: str) -> List[str]:
+    checksum = _worker_checksum if _worker_checksum is not None else Checksum()
+    return _hash_paths(checksum, [Path(path) for path in paths], algo)
+
+
+def _process_context() -> 'BaseContext':
+    # Forking copies the locks held by every other thread, such as those reading the other tree of a between, into the
+    # workers where they are never released. The workers are started from a clean process instead.
+    import multiprocessing
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _median_size(files: List[Tuple[Path, int]]) -> int:
+    return sorted(size for _, size in files)[len(files) // 2]
+
+
+def _is_on_rotational_device(path: Path) -> bool:
+    # The scheduler imports the thread pool so it is only imported once a backend is chosen.
+    from .io_scheduler import is_rotational_device
+    try:
+        return is_rotational_device(os.stat(path).st_dev) is True
+    except OSError:
+        return False
+
+
+HASH_POOL_SINGLETON: Final[HashPool] = HashPool()
@@ -0,0 +1,142 @@
+from typing import List, Any, Final
+from pathlib import Path
+import ctypes
+import os
+import select
+import struct
+import sys
+
+from diff.core.errors import UnsupportedPlatformException
+
+
+IN_MODIFY: Final[int] = 0x00000002
+IN_ATTRIB: Final[int] = 0x00000004
+IN_CLOSE_WRITE: Final[int] = 0x00000008
+IN_MOVED_FROM: Final[int] = 0x00000040
+IN_MOVED_TO: Final[int] = 0x00000080
+IN_CREATE: Final[int] = 0x00000100
+IN_DELETE: Final[int] = 0x00000200
+IN_DELETE_SELF: Final[int] = 0x00000400
+IN_MOVE_SELF: Final[int] = 0x00000800
+IN_Q_OVERFLOW: Final[int] = 0x00004000
+IN_IGNORED: Final[int] = 0x00008000
+IN_ONLYDIR: Final[int] = 0x01000000
+IN_DONT_FOLLOW: Final[int] = 0x02000000
+IN_ISDIR: Final[int] = 0x40000000
+
+_IN_NONBLOCK: Final[int] = os.O_NONBLOCK
+_IN_CLOEXEC: Final[int] = 0o2000000
+
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT_HEADER: Final[struct.Struct] = struct.Struct('iIII')
+
+# Large enough to hold thousands of events so a busy directory is drained in a few reads.
+_READ_BUFFER_SIZE: Final[int] = 64 * 1024
+
+
+class InotifyEvent:
+
+    def __init__(self, wd: int, mask: int, cookie: int, name: str):
+        self.wd = wd
+        self.mask = mask
+        self.cookie = cookie
+        self.name = name
+
+
+class Inotify:
+
+    """
+    A minimal wrapper around the Linux inotify API, called through ctypes, that watches directories for changes.
+    """
+
+    def __init__(self):
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise _last_os_error()
+        self._fd = fd
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        """
+        Starts watching a path, or updates the events watched on a path that is already watched.
+
+        :param path: The path to watch.
+        :param mask: The events to watch for.
+        :return: The watch descriptor identifying the path in the events read.
+        :raises OSError: If the path cannot be watched. The errno is ENOSPC once the limit of watches of the user,
+            fs.inotify.max_user_watches, has been reached.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise _last_os_error()
+        return wd
+
+    def remove_watch(self, wd: int):
+        """
+        Stops watching the path of a watch descriptor. Watches of paths that no longer exist are removed by the
+        kernel so failing to remove them is ignored.
+        """
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self, timeout: float) -> List[InotifyEvent]:
+        """
+        Reads the pending events, waiting up to the timeout for at least one event to arrive.
+
+        :param timeout: The maximum number of seconds to wait.
+        :return: The events read, which is empty if the timeout elapsed before any event arrived.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if len(readable) == 0:
+            return []
+        events: List[InotifyEvent] = []
+        while True:
+            try:
+                buffer = os.read(self._fd, _READ_BUFFER_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, name))
+
+    def close(self):
+        os.close(self._fd)
+
+    def __enter__(self) -> 'Inotify':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+
+def is_inotify_available() -> bool:
+    """
+    Checks if inotify can be used on the current system.
+    """
+    try:
+        _load_libc()
+        return True
+    except UnsupportedPlatformException:
+        return False
+
+
+def _load_libc() -> Any:
+    if not sys.platform.startswith('linux'):
+        raise UnsupportedPlatformException('inotify API', 'Watching for changes is only supported on Linux.')
+    # The C library is already loaded by the interpreter so its symbols are looked up in the running process.
+    libc = ctypes.CDLL(None, use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise UnsupportedPlatformException('inotify API', 'The C library does not provide inotify_init1.')
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+def _last_os_error() -> OSError:
+    error_number = ctypes.get_errno()
+    return OSError(error_number, os.strerror(error_number))
+
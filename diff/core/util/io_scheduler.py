@@ -0,0 +1,102 @@
+from typing import List, Dict, Tuple, Sequence, Callable, TypeVar, Final
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+
+
+R = TypeVar('R')
+
+DEFAULT_MAX_WORKERS_PER_DEVICE: Final[int] = 4
+
+
+def is_rotational_device(device: int) -> bool | None:
+    """
+    Checks if the block device with the given device number is a rotational (spinning) disk.
+
+    This is currently only supported on Linux where the information is read from sysfs.
+
+    :param device: The device number, as found in the st_dev value of a stat result.
+    :return: True if the device is rotational, False if it is not, or None if it could not be determined.
+    """
+    if not hasattr(os, 'major'):
+        return None
+    device_path = Path('/sys/dev/block', f'{os.major(device)}:{os.minor(device)}')
+    # Partitions do not have a queue of their own so the queue of the parent disk is checked as well.
+    for queue_path in [device_path.joinpath('queue'), device_path.joinpath('..', 'queue')]:
+        try:
+            return queue_path.joinpath('rotational').read_text().strip() == '1'
+        except OSError:
+            continue
+    return None
+
+
+class IoScheduler:
+
+    def __init__(self,
+                 max_workers_per_device: int = DEFAULT_MAX_WORKERS_PER_DEVICE,
+                 is_rotational: Callable[[int], bool | None] = is_rotational_device):
+        self._max_workers_per_device = max_workers_per_device
+        self._is_rotational = is_rotational
+
+    def map(self,
+            function: Callable[[Path], R],
+            paths: Sequence[Path],
+            max_workers_per_device: int | None = None) -> List[R]:
+        """
+        Invokes the function once for every path while limiting how many paths on the same device are processed at
+        the same time.
+
+        Paths are grouped by the device they reside on. Paths on different devices are always processed in parallel.
+        Paths on a rotational device are processed one at a time in inode order so the disk heads do not thrash
+        between competing reads, while paths on any other device are processed in parallel up to the per device limit.
+
+        :param function: The function to invoke with each path.
+        :param paths: The paths to process.
+        :param max_workers_per_device: Overrides the maximum number of paths on the same non-rotational device that
+            can be processed at the same time.
+        :return: The results of the function in the same order as the input paths.
+        """
+        limit = max_workers_per_device if max_workers_per_device is not None else self._max_workers_per_device
+        lanes = self._plan(paths, limit)
+        if len(lanes) == 0:
+            return []
+
+        results: List[R] = [None] * len(paths)  # type: ignore[list-item]
+
+        def run_lane(queue: deque):
+            while True:
+                try:
+                    position, path = queue.popleft()
+                except IndexError:
+                    return
+                results[position] = function(path)
+
+        with ThreadPoolExecutor(max_workers=len(lanes)) as executor:
+            for execution in [executor.submit(run_lane, queue) for queue in lanes]:
+                execution.result()
+        return results
+
+    def _plan(self, paths: Sequence[Path], limit: int) -> List[deque]:
+        """
+        Groups the paths by device and orders them, returning one work queue per worker. Workers that process paths
+        from the same device share the same queue.
+        """
+        devices: Dict[int, List[Tuple[int, int, Path]]] = {}
+        for position, path in enumerate(paths):
+            stat = os.stat(path)
+            devices.setdefault(stat.st_dev, []).append((stat.st_ino, position, path))
+
+        lanes: List[deque] = []
+        for device, entries in devices.items():
+            if self._is_rotational(device):
+                entries.sort(key=lambda entry: (entry[0], entry[1]))
+                workers = 1
+            else:
+                workers = max(1, min(limit, len(entries)))
+            queue = deque((entry[1], entry[2]) for entry in entries)
+            lanes.extend([queue] * workers)
+        return lanes
+
+
+IO_SCHEDULER_SINGLETON: Final[IoScheduler] = IoScheduler()
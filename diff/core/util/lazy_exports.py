@@ -0,0 +1,29 @@
+from typing import Any, Callable, Dict, List, Tuple
+import importlib.util
+import sys
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Creates the module level __getattr__ and __dir__ functions, as described in PEP 562, of a package whose exports are
+    only imported once they are first accessed. Importing one module of the package, or one of its exports, then no
+    longer imports every other module of the package along with their dependencies.
+
+    :param package: The name of the package, usually __name__.
+    :param exports: Maps every exported name to the module, relative to the package, that defines it.
+    :return: The __getattr__ and __dir__ functions to assign at the top level of the package.
+    """
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        # __import__ is used over importlib.import_module so the import shows up in the -X importtime report.
+        value = getattr(__import__(importlib.util.resolve_name(module, package), fromlist=[name]), name)
+        # Caching the export on the package means __getattr__ is only called once per name.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted({*vars(sys.modules[package]), *exports})
+
+    return __getattr__, __dir__
@@ -0,0 +1,49 @@
+from typing import Final
+from pathlib import Path
+import os
+import struct
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is not available on Windows.
+    fcntl = None  # type: ignore[assignment]
+
+
+_FS_IOC_FIEMAP: Final[int] = 0xC020660B
+
+# struct fiemap: fm_start, fm_length, fm_flags, fm_mapped_extents, fm_extent_count, fm_reserved
+_FIEMAP_HEADER: Final[struct.Struct] = struct.Struct('=QQLLLL')
+
+# struct fiemap_extent: fe_logical, fe_physical, fe_length, fe_reserved64[2], fe_flags, fe_reserved[3]
+_FIEMAP_EXTENT: Final[struct.Struct] = struct.Struct('=QQQQQLLLL')
+
+_FIEMAP_MAX_LENGTH: Final[int] = 0xFFFFFFFFFFFFFFFF
+
+
+def physical_offset(path: Path) -> int | None:
+    """
+    Looks up the physical offset, on the underlying block device, of the first extent of a file using the Linux
+    FIEMAP ioctl.
+
+    :param path: The path to the file whose physical offset is to be looked up.
+    :return: The physical offset in bytes of the start of the file, or None if the file has no extents or the offset
+        could not be determined because FIEMAP is not supported by the platform or the file system.
+    """
+    if fcntl is None:
+        return None
+
+    request = bytearray(_FIEMAP_HEADER.size + _FIEMAP_EXTENT.size)
+    _FIEMAP_HEADER.pack_into(request, 0, 0, _FIEMAP_MAX_LENGTH, 0, 0, 1, 0)
+    try:
+        descriptor = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.ioctl(descriptor, _FS_IOC_FIEMAP, request, True)
+        finally:
+            os.close(descriptor)
+    except OSError:
+        return None
+
+    mapped_extents = _FIEMAP_HEADER.unpack_from(request, 0)[3]
+    if mapped_extents == 0:
+        return None
+    return _FIEMAP_EXTENT.unpack_from(request, _FIEMAP_HEADER.size)[1]
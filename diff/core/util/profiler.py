@@ -0,0 +1,208 @@
+from typing import List, Dict, ContextManager, Iterator, Final, TYPE_CHECKING
+from contextlib import contextmanager, nullcontext
+import sys
+import threading
+import time
+
+if TYPE_CHECKING:
+    import cProfile
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is not available on Windows.
+    resource = None  # type: ignore[assignment]
+
+
+PROFILE_FORMAT_TABLE: Final[str] = 'table'
+PROFILE_FORMAT_JSON: Final[str] = 'json'
+
+AVAILABLE_PROFILE_FORMATS: Final[List[str]] = [
+    PROFILE_FORMAT_TABLE,
+    PROFILE_FORMAT_JSON
+]
+
+PROFILE_CAPTURE_CPROFILE: Final[str] = 'cprofile'
+PROFILE_CAPTURE_TRACEMALLOC: Final[str] = 'tracemalloc'
+
+AVAILABLE_PROFILE_CAPTURES: Final[List[str]] = [
+    PROFILE_CAPTURE_CPROFILE,
+    PROFILE_CAPTURE_TRACEMALLOC
+]
+
+_CAPTURE_ENTRIES: Final[int] = 20
+
+
+class Span:
+    """
+    A single timed execution of a phase. The number of bytes processed during the span can be added while it is open.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+
+    def add_bytes(self, count: int):
+        self.bytes += count
+
+
+class _Phase:
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.peak_rss: int | None = None
+
+
+class _DisabledSpan(Span):
+
+    def add_bytes(self, count: int):
+        pass
+
+
+# Returned by every span while profiling is disabled so instrumented code only pays for entering a null context.
+_DISABLED_SPAN: Final[ContextManager[Span]] = nullcontext(_DisabledSpan())
+
+
+class Profiler:
+
+    def __init__(self):
+        self._enabled = False
+        self._phases: Dict[str, _Phase] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._capture: str | None = None
+        self._cprofile: 'cProfile.Profile | None' = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self, capture: str | None = None):
+        """
+        Starts recording spans and counters.
+
+        :param capture: Optionally either cprofile, to also profile every function call, or tracemalloc, to also trace
+            every memory allocation. Both captures slow down the program considerably.
+        """
+        if capture is not None and capture not in AVAILABLE_PROFILE_CAPTURES:
+            raise ValueError(f'Unrecognized profile capture [{capture}]. Expected one of: {AVAILABLE_PROFILE_CAPTURES}')
+        self._enabled = True
+        self._capture = capture
+        # The capture modules are only imported when used since profiling is disabled on most runs.
+        if capture == PROFILE_CAPTURE_CPROFILE:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif capture == PROFILE_CAPTURE_TRACEMALLOC:
+            import tracemalloc
+            tracemalloc.start()
+
+    def span(self, name: str) -> ContextManager[Span]:
+        """
+        Times a phase of the program. Spans of the same name are aggregated in the report.
+
+        :param name: The name of the phase being timed.
+        :return: A context manager timing the phase. The Span it returns can be used to record the number of bytes
+            processed by the phase.
+        """
+        if not self._enabled:
+            return _DISABLED_SPAN
+        return self._timed_span(name)
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Increments a named counter, such as the number of skipped files, that will be included in the report.
+        """
+        if not self._enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def report(self, profile_format: str) -> str:
+        """
+        Stops any capture and renders the wall time, calls, bytes and peak resident set size of every phase, followed
+        by the counters and the result of the capture, if any.
+
+        :param profile_format: Either table, to render a human readable table, or json.
+        :return: The rendered report.
+        """
+        capture = self._stop_capture()
+        with self._lock:
+            phases = {
+                name: {
+                    'calls': phase.calls,
+                    'seconds': round(phase.seconds, 6),
+                    'bytes': phase.bytes,
+                    'peak_rss': phase.peak_rss
+                }
+                for name, phase in sorted(self._phases.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+
+        if profile_format == PROFILE_FORMAT_JSON:
+            import json
+            return json.dumps({'phases': phases, 'counters': counters, 'peak_rss': _peak_rss(), 'capture': capture})
+
+        lines = [f'{"Phase":<32} {"Calls":>10} {"Seconds":>12} {"MiB":>12} {"Peak RSS MiB":>14}']
+        for name, phase in phases.items():
+            peak_rss = f'{phase["peak_rss"] / (1024 * 1024):.1f}' if phase['peak_rss'] is not None else '-'
+            lines.append(
+                f'{name:<32} {phase["calls"]:>10,} {phase["seconds"]:>12.3f} '
+                f'{phase["bytes"] / (1024 * 1024):>12.1f} {peak_rss:>14}'
+            )
+        for name, value in counters.items():
+            lines.append(f'{name:<32} {value:>10,}')
+        if capture is not None:
+            lines.append('')
+            lines.append(capture)
+        return '\n'.join(lines)
+
+    @contextmanager
+    def _timed_span(self, name: str) -> Iterator[Span]:
+        span = Span()
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - started
+            peak_rss = _peak_rss()
+            with self._lock:
+                phase = self._phases.setdefault(name, _Phase())
+                phase.calls += 1
+                phase.seconds += elapsed
+                phase.bytes += span.bytes
+                if peak_rss is not None:
+                    phase.peak_rss = max(peak_rss, phase.peak_rss or 0)
+
+    def _stop_capture(self) -> str | None:
+        if self._capture == PROFILE_CAPTURE_CPROFILE and self._cprofile is not None:
+            import io
+            import pstats
+            self._cprofile.disable()
+            output = io.StringIO()
+            pstats.Stats(self._cprofile, stream=output).sort_stats('cumulative').print_stats(_CAPTURE_ENTRIES)
+            return output.getvalue().strip()
+        if self._capture == PROFILE_CAPTURE_TRACEMALLOC:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                return None
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            statistics = snapshot.statistics('lineno')[:_CAPTURE_ENTRIES]
+            return '\n'.join([f'Peak traced memory: {peak / (1024 * 1024):.1f} MiB', *map(str, statistics)])
+        return None
+
+
+def _peak_rss() -> int | None:
+    """
+    Gets the peak resident set size of the process in bytes, or None if it is not available on this platform.
+    """
+    if resource is None:
+        return None
+    # Linux reports the peak in KiB while macOS reports it in bytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+PROFILER_SINGLETON: Final[Profiler] = Profiler()
@@ -0,0 +1,245 @@
+from typing import List, Dict, Any, Callable, Iterator, TextIO, Final
+from contextlib import contextmanager
+import json
+import sys
+import threading
+import time
+
+
+PROGRESS_MODE_AUTO: Final[str] = 'auto'
+PROGRESS_MODE_PLAIN: Final[str] = 'plain'
+PROGRESS_MODE_JSON: Final[str] = 'json'
+PROGRESS_MODE_QUIET: Final[str] = 'quiet'
+
+AVAILABLE_PROGRESS_MODES: Final[List[str]] = [
+    PROGRESS_MODE_AUTO,
+    PROGRESS_MODE_PLAIN,
+    PROGRESS_MODE_JSON,
+    PROGRESS_MODE_QUIET
+]
+
+# The status line of a terminal is redrawn often while log lines, which are never overwritten, are written less often.
+_TERMINAL_INTERVAL: Final[float] = 0.5
+_LOG_INTERVAL: Final[float] = 5.0
+
+_MEBIBYTE: Final[int] = 1024 * 1024
+
+
+class ProgressStage:
+    """
+    The counters of a single stage of work, such as listing or hashing the files of a tree. The counters are only
+    updated by the workers, reading and rendering them is left to the ProgressReporter so updating them stays cheap.
+    """
+
+    def __init__(self,
+                 name: str,
+                 total_files: int | None,
+                 total_bytes: int | None,
+                 clock: Callable[[], float]):
+        self.name = name
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files = 0
+        self.bytes = 0
+        self.directories = 0
+        self.listed_directories = 0
+        self.skipped = 0
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def file_completed(self, size: int | None = None):
+        with self._lock:
+            self.files += 1
+            self.bytes += size if size is not None else 0
+
+    def directory_found(self):
+        with self._lock:
+            self.directories += 1
+
+    def directory_listed(self):
+        with self._lock:
+            self.listed_directories += 1
+
+    def entry_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Captures the current value of every counter along with the rates and the estimated time remaining.
+
+        :return: A dict containing the state of the stage that can be rendered or serialized to JSON.
+        """
+        with self._lock:
+            files, size = self.files, self.bytes
+            directories, listed, skipped = self.directories, self.listed_directories, self.skipped
+        elapsed = max(self._clock() - self._started, 1e-9)
+        files_per_second = files / elapsed
+        bytes_per_second = size / elapsed
+
+        eta: float | None = None
+        if self.total_bytes is not None and bytes_per_second > 0:
+            eta = max(self.total_bytes - size, 0) / bytes_per_second
+        elif self.total_files is not None and files_per_second > 0:
+            eta = max(self.total_files - files, 0) / files_per_second
+
+        return {
+            'stage': self.name,
+            'elapsed': round(elapsed, 3),
+            'files': files,
+            'total_files': self.total_files,
+            'bytes': size,
+            'total_bytes': self.total_bytes,
+            'directories': directories,
+            'skipped': skipped,
+            'queued_files': max(self.total_files - files, 0) if self.total_files is not None else None,
+            'queued_directories': max(directories - listed, 0),
+            'files_per_second': round(files_per_second, 1),
+            'bytes_per_second': round(bytes_per_second, 1),
+            'eta': round(eta, 1) if eta is not None else None
+        }
+
+
+class ProgressReporter:
+
+    def __init__(self,
+                 stream: TextIO | None = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 interval: float | None = None,
+                 callback: Callable[[Dict[str, Any]], None] | None = None):
+        """
+        :param callback: If specified, every snapshot of the active stages is passed to the callback, with a final key
+            set once the stage completed, instead of being written to the stream. Nothing is formatted and the mode
+            is ignored.
+        """
+        self._stream = stream
+        self._clock = clock
+        self._interval = interval
+        self._callback = callback
+        self._mode = PROGRESS_MODE_QUIET
+        self._stages: List[ProgressStage] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._renderer: threading.Thread | None = None
+
+    def set_mode(self, mode: str):
+        """
+        Sets how the progress of every stage started afterwards will be reported.
+
+        :param mode: Either auto, to redraw a status line on a terminal and fall back to plain otherwise, plain, to
+            periodically write a log line, json, to periodically write a JSON object per line, or quiet, to not report
+            any progress.
+        """
+        if mode not in AVAILABLE_PROGRESS_MODES:
+            raise ValueError(f'Unrecognized progress mode [{mode}]. Expected one of: {AVAILABLE_PROGRESS_MODES}')
+        self._mode = mode
+
+    @contextmanager
+    def stage(self, name: str, total_files: int | None = None, total_bytes: int | None = None) -> Iterator[ProgressStage]:
+        """
+        Starts tracking a stage of work. While at least one stage is active the progress of every active stage is
+        rendered at a fixed rate by a background thread, and a final line is rendered once each stage completes.
+
+        :param name: The name of the stage to display.
+        :param total_files: The number of files the stage is expected to process, if known.
+        :param total_bytes: The number of bytes the stage is expected to process, if known.
+        :return: The counters of the stage to be updated as the work is completed.
+        """
+        progress_stage = ProgressStage(name, total_files, total_bytes, self._clock)
+        with self._lock:
+            self._stages.append(progress_stage)
+            if (self._mode != PROGRESS_MODE_QUIET or self._callback is not None) and self._renderer is None:
+                self._stop.clear()
+                self._renderer = threading.Thread(target=self._render_periodically, name='progress', daemon=True)
+                self._renderer.start()
+        try:
+            yield progress_stage
+        finally:
+            with self._lock:
+                self._stages.remove(progress_stage)
+                renderer = self._renderer if len(self._stages) == 0 else None
+                if renderer is not None:
+                    self._renderer = None
+                    self._stop.set()
+            if renderer is not None:
+                renderer.join()
+            self._render([progress_stage], True)
+
+    def _render_periodically(self):
+        while not self._stop.wait(self._get_interval()):
+            with self._lock:
+                stages = list(self._stages)
+            self._render(stages, False)
+
+    def _render(self, stages: List[ProgressStage], final: bool):
+        if self._callback is not None:
+            for stage in stages:
+                self._callback({**stage.snapshot(), 'final': final})
+            return
+        mode = self._resolve_mode()
+        if mode == PROGRESS_MODE_QUIET or len(stages) == 0:
+            return
+        stream = self._get_stream()
+        snapshots = [stage.snapshot() for stage in stages]
+        if mode == PROGRESS_MODE_JSON:
+            for snapshot in snapshots:
+                stream.write(json.dumps({**snapshot, 'final': final}) + '\n')
+        elif mode == PROGRESS_MODE_PLAIN:
+            for snapshot in snapshots:
+                stream.write(format_snapshot(snapshot) + '\n')
+        else:
+            line = ' | '.join(format_snapshot(snapshot) for snapshot in snapshots)
+            stream.write('\r\033[K' + line + ('\n' if final else ''))
+        stream.flush()
+
+    def _resolve_mode(self) -> str:
+        if self._mode != PROGRESS_MODE_AUTO:
+            return self._mode
+        is_terminal = getattr(self._get_stream(), 'isatty', None)
+        return PROGRESS_MODE_AUTO if is_terminal is not None and is_terminal() else PROGRESS_MODE_PLAIN
+
+    def _get_interval(self) -> float:
+        if self._interval is not None:
+            return self._interval
+        if self._callback is not None:
+            return _LOG_INTERVAL
+        return _TERMINAL_INTERVAL if self._resolve_mode() == PROGRESS_MODE_AUTO else _LOG_INTERVAL
+
+    def _get_stream(self) -> TextIO:
+        # Progress is written to stderr by default so it never mixes with the results written to stdout.
+        return self._stream if self._stream is not None else sys.stderr
+
+
+def format_snapshot(snapshot: Dict[str, Any]) -> str:
+    """
+    Formats a snapshot of a stage as a single human readable line.
+    """
+    parts = [f'{snapshot["stage"]}:']
+    if snapshot['total_files'] is not None:
+        parts.append(f'{snapshot["files"]:,}/{snapshot["total_files"]:,} files')
+    else:
+        parts.append(f'{snapshot["files"]:,} files')
+    if snapshot['directories'] > 0:
+        parts.append(f'{snapshot["directories"]:,} directories')
+    parts.append(f'{snapshot["files_per_second"]:,.1f} files/s')
+    if snapshot['bytes'] > 0 or snapshot['total_bytes'] is not None:
+        parts.append(f'{snapshot["bytes_per_second"] / _MEBIBYTE:,.1f} MiB/s')
+    if snapshot['queued_files'] is not None:
+        parts.append(f'queued files {snapshot["queued_files"]:,}')
+    if snapshot['queued_directories'] > 0:
+        parts.append(f'queued directories {snapshot["queued_directories"]:,}')
+    if snapshot['skipped'] > 0:
+        parts.append(f'{snapshot["skipped"]:,} skipped')
+    if snapshot['eta'] is not None:
+        parts.append(f'ETA {_format_duration(snapshot["eta"])}')
+    return ' '.join(parts)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours:02}:{minutes:02}:{seconds:02}'
+
+
+PROGRESS_REPORTER_SINGLETON: Final[ProgressReporter] = ProgressReporter()
@@ -0,0 +1,32 @@
+import click
+
+from diff.core.cli import CliDupes
+from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
+
+
+@click.command()
+@click.argument('paths', nargs=-1, required=True)
+@click.option(
+    '--algo',
+    '-a',
+    type=click.Choice(AVAILABLE_HASH_ALGORITHMS),
+    default=DEFAULT_HASH_ALGORITHM,
+    help='The preferred algorithm to hash the files with.'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    default=None,
+    help='The maximum number of files on the same solid state device to hash in parallel.'
+)
+def dupes(paths: tuple[str, ...], algo: str, workers: int | None):
+    """
+    Scans one or more directories and lists all the files that have identical contents.
+
+    Files are first grouped by size, then by a partial hash of their first and last block, and only the files that
+    still collide are fully hashed.
+
+    paths: The paths to the directories to search for duplicate files.
+    """
+    CliDupes().dupes(list(paths), algo, workers)
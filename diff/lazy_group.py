@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+import click
+
+
+class LazyGroup(click.Group):
+
+    """
+    A click group whose commands are only imported once they are invoked, or listed by --help. Running a command then
+    only imports the modules that command uses instead of the modules of every command.
+    """
+
+    def __init__(self, *args: Any, lazy_commands: Dict[str, str] | None = None, **kwargs: Any):
+        """
+        :param lazy_commands: Maps the name of every command to its import path in the form module:attribute.
+        """
+        super().__init__(*args, **kwargs)
+        self._lazy_commands = lazy_commands if lazy_commands is not None else {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self._lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self._lazy_commands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self._lazy_commands[cmd_name].split(':')
+        # __import__ is used over importlib.import_module so the import shows up in the -X importtime report.
+        command = getattr(__import__(module_name, fromlist=[attribute]), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f'The lazy command [{cmd_name}] did not resolve to a click command.')
+        return command
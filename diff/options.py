@@ -0,0 +1,134 @@
+from typing import Callable, TypeVar
+from pathlib import Path
+
+import click
+
+from diff.core.tree import TreeLoader, TREE_LOADER_SINGLETON, AsyncTreeLoader, DEFAULT_READ_ORDER
+from diff.core.tree.diff import ListingOptions
+from diff.core.util import DEFAULT_MEMORY_BUDGET, HASH_POOL_SINGLETON, HASH_BACKEND_AUTO
+
+
+F = TypeVar('F', bound=Callable)
+
+
+def path_filter_options(command: F) -> F:
+    """
+    The --exclude, --include and --ignore-file options of every command that walks a directory.
+    """
+    command = click.option(
+        '--ignore-file',
+        default=None,
+        help='The path to a file containing additional exclude patterns, one per line. Lines starting with # are ignored.'
+    )(command)
+    command = click.option(
+        '--include',
+        '-i',
+        multiple=True,
+        help='Only scans the files matching this glob pattern. Can be specified multiple times.'
+    )(command)
+    command = click.option(
+        '--exclude',
+        '-e',
+        multiple=True,
+        help='Skips the files and directories matching this glob pattern. Can be specified multiple times.'
+    )(command)
+    return command
+
+
+def concurrency_option(command: F) -> F:
+    """
+    The --concurrency option of every command that reads a full tree from disk.
+    """
+    return click.option(
+        '--concurrency',
+        type=click.IntRange(min=1),
+        default=None,
+        help='Lists directories and stats files with up to this many requests in flight. Speeds up scans of network '
+             'file systems, such as SMB or NFS mounts, where every request is a round trip to the server.'
+    )(command)
+
+
+def tree_loader_for(concurrency: int | None, quick: bool = False, external: bool = False) -> TreeLoader:
+    """
+    Gets the loader to read full trees with given the value of the --concurrency option. The quick and external modes
+    walk the directories one at a time so the option is rejected in either mode rather than being ignored.
+    """
+    if concurrency is not None and (quick or external):
+        raise click.UsageError('The --concurrency option cannot be used with the --quick or --external options.')
+    return AsyncTreeLoader(concurrency=concurrency) if concurrency is not None else TREE_LOADER_SINGLETON
+
+
+def external_options(command: F) -> F:
+    """
+    The --external and --memory-budget options of every command that diffs full trees.
+    """
+    command = click.option(
+        '--memory-budget',
+        type=click.IntRange(min=1),
+        default=None,
+        help=f'The memory, in MiB, the entries being sorted can use before being written to disk. Defaults to '
+             f'{DEFAULT_MEMORY_BUDGET // (1024 * 1024)}. Requires --external.'
+    )(command)
+    return click.option(
+        '--external',
+        is_flag=True,
+        help='Sorts the entries of each tree on disk and diffs the sorted entries so trees larger than memory can be '
+             'compared. Lists the differences ordered by path.'
+    )(command)
+
+
+def validate_external_options(external: bool, quick: bool, memory_budget: int | None, read_order: str) -> int:
+    """
+    Checks the external options are used together with the options they can be used with. External mode hashes each
+    file as soon as it is found, so the options deciding the order and the pool the files are hashed in are rejected
+    rather than ignored.
+
+    :return: The memory budget in bytes.
+    """
+    if external and quick:
+        raise click.UsageError('The --external option cannot be used with the --quick option.')
+    if external and read_order != DEFAULT_READ_ORDER:
+        raise click.UsageError('The --read-order option cannot be used with the --external option.')
+    if external and HASH_POOL_SINGLETON.backend != HASH_BACKEND_AUTO:
+        raise click.UsageError('The --hash-backend option cannot be used with the --external option.')
+    if memory_budget is None:
+        return DEFAULT_MEMORY_BUDGET
+    if not external:
+        raise click.UsageError('The --memory-budget option requires the --external option.')
+    return memory_budget * 1024 * 1024
+
+
+def listing_options(command: F) -> F:
+    """
+    The --summary-depth, --limit and --full-listing options of every command that lists the differences between full
+    trees.
+    """
+    command = click.option(
+        '--full-listing',
+        default=None,
+        help='Writes the complete listing of the differences to this file regardless of --limit.'
+    )(command)
+    command = click.option(
+        '--limit',
+        type=click.IntRange(min=0),
+        default=None,
+        help='Lists at most this many entries in each section of the listing.'
+    )(command)
+    return click.option(
+        '--summary-depth',
+        type=click.IntRange(min=0),
+        default=None,
+        help='Prints the number of files and bytes added, removed and changed per directory, rolled up to this many '
+             'directories below the root, instead of listing every difference. Combine with --limit to also list '
+             'some of the differences.'
+    )(command)
+
+
+def listing_options_for(quick: bool, summary_depth: int | None, limit: int | None, full_listing: str | None) -> ListingOptions:
+    """
+    Checks the listing options are not used in quick mode, where only the first difference is reported, and gets the
+    options to print the differences with.
+    """
+    if quick and (summary_depth is not None or limit is not None or full_listing is not None):
+        raise click.UsageError('The --summary-depth, --limit and --full-listing options cannot be used with the --quick option.')
+    return ListingOptions(summary_depth, limit, Path(full_listing).absolute() if full_listing is not None else None)
@@ -0,0 +1,38 @@
+import click
+
+from diff.core.cli import CliReplicas
+from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM, AVAILABLE_READ_ORDERS, DEFAULT_READ_ORDER
+
+
+@click.command()
+@click.argument('paths', nargs=-1, required=True)
+@click.option(
+    '--checksum',
+    '-c',
+    is_flag=True,
+    help='Specifies if the checksum should be calculated for each file found in the scan.'
+)
+@click.option(
+    '--algo',
+    '-a',
+    type=click.Choice(AVAILABLE_HASH_ALGORITHMS),
+    default=DEFAULT_HASH_ALGORITHM,
+    help='The preferred algorithm to hash the file with.'
+)
+@click.option(
+    '--read-order',
+    type=click.Choice(AVAILABLE_READ_ORDERS),
+    default=DEFAULT_READ_ORDER,
+    help='The order in which files are hashed. Use inode or physical to reduce seeking on spinning disks.'
+)
+def replicas(paths: tuple[str, ...], checksum: bool, algo: str, read_order: str):
+    """
+    Scans two or more directories, that are expected to be replicas of one another, and compares all of them at once.
+
+    Each directory is only scanned once, and all directories are scanned in parallel. This will identify all files
+    that are missing from one or more of the replicas and all files whose size or checksum is not the same in every
+    replica.
+
+    paths: The paths to the replica directories to compare.
+    """
+    CliReplicas().replicas(list(paths), checksum, algo, read_order)
@@ -1,7 +1,27 @@
+from typing import Tuple, TextIO
+
 import click
 
 from diff.core.cli import CliScan
-from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
+from diff.core.tree import (
+    AVAILABLE_HASH_ALGORITHMS,
+    DEFAULT_HASH_ALGORITHM,
+    AVAILABLE_READ_ORDERS,
+    DEFAULT_READ_ORDER,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_FLUSH_INTERVAL,
+    build_path_filter
+)
+
+from .options import (
+    path_filter_options,
+    concurrency_option,
+    tree_loader_for,
+    external_options,
+    validate_external_options,
+    listing_options,
+    listing_options_for
+)
 
 
 @click.command('folder')
@@ -20,15 +40,73 @@ from diff.core.tree import AVAILABLE_HASH_ALGORITHMS, DEFAULT_HASH_ALGORITHM
     default=DEFAULT_HASH_ALGORITHM,
     help='The preferred algorithm to hash the file with.'
 )
-def _folder(path: str, output: str, checksum: bool, algo: str):
+@click.option(
+    '--read-order',
+    type=click.Choice(AVAILABLE_READ_ORDERS),
+    default=DEFAULT_READ_ORDER,
+    help='The order in which files are hashed. Use inode or physical to reduce seeking on spinning disks.'
+)
+@click.option(
+    '--chunk-threshold',
+    type=click.IntRange(min=0),
+    default=None,
+    help='Records the checksum of every chunk of each file of at least this many MiB. Requires --checksum.'
+)
+@click.option(
+    '--chunk-size',
+    type=click.IntRange(min=1),
+    default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+    help='The size, in MiB, of each chunk when recording chunk checksums.'
+)
+@click.option(
+    '--journal',
+    is_flag=True,
+    help='Records the checksum of every file to a journal next to the output file so an interrupted scan can be '
+         'continued with --resume. Requires --checksum.'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Continues an interrupted scan from its journal, only hashing the files it had yet to hash, and keeps '
+         'journaling the remaining files. Requires --checksum.'
+)
+@path_filter_options
+@concurrency_option
+def _folder(path: str,
+            output: str,
+            checksum: bool,
+            algo: str,
+            read_order: str,
+            chunk_threshold: int | None,
+            chunk_size: int,
+            journal: bool,
+            resume: bool,
+            exclude: Tuple[str, ...],
+            include: Tuple[str, ...],
+            ignore_file: str | None,
+            concurrency: int | None):
     """
     Scans a given directory and saves the results of the scan to a yaml file.
 
+    With the --journal option the checksum of every file is recorded to a journal, next to the output file, so an
+    interrupted scan can be continued with the --resume option. The journal is removed once the scan is saved.
+
     path: The path to the directory to be scanned.
 
     output: The path where the yaml file containing the results of the scan should be saved to.
     """
-    CliScan().folder(path, output, checksum, algo)
+    CliScan(tree_loader_for(concurrency)).folder(
+        path,
+        output,
+        checksum,
+        algo,
+        read_order,
+        chunk_threshold * 1024 * 1024 if chunk_threshold is not None else None,
+        chunk_size * 1024 * 1024,
+        build_path_filter(exclude, include, ignore_file),
+        resume,
+        journal
+    )
 
 
 @click.command('verify')
@@ -39,16 +117,118 @@ def _folder(path: str, output: str, checksum: bool, algo: str):
     is_flag=True,
     help='Specifies if the checksum should be calculated for each file found in the scan.'
 )
-def _verify(scan: str, checksum: bool):
+@click.option(
+    '--quick',
+    '-q',
+    is_flag=True,
+    help='Stops at the first difference found and exits with a status of 1 if the scan no longer matches the disk.'
+)
+@click.option(
+    '--read-order',
+    type=click.Choice(AVAILABLE_READ_ORDERS),
+    default=DEFAULT_READ_ORDER,
+    help='The order in which files are hashed. Use inode or physical to reduce seeking on spinning disks.'
+)
+@path_filter_options
+@concurrency_option
+@external_options
+@listing_options
+def _verify(scan: str,
+            checksum: bool,
+            quick: bool,
+            read_order: str,
+            exclude: Tuple[str, ...],
+            include: Tuple[str, ...],
+            ignore_file: str | None,
+            concurrency: int | None,
+            external: bool,
+            memory_budget: int | None,
+            summary_depth: int | None,
+            limit: int | None,
+            full_listing: str | None):
     """
     Checks if the results of a previous scan match what is currently on disk.
 
     This will check to see if any files have been deleted, added, or have changed either in terms of their size or
     their checksum.
 
+    In quick mode the scan stops as soon as the first difference is found and only that difference is reported.
+
+    In external mode the scan and the directory are sorted on disk, within the memory budget, so scans larger than
+    memory can be verified.
+
+    With a summary depth the differences are rolled up into counts per directory, so very large diffs produce a short
+    report.
+
+    Use the same excludes and includes the scan was created with, otherwise the files they skip will be reported as
+    missing.
+
+    scan: The path to the yaml file containing the results of a previous scan.
+    """
+    path_filter = build_path_filter(exclude, include, ignore_file)
+    memory_budget_bytes = validate_external_options(external, quick, memory_budget, read_order)
+    options = listing_options_for(quick, summary_depth, limit, full_listing)
+    tree_loader = tree_loader_for(concurrency, quick, external)
+    if external:
+        CliScan().external_verify(scan, checksum, path_filter, memory_budget_bytes, options)
+    elif not quick:
+        CliScan(tree_loader).verify(scan, checksum, read_order, path_filter, options)
+    elif not CliScan().quick_verify(scan, checksum, path_filter):
+        click.get_current_context().exit(1)
+
+
+@click.command('watch')
+@click.argument('scan')
+@click.option(
+    '--interval',
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_FLUSH_INTERVAL,
+    help='The number of seconds between saving the changes to the scan file.'
+)
+@path_filter_options
+def _watch(scan: str,
+           interval: float,
+           exclude: Tuple[str, ...],
+           include: Tuple[str, ...],
+           ignore_file: str | None):
+    """
+    Keeps the results of a previous scan up to date by watching the scanned directory for changes. Only available on
+    Linux.
+
+    Every change made to the directory is applied to the scan as it happens and only the files that were created or
+    modified are hashed again. The changes are saved to the scan file periodically and once the command is stopped.
+
+    Use the same excludes and includes the scan was created with.
+
+    scan: The path to the yaml file containing the results of a previous scan.
+    """
+    CliScan().watch(scan, interval, build_path_filter(exclude, include, ignore_file))
+
+
+@click.command('query')
+@click.argument('scan')
+@click.argument('paths', nargs=-1)
+@click.option(
+    '--paths-file',
+    type=click.File('r'),
+    default=None,
+    help='Reads additional paths to query from a file, one per line. Use - to read them from stdin.'
+)
+def _query(scan: str, paths: Tuple[str, ...], paths_file: TextIO | None):
+    """
+    Prints the size and checksum a previous scan recorded for each path, as one JSON object per line.
+
+    The scan is loaded once for the whole batch and each path is looked up by name one directory at a time, so
+    querying thousands of paths takes little more time than loading the scan.
+
     scan: The path to the yaml file containing the results of a previous scan.
+
+    paths: The paths to look up, either relative to the scanned directory or absolute paths within it.
     """
-    CliScan().verify(scan, checksum)
+    all_paths = list(paths)
+    if paths_file is not None:
+        all_paths.extend(line.rstrip('\n') for line in paths_file if line.strip() != '')
+    CliScan().query(scan, all_paths)
 
 
 @click.group()
@@ -58,3 +238,5 @@ def scan():
 
 scan.add_command(_verify)
 scan.add_command(_folder)
+scan.add_command(_watch)
+scan.add_command(_query)
@@ -0,0 +1,56 @@
+from typing import Tuple
+
+import click
+
+from diff.core.cli import CliServe
+from diff.core.server import AVAILABLE_ACTIONS, DEFAULT_MAX_CACHED_CHECKSUMS, default_socket_path
+
+
+def _socket_option(command):
+    return click.option(
+        '--socket',
+        'socket_path',
+        default=lambda: str(default_socket_path()),
+        show_default='$XDG_RUNTIME_DIR/diff-tools.sock',
+        help='The path of the Unix socket the server listens on.'
+    )(command)
+
+
+@click.command()
+@_socket_option
+@click.option(
+    '--workers',
+    type=click.IntRange(min=1),
+    default=None,
+    help='The number of files that can be hashed at once across every hash request.'
+)
+@click.option(
+    '--max-checksums',
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CACHED_CHECKSUMS,
+    help='The number of file checksums kept in memory. The least recently used are forgotten first.'
+)
+def serve(socket_path: str, workers: int | None, max_checksums: int):
+    """
+    Runs a server that keeps scans and file checksums in memory and answers queries over a local Unix socket.
+
+    Scans are read once and kept until their scan file changes, and the checksum of a file is only computed again once
+    its size or modification time changes, so repeated queries are answered without reading everything again. Use
+    the query command to send requests to the server.
+    """
+    CliServe().serve(socket_path, workers, max_checksums)
+
+
+@click.command()
+@_socket_option
+@click.argument('action', type=click.Choice(AVAILABLE_ACTIONS))
+@click.argument('arguments', nargs=-1)
+def query(socket_path: str, action: str, arguments: Tuple[str, ...]):
+    """
+    Sends a request to a running server and prints the result as JSON.
+
+    action: The action to perform. One of load, lookup, verify, diff, hash, or status.
+
+    arguments: The arguments of the action in the form of name=value, for example scan=scan.yml path=folder/file.txt.
+    """
+    CliServe().query(socket_path, action, list(arguments))
@@ -1,8 +1,12 @@
 import unittest
 
+from .api import *
+from .benchmarks import *
 from .cli import *
+from .server import *
 from .tree import *
 from .tree.diff import *
+from .tree.dupes import *
 from .util import *
 
 
@@ -0,0 +1 @@
+from .diff_tools_test import DiffToolsTests
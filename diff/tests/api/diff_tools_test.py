@@ -0,0 +1,83 @@
+from typing import List, Dict, Any
+from contextlib import redirect_stdout
+from pathlib import Path
+import io
+import shutil
+import tempfile
+
+import unittest
+
+from diff.core.api import DiffTools, FirstDifference
+from diff.core.util import Checksum
+
+
+class DiffToolsTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._first = Path(self._directory.name).joinpath('first')
+        self._first.joinpath('nested').mkdir(parents=True)
+        self._first.joinpath('same.txt').write_text('same')
+        self._first.joinpath('changed.txt').write_text('before')
+        self._first.joinpath('resized.txt').write_text('short')
+        self._first.joinpath('nested', 'removed.txt').write_text('removed')
+        self._second = Path(self._directory.name).joinpath('second')
+        shutil.copytree(self._first, self._second)
+        self._second.joinpath('changed.txt').write_text('after!')
+        self._second.joinpath('resized.txt').write_text('much longer')
+        self._second.joinpath('nested', 'removed.txt').unlink()
+        self._second.joinpath('added.txt').write_text('added')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_scan_reports_progress_without_printing(self):
+        snapshots: List[Dict[str, Any]] = []
+        output = io.StringIO()
+        with redirect_stdout(output), DiffTools(on_progress=snapshots.append) as tools:
+            tree = tools.scan(self._first, 'sha256')
+            scan_path = Path(self._directory.name).joinpath('scan.yml')
+            tools.save_scan(tree, scan_path)
+            loaded = tools.load_scan(scan_path)
+
+        self.assertEqual('', output.getvalue())
+        self.assertEqual(
+            [('Listing', True), ('Hashing', True)],
+            [(snapshot['stage'], snapshot['final']) for snapshot in snapshots if snapshot['final']]
+        )
+        self.assertEqual(Checksum().compute_file_checksum(self._first.joinpath('same.txt'), 'sha256'),
+                         loaded.find_node('same.txt').checksum)
+
+    def test_hash_files_yields_in_order_with_errors(self):
+        paths = [self._first.joinpath('same.txt'), self._first.joinpath('missing.txt'), self._first.joinpath('changed.txt')]
+        with DiffTools(max_workers=1) as tools:
+            hashes = list(tools.hash_files(iter(paths), 'md5'))
+
+        self.assertEqual(paths, [file_hash.path for file_hash in hashes])
+        self.assertEqual(Checksum().compute_file_checksum(paths[0], 'md5'), hashes[0].checksum)
+        self.assertIsNone(hashes[1].checksum)
+        self.assertIsInstance(hashes[1].error, FileNotFoundError)
+        self.assertIsNotNone(hashes[2].checksum)
+
+    def test_differences(self):
+        with DiffTools() as tools:
+            differences = tools.differences(tools.scan(self._first, 'sha256'), tools.scan(self._second, 'sha256'))
+
+            self.assertEqual({
+                ('changed.txt', FirstDifference.CHECKSUM),
+                ('resized.txt', FirstDifference.SIZE),
+                ('added.txt', FirstDifference.MISSING_FROM_FIRST),
+                (str(Path('nested', 'removed.txt')), FirstDifference.MISSING_FROM_SECOND)
+            }, {(difference.relative_path, difference.reason) for difference in differences})
+
+    def test_first_difference_between_scan_and_disk_reuses_pool(self):
+        with DiffTools() as tools:
+            scan_tree = tools.scan(self._first, 'sha256')
+
+            self.assertIsNone(tools.first_difference(scan_tree, self._first, 'sha256'))
+            executor = tools._get_executor()
+            self._first.joinpath('changed.txt').write_text('change')
+            difference = tools.first_difference(scan_tree, self._first, 'sha256')
+
+            self.assertEqual(('changed.txt', FirstDifference.CHECKSUM), (difference.relative_path, difference.reason))
+            self.assertIs(executor, tools._get_executor())
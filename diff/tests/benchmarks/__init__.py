@@ -0,0 +1 @@
+from .synthetic_tree_test import SyntheticTreeTests
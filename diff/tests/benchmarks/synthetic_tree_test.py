@@ -0,0 +1,43 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+
+from diff.benchmarks.synthetic_tree import generate_tree, mutate_tree
+from diff.benchmarks.suite import compare_results
+
+
+class SyntheticTreeTests(unittest.TestCase):
+
+    def test_generate_tree_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            first_files = generate_tree(Path(first), 2, 2, 3, 'lognormal', 128, 7)
+            second_files = generate_tree(Path(second), 2, 2, 3, 'lognormal', 128, 7)
+
+            self.assertEqual(21, len(first_files))
+            self.assertEqual(first_files, second_files)
+            for file in first_files:
+                self.assertEqual(Path(first, file).read_bytes(), Path(second, file).read_bytes())
+
+    def test_mutate_tree(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory, 'source')
+            target = Path(directory, 'target')
+            files = generate_tree(source, 1, 2, 10, 'fixed', 64, 3)
+
+            actual = mutate_tree(source, target, files, 0.1, 0.2, 0.3, 3)
+
+            self.assertEqual({'changed': 3, 'renamed': 6, 'deleted': 9}, actual)
+            unchanged = [file for file in files if target.joinpath(file).is_file()
+                         and target.joinpath(file).read_bytes() == source.joinpath(file).read_bytes()]
+            self.assertEqual(len(files) - 3 - 6 - 9, len(unchanged))
+            self.assertEqual(6, len(list(target.rglob('renamed_*'))))
+
+    def test_compare_results(self):
+        baseline = {'hashing': {'seconds': 1.0, 'peak_memory': 100}}
+        results = {'hashing': {'seconds': 1.1, 'peak_memory': 150}, 'yaml_load': {'seconds': 5.0, 'peak_memory': 1}}
+
+        actual = compare_results(results, baseline, 0.2)
+
+        self.assertEqual(1, len(actual))
+        self.assertTrue(actual[0].startswith('hashing peak_memory'))
@@ -1,3 +1,7 @@
 from .cli_checksum_test import CliChecksumTests
+from .cli_dupes_test import CliDupesTests
+from .cli_replicas_test import CliReplicasTests
 from .cli_scan_test import CliScanTests
 from .cli_between_test import CliBetweenTests
+from .startup_test import StartupTests
+from .cli_serve_test import CliServeTests
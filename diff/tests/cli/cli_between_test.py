@@ -3,8 +3,8 @@ import unittest
 from unittest.mock import Mock, patch, call, ANY
 
 from diff.core.cli import CliBetween
-from diff.core.tree import TreeLoader
-from diff.core.tree.diff import TreeDiff, SimilarityPrinter
+from diff.core.tree import TreeLoader, PathFilter
+from diff.core.tree.diff import TreeDiff, SimilarityPrinter, QuickDiff, DiskSide, DEFAULT_LISTING_OPTIONS
 
 from diff.tests.util import fully_qualified_name
 
@@ -27,7 +27,9 @@ class CliBetweenTests(unittest.TestCase):
         first_tree = Mock()
         second_tree = Mock()
 
-        def mock_return(path: Path, checksum: bool, algo: str):
+        path_filter = PathFilter(['.git/'])
+
+        def mock_return(path: Path, checksum: bool, algo: str, read_order: str, path_filter: PathFilter):
             if path == first_path:
                 return first_tree
             elif path == second_path:
@@ -42,12 +44,37 @@ class CliBetweenTests(unittest.TestCase):
         mock_tree_diff.diff_between_trees = Mock(return_value=diff_result)
 
         (CliBetween(mock_tree_diff, mock_tree_loader, mock_similarity_printer)
-         .between(str(first_path), str(second_path), True, checksum_algo))
+         .between(str(first_path), str(second_path), True, checksum_algo, 'inode', path_filter))
 
         mock_tree_loader.read_tree_from_disk.assert_has_calls([
-            call(first_path, True, checksum_algo),
-            call(second_path, True, checksum_algo)
+            call(first_path, True, checksum_algo, 'inode', path_filter=path_filter),
+            call(second_path, True, checksum_algo, 'inode', path_filter=path_filter)
         ], True)
 
         mock_tree_diff.diff_between_trees.assert_called_once_with(first_tree, second_tree)
-        mock_similarity_printer.print_similarity_results.assert_called_once_with(diff_result, ANY)
+        mock_similarity_printer.print_similarity_results.assert_called_once_with(diff_result, ANY, DEFAULT_LISTING_OPTIONS)
+
+    @patch(fully_qualified_name(QuickDiff))
+    @patch(fully_qualified_name(SimilarityPrinter))
+    @patch(fully_qualified_name(TreeLoader))
+    @patch(fully_qualified_name(TreeDiff))
+    def test_quick_between(self,
+                           mock_tree_diff: TreeDiff,
+                           mock_tree_loader: TreeLoader,
+                           mock_similarity_printer: SimilarityPrinter,
+                           mock_quick_diff: QuickDiff):
+
+        first_path = Path(__file__).absolute().parent.parent.joinpath('tree')
+        second_path = Path(__file__).absolute().parent.parent.joinpath('util')
+
+        difference = Mock()
+        mock_quick_diff.first_difference = Mock(return_value=difference)
+        mock_similarity_printer.print_first_difference = Mock()
+
+        actual = (CliBetween(mock_tree_diff, mock_tree_loader, mock_similarity_printer, mock_quick_diff)
+                  .quick_between(str(first_path), str(second_path), True, 'sha256'))
+
+        self.assertFalse(actual)
+        mock_quick_diff.first_difference.assert_called_once_with(ANY, ANY, True)
+        self.assertIsInstance(mock_quick_diff.first_difference.call_args.args[0], DiskSide)
+        mock_similarity_printer.print_first_difference.assert_called_once_with(difference, ANY)
@@ -1,8 +1,10 @@
 from pathlib import Path
+import tempfile
 import unittest
 from unittest.mock import Mock, patch, call
 
 from diff.core.cli import CliChecksum
+from diff.core.tree import TreeLoader, YamlSerialization
 from diff.core.util import Checksum
 from diff.core.errors import NotAFileException
 
@@ -143,3 +145,62 @@ class CliChecksumTests(unittest.TestCase):
             CliChecksum(mock_checksum, Mock()).compare(str(path), str(path), 'sha256')
 
         self.assertEqual(str(context.exception), f'The path argument [first] does not point to a file. Please check the path and try again: [{path}]')
+
+    @patch(fully_qualified_name(Checksum))
+    def test_calculate_manifest(self, mock_checksum: Checksum):
+        mock_checksum.compute_file_checksum = Mock(side_effect=lambda path, algo: path.name.upper())
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('nested').mkdir()
+            root.joinpath('nested', 'b.txt').write_text('b')
+            root.joinpath('nested', 'a.txt').write_text('a')
+            manifest_path = root.joinpath('manifest.sha256')
+
+            mock_print_function = Mock()
+            CliChecksum(mock_checksum, mock_print_function).calculate_manifest(
+                [str(root.joinpath('nested'))], 'sha256', str(manifest_path), 2)
+
+            lines = manifest_path.read_text().splitlines()
+
+        self.assertEqual([f'a.txt  {Path("nested", "a.txt")}', f'b.txt  {Path("nested", "b.txt")}'], lines)
+        mock_print_function.assert_called_once_with(f'The sha256 hashes of 2 files saved to: [{manifest_path}]')
+
+    @patch(fully_qualified_name(Checksum))
+    def test_verify_manifest(self, mock_checksum: Checksum):
+        mock_checksum.compute_file_checksum = Mock(side_effect=lambda path, algo: 'AAAA')
+
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('good.txt').write_text('good')
+            root.joinpath('bad.txt').write_text('bad')
+            manifest_path = root.joinpath('manifest.sha256')
+            manifest_path.write_text('aaaa  good.txt\nbbbb  bad.txt\n')
+
+            mock_print_function = Mock()
+            actual = CliChecksum(mock_checksum, mock_print_function).verify_manifest(str(manifest_path), 'sha256', 2)
+
+        self.assertFalse(actual)
+        mock_checksum.compute_file_checksum.assert_has_calls([
+            call(root.joinpath('good.txt'), 'sha256'),
+            call(root.joinpath('bad.txt'), 'sha256')
+        ], True)
+        mock_print_function.assert_has_calls([
+            call('bad.txt: FAILED'),
+            call('Verified 2 files: 1 OK, 1 FAILED, 0 could not be read.')
+        ])
+
+    def test_diff_ranges_against_scan_with_different_algorithm(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory).joinpath('root')
+            root.mkdir()
+            root.joinpath('file.bin').write_bytes(b'content' * 100)
+            scans = []
+            for algo in ['sha256', 'md5']:
+                scan_path = Path(directory).joinpath(f'{algo}.yml')
+                tree = TreeLoader().read_tree_from_disk(root, True, algo, chunk_threshold=0, chunk_size=100)
+                YamlSerialization().to_yaml_file(scan_path, tree)
+                scans.append(str(scan_path))
+
+            with self.assertRaises(ValueError):
+                CliChecksum(print_function=Mock()).diff_ranges(scans[0], 'file.bin', None, scans[1])
@@ -0,0 +1,55 @@
+from pathlib import Path
+import unittest
+from unittest.mock import Mock, patch, call
+
+from diff.core.cli import CliDupes
+from diff.core.tree import TreeLoader
+from diff.core.tree.dupes import DuplicateFinder, DuplicateGroup
+
+from diff.tests.util import fully_qualified_name
+
+
+class CliDupesTests(unittest.TestCase):
+
+    @patch(fully_qualified_name(DuplicateFinder))
+    @patch(fully_qualified_name(TreeLoader))
+    def test_dupes(self, mock_tree_loader: TreeLoader, mock_duplicate_finder: DuplicateFinder):
+        checksum_algo = 'sha256'
+        first_path = Path(__file__).absolute().parent.parent.joinpath('tree')
+        second_path = Path(__file__).absolute().parent.parent.joinpath('util')
+
+        first_tree = Mock()
+        second_tree = Mock()
+        mock_tree_loader.read_tree_from_disk = Mock(side_effect=[first_tree, second_tree])
+
+        first_node = Mock(path_to_node=Mock(return_value=Path('first')))
+        second_node = Mock(path_to_node=Mock(return_value=Path('second')))
+        mock_duplicate_finder.find_duplicates = Mock(return_value=[
+            DuplicateGroup(10, 'CHECKSUM', [first_node, second_node])
+        ])
+
+        mock_print_function = Mock()
+
+        (CliDupes(mock_tree_loader, mock_duplicate_finder, mock_print_function)
+         .dupes([str(first_path), str(second_path)], checksum_algo, 4))
+
+        mock_tree_loader.read_tree_from_disk.assert_has_calls([
+            call(first_path, False, checksum_algo),
+            call(second_path, False, checksum_algo)
+        ])
+        mock_duplicate_finder.find_duplicates.assert_called_once_with([first_tree, second_tree], checksum_algo, 4)
+        mock_print_function.assert_has_calls([
+            call('Found 1 groups of duplicate files. Removing the duplicates would free 10 bytes.'),
+            call(f'\n2 files of 10 bytes with the {checksum_algo} hash CHECKSUM:'),
+            call('\t[first]'),
+            call('\t[second]')
+        ])
+
+    @patch(fully_qualified_name(DuplicateFinder))
+    @patch(fully_qualified_name(TreeLoader))
+    def test_dupes_with_overlapping_paths(self, mock_tree_loader: TreeLoader, mock_duplicate_finder: DuplicateFinder):
+        parent_path = Path(__file__).absolute().parent.parent
+        child_path = parent_path.joinpath('tree')
+
+        with self.assertRaises(ValueError):
+            CliDupes(mock_tree_loader, mock_duplicate_finder, Mock()).dupes([str(parent_path), str(child_path)], 'sha256', None)
@@ -0,0 +1,46 @@
+from pathlib import Path
+import unittest
+from unittest.mock import Mock, patch, call
+
+from diff.core.cli import CliReplicas
+from diff.core.tree import TreeLoader
+from diff.core.tree.diff import ReplicaDiff, ReplicaDifference
+
+from diff.tests.util import fully_qualified_name
+
+
+class CliReplicasTests(unittest.TestCase):
+
+    @patch(fully_qualified_name(TreeLoader))
+    @patch(fully_qualified_name(ReplicaDiff))
+    def test_replicas(self, mock_replica_diff: ReplicaDiff, mock_tree_loader: TreeLoader):
+        checksum_algo = 'sha256'
+        paths = [Path(__file__).absolute().parent.parent.joinpath(name) for name in ['tree', 'util', 'cli']]
+        trees = {path: Mock(path_to_node=Mock(return_value=path)) for path in paths}
+
+        mock_tree_loader.read_tree_from_disk = Mock(side_effect=lambda path, checksum, algo, read_order: trees[path])
+
+        changed = [Mock(size=1, checksum='A'), Mock(size=1, checksum='B'), None]
+        mock_replica_diff.diff_between_replicas = Mock(return_value=[
+            ReplicaDifference('changed', changed, [2], True)
+        ])
+
+        mock_print_function = Mock()
+
+        (CliReplicas(mock_replica_diff, mock_tree_loader, mock_print_function)
+         .replicas([str(path) for path in paths], True, checksum_algo, 'listing'))
+
+        mock_tree_loader.read_tree_from_disk.assert_has_calls([call(path, True, checksum_algo, 'listing') for path in paths], True)
+        mock_replica_diff.diff_between_replicas.assert_called_once_with([trees[path] for path in paths])
+        mock_print_function.assert_any_call(f'\t[changed] is missing from: [{paths[2]}]')
+        mock_print_function.assert_has_calls([
+            call('\t[changed]'),
+            call(f'\t\t[{paths[0]}] size: 1, checksum: A'),
+            call(f'\t\t[{paths[1]}] size: 1, checksum: B')
+        ])
+
+    @patch(fully_qualified_name(TreeLoader))
+    @patch(fully_qualified_name(ReplicaDiff))
+    def test_replicas_with_single_path(self, mock_replica_diff: ReplicaDiff, mock_tree_loader: TreeLoader):
+        with self.assertRaises(ValueError):
+            CliReplicas(mock_replica_diff, mock_tree_loader, Mock()).replicas([str(Path(__file__).parent)], False, 'sha256')
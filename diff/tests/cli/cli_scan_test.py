@@ -1,10 +1,13 @@
 from pathlib import Path
+import json
+import tempfile
 import unittest
-from unittest.mock import Mock, patch, ANY
+from unittest.mock import Mock, patch, ANY, call
 
 from diff.core.cli import CliScan
-from diff.core.tree import TreeLoader, YamlSerialization
-from diff.core.tree.diff import TreeDiff, SimilarityPrinter
+from diff.core.errors import NotAFileException
+from diff.core.tree import TreeLoader, YamlSerialization, Node, DEFAULT_PATH_FILTER
+from diff.core.tree.diff import TreeDiff, SimilarityPrinter, DEFAULT_LISTING_OPTIONS
 
 from diff.tests.util import fully_qualified_name
 
@@ -31,11 +34,47 @@ class CliScanTests(unittest.TestCase):
         output_path = input_path.joinpath('scan.yml')
 
         (CliScan(mock_tree_loader, mock_tree_diff, mock_yaml_serialization, Mock(), mock_print_function)
-         .folder(str(input_path), str(output_path), True, checksum_algo))
-
-        mock_tree_loader.read_tree_from_disk.assert_called_once_with(input_path, True, checksum_algo)
+         .folder(str(input_path), str(output_path), True, checksum_algo, 'physical'))
+
+        mock_tree_loader.read_tree_from_disk.assert_called_once_with(
+            input_path,
+            True,
+            checksum_algo,
+            'physical',
+            None,
+            4 * 1024 * 1024,
+            DEFAULT_PATH_FILTER,
+            journal=ANY
+        )
         mock_yaml_serialization.to_yaml_file.assert_called_once_with(output_path, mock_root_node)
-        mock_print_function.assert_called_once_with(f'Scan results saved to: [{output_path}]')
+        self.assertEqual([
+            call(f'Scanning contents of: [{input_path}]'),
+            call(f'Scan results saved to: [{output_path}]')
+        ], mock_print_function.call_args_list)
+        self.assertFalse(input_path.joinpath('scan.yml.journal').exists())
+
+    @patch(fully_qualified_name(YamlSerialization))
+    @patch(fully_qualified_name(TreeLoader))
+    def test_folder_discards_journal_of_earlier_scan(self, mock_tree_loader: TreeLoader, mock_yaml_serialization: YamlSerialization):
+        mock_print_function = Mock()
+        mock_tree_loader.read_tree_from_disk = Mock(return_value=Mock())
+        mock_yaml_serialization.to_yaml_file = Mock()
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = Path(directory).joinpath('scan.yml')
+            journal_path = Path(directory).joinpath('scan.yml.journal')
+            journal_path.write_text('{"left": "behind"}\n')
+
+            (CliScan(mock_tree_loader, Mock(), mock_yaml_serialization, Mock(), mock_print_function)
+             .folder(directory, str(output_path), True, 'sha256', record_journal=True))
+
+            journal_removed = not journal_path.exists()
+
+        self.assertTrue(journal_removed)
+        self.assertEqual(
+            call(f'Discarding the journal of an earlier scan, use --resume to continue it instead: [{journal_path}]'),
+            mock_print_function.call_args_list[0]
+        )
 
     @patch(fully_qualified_name(SimilarityPrinter))
     @patch(fully_qualified_name(YamlSerialization))
@@ -68,10 +107,49 @@ class CliScanTests(unittest.TestCase):
         mock_similarity_printer.print_similarity_results = Mock()
 
         (CliScan(mock_tree_loader, mock_tree_diff, mock_yaml_serialization, mock_similarity_printer, mock_print_function)
-         .verify(str(scan_file_path), True))
+         .verify(str(scan_file_path), True, 'listing'))
 
         mock_tree_loader.read_tree_from_yaml.assert_called_once_with(scan_file_path)
-        mock_tree_loader.read_tree_from_disk.assert_called_once_with(original_scan_folder, True, checksum_algo)
-        mock_similarity_printer.print_similarity_results.assert_called_once_with(diff_result, ANY)
+        mock_tree_loader.read_tree_from_disk.assert_called_once_with(
+            original_scan_folder,
+            True,
+            checksum_algo,
+            'listing',
+            path_filter=DEFAULT_PATH_FILTER
+        )
+        mock_similarity_printer.print_similarity_results.assert_called_once_with(diff_result, ANY, DEFAULT_LISTING_OPTIONS)
 
         mock_node.path_to_node.assert_called_once()
+
+    @patch(fully_qualified_name(TreeLoader))
+    def test_verify_missing_scan(self, mock_tree_loader: TreeLoader):
+        mock_print_function = Mock()
+        mock_tree_loader.read_tree_from_yaml = Mock()
+
+        with self.assertRaises(NotAFileException):
+            (CliScan(mock_tree_loader, Mock(), Mock(), Mock(), mock_print_function)
+             .verify(str(Path(__file__).absolute().parent.joinpath('missing.yml')), True))
+
+        mock_tree_loader.read_tree_from_yaml.assert_not_called()
+        mock_print_function.assert_not_called()
+
+    @patch(fully_qualified_name(TreeLoader))
+    def test_query(self, mock_tree_loader: TreeLoader):
+        scan_file_path = Path(__file__).absolute()
+        root = Node(None, str(Path('/scanned').absolute()), None, None, 'sha256')
+        directory = Node(root, 'directory', None, None, None)
+        root.attach_child(directory)
+        directory.attach_child(Node(directory, 'file.txt', 10, 'ABC', None))
+        mock_tree_loader.read_tree_from_yaml = Mock(return_value=root)
+        mock_print_function = Mock()
+
+        (CliScan(mock_tree_loader, Mock(), Mock(), Mock(), mock_print_function)
+         .query(str(scan_file_path), ['directory/file.txt', str(root.path_to_node().joinpath('directory')), 'missing.txt', str(Path('/elsewhere').absolute())]))
+
+        mock_tree_loader.read_tree_from_yaml.assert_called_once_with(scan_file_path)
+        self.assertEqual([
+            {'path': 'directory/file.txt', 'found': True, 'type': 'file', 'size': 10, 'checksum': 'ABC'},
+            {'path': str(root.path_to_node().joinpath('directory')), 'found': True, 'type': 'directory', 'size': None, 'checksum': None},
+            {'path': 'missing.txt', 'found': False},
+            {'path': str(Path('/elsewhere').absolute()), 'found': False}
+        ], [json.loads(call.args[0]) for call in mock_print_function.call_args_list])
@@ -0,0 +1,27 @@
+from pathlib import Path
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from diff.core.cli import CliServe
+
+
+class CliServeTests(unittest.TestCase):
+
+    @patch('diff.core.cli.cli_serve.ScanClient')
+    def test_query_sends_absolute_paths(self, mock_client_class: Mock):
+        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client.request = Mock(return_value={'ok': True})
+        mock_print_function = Mock()
+
+        CliServe(mock_print_function).query('diff.sock', 'lookup', ['scan=scan.yml', 'path=folder/10', 'limit=10'])
+        CliServe(mock_print_function).query('diff.sock', 'diff', ['first=first.yml', 'second=/data/second.yml'])
+        CliServe(mock_print_function).query('diff.sock', 'hash', ['path=123'])
+
+        self.assertEqual([
+            (('lookup',), {'scan': str(Path('scan.yml').absolute()), 'path': 'folder/10', 'limit': 10}),
+            (('diff',), {'first': str(Path('first.yml').absolute()), 'second': str(Path('/data/second.yml').absolute())}),
+            (('hash',), {'path': str(Path('123').absolute())})
+        ], [(request.args, request.kwargs) for request in mock_client.request.call_args_list])
+        mock_print_function.assert_called_with(json.dumps({'ok': True}, indent=2))
+
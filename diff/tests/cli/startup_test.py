@@ -0,0 +1,55 @@
+from typing import List
+from pathlib import Path
+import re
+import subprocess
+import sys
+import unittest
+
+
+# Modules that are only needed by other commands or by optional features and so must not be imported by the checksum
+# calculate command.
+_DEFERRED_MODULES: List[str] = [
+    'yaml',
+    'concurrent.futures',
+    'cProfile',
+    'pstats',
+    'tracemalloc',
+    'diff.scan',
+    'diff.between',
+    'diff.dupes',
+    'diff.replicas',
+    'diff.core.cli.cli_between',
+    'diff.core.cli.cli_scan',
+    'diff.core.tree.diff.tree_diff',
+    'diff.core.tree.dupes'
+]
+
+_IMPORT_TIME_LINE = re.compile(r'import time:\s+\d+ \|\s+\d+ \| *(\S+)')
+
+
+def _imported_modules(arguments: List[str]) -> List[str]:
+    """
+    Runs the CLI with -X importtime.
+
+    :return: The name of every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'diff', *arguments],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent.parent.parent
+    )
+    matches = [_IMPORT_TIME_LINE.match(line) for line in result.stderr.splitlines()]
+    return [match.group(1) for match in matches if match is not None]
+
+
+class StartupTests(unittest.TestCase):
+
+    def test_checksum_calculate_does_not_import_other_commands(self):
+        modules = _imported_modules(['checksum', 'calculate', __file__])
+
+        self.assertIn('diff.checksum', modules)
+        for module in _DEFERRED_MODULES:
+            self.assertNotIn(module, modules)
+
@@ -0,0 +1,2 @@
+from .scan_service_test import ScanServiceTests
+from .socket_server_test import ScanServerTests
@@ -0,0 +1,128 @@
+from pathlib import Path
+import hashlib
+import os
+import tempfile
+import threading
+
+import unittest
+
+from diff.core.server import ScanService, CachedChecksum
+from diff.core.tree import TreeLoader, YamlSerialization
+
+
+def _sha256(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest().upper()
+
+
+class ScanServiceTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._root = Path(self._directory.name).joinpath('root')
+        self._root.joinpath('folder').mkdir(parents=True)
+        self._root.joinpath('folder', 'kept.txt').write_text('kept')
+        self._root.joinpath('folder', 'modified.txt').write_text('before')
+        self._root.joinpath('deleted.txt').write_text('deleted')
+        self._scan_path = self._write_scan('scan.yml')
+        self._checksum = CachedChecksum()
+        self._service = ScanService(self._checksum)
+
+    def tearDown(self):
+        self._service.close()
+        self._directory.cleanup()
+
+    def _write_scan(self, name: str) -> str:
+        scan_path = Path(self._directory.name).joinpath(name)
+        YamlSerialization().to_yaml_file(scan_path, TreeLoader().read_tree_from_disk(self._root, True, 'sha256'))
+        return str(scan_path)
+
+    def test_load_and_lookup(self):
+        loaded = self._service.handle({'action': 'load', 'scan': self._scan_path})
+        folder = self._service.handle({'action': 'lookup', 'scan': self._scan_path, 'path': 'folder'})
+        kept = self._service.handle({'action': 'lookup', 'scan': self._scan_path, 'path': 'folder/kept.txt'})
+        missing = self._service.handle({'action': 'lookup', 'scan': self._scan_path, 'path': 'missing.txt'})
+
+        self.assertEqual({'root': str(self._root), 'checksum_algo': 'sha256', 'files': 3, 'directories': 1}, loaded)
+        self.assertEqual('directory', folder['type'])
+        self.assertCountEqual(['kept.txt', 'modified.txt'], folder['children'])
+        self.assertEqual({'path': os.path.join('folder', 'kept.txt'), 'type': 'file', 'size': 4, 'checksum': _sha256('kept')}, kept)
+        self.assertIsNone(missing)
+
+    def test_verify_subtree(self):
+        self._root.joinpath('folder', 'modified.txt').write_text('after!')
+        self._root.joinpath('folder', 'kept.txt').unlink()
+        self._root.joinpath('folder', 'added.txt').write_text('added')
+        self._root.joinpath('deleted.txt').unlink()
+
+        result = self._service.handle({'action': 'verify', 'scan': self._scan_path, 'path': 'folder', 'checksum': True})
+
+        # The file deleted outside of the verified folder is not reported.
+        self.assertEqual({
+            'path': 'folder',
+            'changed': [os.path.join('folder', 'modified.txt')],
+            'missing_from_disk': [os.path.join('folder', 'kept.txt')],
+            'new_on_disk': [os.path.join('folder', 'added.txt')]
+        }, result)
+
+    def test_diff_is_cached_until_scan_changes(self):
+        self._root.joinpath('folder', 'modified.txt').write_text('after!')
+        second_scan = self._write_scan('second.yml')
+
+        first_result = self._service.handle({'action': 'diff', 'first': self._scan_path, 'second': second_scan})
+        cached_result = self._service.handle({'action': 'diff', 'first': self._scan_path, 'second': second_scan})
+
+        self.assertIs(first_result, cached_result)
+        self.assertEqual([os.path.join('folder', 'modified.txt')], first_result['changed'])
+
+        self._root.joinpath('folder', 'kept.txt').unlink()
+        os.utime(self._write_scan('second.yml'), ns=(0, 0))
+
+        updated_result = self._service.handle({'action': 'diff', 'first': self._scan_path, 'second': second_scan})
+
+        self.assertEqual([os.path.join('folder', 'kept.txt')], updated_result['missing_from_second'])
+
+    def test_hash_reuses_cached_checksum(self):
+        path = str(self._root.joinpath('folder', 'kept.txt'))
+
+        first = self._service.handle({'action': 'hash', 'path': path})
+        second = self._service.handle({'action': 'hash', 'path': path})
+
+        self.assertEqual(_sha256('kept'), first['checksum'])
+        self.assertEqual(first, second)
+        self.assertEqual({'entries': 1, 'hits': 1, 'misses': 1}, self._checksum.statistics())
+
+    def test_loading_a_scan_does_not_block_other_requests(self):
+        loading = threading.Event()
+        release = threading.Event()
+
+        class _SlowTreeLoader(TreeLoader):
+            def read_tree_from_yaml(self, file_path: Path):
+                if file_path.name == 'scan.yml':
+                    loading.set()
+                    release.wait(10)
+                return super().read_tree_from_yaml(file_path)
+
+        service = ScanService(self._checksum, _SlowTreeLoader())
+        other_scan = self._write_scan('other.yml')
+        service.handle({'action': 'load', 'scan': other_scan})
+        results = []
+        thread = threading.Thread(target=lambda: results.append(service.handle({'action': 'load', 'scan': self._scan_path})))
+        thread.start()
+        try:
+            self.assertTrue(loading.wait(10))
+            status = service.handle({'action': 'status'})
+            kept = service.handle({'action': 'lookup', 'scan': other_scan, 'path': 'folder/kept.txt'})
+        finally:
+            release.set()
+            thread.join()
+            service.close()
+
+        self.assertEqual([other_scan], status['scans'])
+        self.assertEqual(_sha256('kept'), kept['checksum'])
+        self.assertEqual(3, results[0]['files'])
+
+    def test_unknown_action(self):
+        with self.assertRaises(ValueError):
+            self._service.handle({'action': 'unknown'})
+        with self.assertRaises(ValueError):
+            self._service.handle({'action': 'lookup', 'scan': self._scan_path})
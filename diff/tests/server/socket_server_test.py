@@ -0,0 +1,48 @@
+from pathlib import Path
+import tempfile
+import threading
+
+import unittest
+
+from diff.core.errors import ServerRequestException
+from diff.core.server import ScanService, ScanServer, ScanClient
+
+
+class ScanServerTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._socket_path = Path(self._directory.name).joinpath('server.sock')
+        self._file = Path(self._directory.name).joinpath('file.txt')
+        self._file.write_text('content')
+        self._service = ScanService()
+        self._server = ScanServer(self._socket_path, self._service)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.start()
+
+    def tearDown(self):
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+        self._service.close()
+        self._directory.cleanup()
+
+    def test_requests_over_socket(self):
+        with ScanClient(self._socket_path) as client:
+            hashed = client.request('hash', path=str(self._file))
+            status = client.request('status')
+            with self.assertRaises(ServerRequestException):
+                client.request('lookup')
+
+        self.assertEqual(str(self._file), hashed['path'])
+        self.assertEqual({'entries': 1, 'hits': 0, 'misses': 1}, status['checksums'])
+
+    def test_second_server_on_same_socket(self):
+        with self.assertRaises(ValueError):
+            ScanServer(self._socket_path, self._service)
+
+    def test_socket_removed_on_close(self):
+        self.assertEqual(0o600, self._socket_path.stat().st_mode & 0o777)
+        self._server.shutdown()
+        self._server.server_close()
+        self.assertFalse(self._socket_path.exists())
@@ -1 +1,7 @@
 from .tree_loader_test import TreeLoaderTests
+from .path_filter_test import PathFilterTests
+from .async_tree_loader_test import AsyncTreeLoaderTests
+from .scan_watcher_test import ScanWatcherTests
+from .scan_journal_test import ScanJournalTests
+from .node_test import NodeTests
+from .yml_test import YamlSerializationTests
@@ -0,0 +1,103 @@
+from typing import Any, Callable
+from pathlib import Path
+import os
+import tempfile
+import threading
+import time
+
+import unittest
+from unittest.mock import patch
+
+from diff.core.tree import TreeLoader, AsyncTreeLoader, PathFilter
+
+
+_LATENCY: float = 0.005
+
+
+class _SlowFileSystem:
+
+    """
+    Stands in for a network file system by delaying every directory listing and stat, and records the largest
+    number of requests that were in flight at once.
+    """
+
+    def __init__(self, latency: float):
+        self._latency = latency
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.max_in_flight = 0
+
+    def delayed(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                self._in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            try:
+                time.sleep(self._latency)
+                return function(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+        return call
+
+
+def _create_tree(root: Path, directories: int, files: int):
+    for directory_index in range(directories):
+        directory = root.joinpath(f'directory_{directory_index}', 'nested')
+        directory.mkdir(parents=True)
+        for file_index in range(files):
+            directory.joinpath(f'file_{file_index}.txt').write_text(f'{directory_index}-{file_index}')
+    root.joinpath('root_file.txt').write_text('root')
+
+
+class AsyncTreeLoaderTests(unittest.TestCase):
+
+    def test_read_tree_from_disk_matches_tree_loader(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            _create_tree(root, 5, 4)
+            root.joinpath('directory_0', 'skipped.pyc').write_text('skipped')
+            path_filter = PathFilter(['*.pyc'])
+
+            expected = TreeLoader().read_tree_from_disk(root, True, 'sha256', path_filter=path_filter)
+            actual = AsyncTreeLoader(concurrency=4).read_tree_from_disk(root, True, 'sha256', path_filter=path_filter)
+
+        self.assertEqual(expected.to_dict(), actual.to_dict())
+
+    def test_read_tree_from_disk_keeps_requests_in_flight_on_slow_file_system(self):
+        concurrency = 16
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            _create_tree(root, 8, 8)
+
+            serial_file_system = _SlowFileSystem(_LATENCY)
+            with patch('os.scandir', serial_file_system.delayed(os.scandir)), patch('os.stat', serial_file_system.delayed(os.stat)):
+                expected = TreeLoader().read_tree_from_disk(root, False, None)
+
+            async_file_system = _SlowFileSystem(_LATENCY)
+            with patch('os.scandir', async_file_system.delayed(os.scandir)), patch('os.stat', async_file_system.delayed(os.stat)):
+                actual = AsyncTreeLoader(concurrency=concurrency).read_tree_from_disk(root, False, None)
+
+        self.assertEqual(expected.to_dict(), actual.to_dict())
+        self.assertEqual(1, serial_file_system.max_in_flight)
+        self.assertGreater(async_file_system.max_in_flight, 1)
+        self.assertLessEqual(async_file_system.max_in_flight, concurrency)
+
+    def test_read_tree_from_disk_raises_listing_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            _create_tree(root, 3, 2)
+
+            original_scandir = os.scandir
+
+            def scandir(path: Any) -> Any:
+                if Path(path).name == 'nested':
+                    raise PermissionError(f'Permission denied: [{path}]')
+                return original_scandir(path)
+
+            with patch('os.scandir', scandir), self.assertRaises(PermissionError):
+                AsyncTreeLoader(concurrency=4).read_tree_from_disk(root, False, None)
+
+    def test_concurrency_below_one_raises_exception(self):
+        with self.assertRaises(ValueError):
+            AsyncTreeLoader(concurrency=0)
@@ -1 +1,7 @@
 from .tree_diff_tests import TreeDiffTests
+from .replica_diff_test import ReplicaDiffTests
+from .quick_diff_test import QuickDiffTests
+from .chunk_diff_test import ChunkDiffTests
+from .external_diff_test import ExternalTreeDiffTests
+from .diff_summary_test import DiffSummaryTests
+from .similarity_printer_test import SimilarityPrinterTests
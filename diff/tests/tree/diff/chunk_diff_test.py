@@ -0,0 +1,51 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import Node
+from diff.core.tree.diff import ChunkDiff
+from diff.core.util import Checksum
+
+
+def _manifest(size: int, chunks: list, chunk_size: int = 4) -> Node:
+    node = Node(None, 'file.bin', size, None, None)
+    node.chunks = chunks
+    node.chunk_size = chunk_size
+    return node
+
+
+class ChunkDiffTests(unittest.TestCase):
+
+    def test_diff_manifests(self):
+        first = _manifest(18, ['A', 'B', 'C', 'D', 'E'])
+        second = _manifest(12, ['A', 'X', 'Y'])
+
+        actual = ChunkDiff().diff_manifests(first, second)
+
+        self.assertEqual([(4, 18)], actual)
+
+    def test_diff_manifests_with_different_chunk_sizes(self):
+        with self.assertRaises(ValueError):
+            ChunkDiff().diff_manifests(_manifest(4, ['A'], 4), _manifest(4, ['A'], 8))
+
+    def test_diff_manifests_without_chunks(self):
+        with self.assertRaises(ValueError):
+            ChunkDiff().diff_manifests(Node(None, 'file.bin', 4, None, None), _manifest(4, ['A']))
+
+    def test_diff_manifest_against_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('file.bin')
+            path.write_bytes(b'aaaabbbbccccdddd')
+            checksum = Checksum()
+            manifest = _manifest(16, checksum.compute_chunk_digests(path, 'sha256', 4))
+
+            path.write_bytes(b'aaaaBBBBccccddddeeee')
+            checksum.compute_chunk_digests = Mock(wraps=checksum.compute_chunk_digests)
+
+            actual = ChunkDiff(checksum).diff_manifest_against_file(manifest, path, 'sha256')
+
+        self.assertEqual([(4, 8), (16, 20)], actual)
+        # The appended chunk only exists on disk so it should not have been read.
+        checksum.compute_chunk_digests.assert_called_once_with(path, 'sha256', 4, 4)
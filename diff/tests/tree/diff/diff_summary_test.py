@@ -0,0 +1,67 @@
+from typing import List
+import os
+
+import unittest
+
+from diff.core.tree import Node
+from diff.core.tree.diff import DiffSummary, DiffResult, MissingResult, DirectorySummary
+
+
+def _node(parent: Node | None, name: str, size: int | None = None) -> Node:
+    node = Node(parent, name, size, None, None)
+    if parent is not None:
+        parent.attach_child(node)
+    return node
+
+
+def _rows(summaries: List[DirectorySummary]):
+    return [
+        (summary.relative_path, summary.added, summary.added_bytes, summary.removed, summary.removed_bytes,
+         summary.changed, summary.changed_bytes)
+        for summary in summaries
+    ]
+
+
+class DiffSummaryTests(unittest.TestCase):
+
+    def setUp(self):
+        self._first_root = _node(None, 'first')
+        self._second_root = _node(None, 'second')
+        first_photos = _node(self._first_root, 'photos')
+        second_photos = _node(self._second_root, 'photos')
+        first_year = _node(first_photos, '2023')
+        second_year = _node(second_photos, '2023')
+        changed = (_node(first_year, 'changed.jpg', 5), _node(second_year, 'changed.jpg', 7))
+        added = _node(second_year, 'added.jpg', 3)
+        removed_directory = _node(first_photos, 'old')
+        _node(removed_directory, 'one.jpg', 10)
+        _node(_node(removed_directory, 'nested'), 'two.jpg', 20)
+        root_file = _node(self._second_root, 'notes.txt', 1)
+        self._diff_result = DiffResult(
+            [changed],
+            MissingResult(self._first_root, [added, root_file]),
+            MissingResult(self._second_root, [removed_directory])
+        )
+
+    def test_summarize_to_depth(self):
+        summaries = DiffSummary().summarize(self._diff_result, 2)
+
+        self.assertEqual([
+            ('.', 1, 1, 0, 0, 0, 0),
+            (os.path.join('photos', '2023'), 1, 3, 0, 0, 1, 7),
+            (os.path.join('photos', 'old'), 0, 0, 2, 30, 0, 0)
+        ], _rows(summaries))
+
+    def test_summarize_to_root(self):
+        summaries = DiffSummary().summarize(self._diff_result, 0)
+
+        self.assertEqual([('.', 2, 4, 2, 30, 1, 7)], _rows(summaries))
+
+    def test_summarize_external_diff_nodes(self):
+        # The external diff attaches every node to the root using its full relative path as its name.
+        added = Node(self._second_root, os.path.join('photos', '2024', 'new.jpg'), 4, None, None)
+        diff_result = DiffResult([], MissingResult(self._first_root, [added]), MissingResult(self._second_root, []))
+
+        summaries = DiffSummary().summarize(diff_result, 1)
+
+        self.assertEqual([('photos', 1, 4, 0, 0, 0, 0)], _rows(summaries))
@@ -0,0 +1,100 @@
+from typing import List, Tuple
+from pathlib import Path
+import random
+import shutil
+import tempfile
+
+import unittest
+
+import yaml
+
+from diff.core.tree import TreeLoader, YamlSerialization
+from diff.core.tree.diff import TreeDiff, ExternalTreeDiff, DiffResult
+
+
+def _create_tree(root: Path):
+    generator = random.Random(1)
+    directories = [root]
+    root.mkdir()
+    for position in range(300):
+        parent = generator.choice(directories)
+        if position % 4 == 0:
+            directory = parent.joinpath(f'directory{position}')
+            directory.mkdir()
+            directories.append(directory)
+        else:
+            parent.joinpath(f'file{position}.txt').write_text(f'content{position}')
+
+
+def _summarize(diff_result: DiffResult) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
+    return (
+        sorted((str(first.path_to_node()), str(second.path_to_node())) for first, second in diff_result.similar),
+        sorted(str(node.path_to_node()) for node in diff_result.first_tree.missing),
+        sorted(str(node.path_to_node()) for node in diff_result.second_tree.missing)
+    )
+
+
+class ExternalTreeDiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._first = Path(self._directory.name).joinpath('first')
+        self._second = Path(self._directory.name).joinpath('second')
+        _create_tree(self._first)
+        shutil.copytree(self._first, self._second)
+
+        files = sorted(self._second.rglob('*.txt'))
+        for path in files[::17]:
+            path.unlink()
+        for path in files[5::23]:
+            path.write_text('changed')
+        # A file replaced by a directory, a directory only in the first tree and a nested directory only in the second.
+        files[3].unlink()
+        files[3].mkdir()
+        files[3].joinpath('nested.txt').write_text('nested')
+        shutil.rmtree(next(path for path in sorted(self._second.rglob('directory*')) if any(path.iterdir())))
+        self._second.joinpath('added', 'nested').mkdir(parents=True)
+        self._second.joinpath('added', 'nested', 'new.txt').write_text('new')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_diff_between_directories_matches_tree_diff(self):
+        tree_loader = TreeLoader()
+        expected = TreeDiff().diff_between_trees(
+            tree_loader.read_tree_from_disk(self._first, True, 'sha256'),
+            tree_loader.read_tree_from_disk(self._second, True, 'sha256')
+        )
+
+        external_tree_diff = ExternalTreeDiff()
+        # A budget this small spills every few entries so the entries are sorted through several runs.
+        with external_tree_diff.sort_tree_from_disk(self._first, True, 'sha256', memory_budget=4096) as first_tree, \
+                external_tree_diff.sort_tree_from_disk(self._second, True, 'sha256', memory_budget=4096) as second_tree:
+            actual = external_tree_diff.diff_between_sorted_trees(first_tree, second_tree)
+
+        self.assertGreater(len(expected.similar), 0)
+        self.assertGreater(len(expected.first_tree.missing), 0)
+        self.assertGreater(len(expected.second_tree.missing), 0)
+        self.assertEqual(_summarize(expected), _summarize(actual))
+
+    def test_diff_between_scan_and_directory_matches_tree_diff(self):
+        tree_loader = TreeLoader()
+        scan_tree = tree_loader.read_tree_from_disk(self._first, True, 'sha256')
+        scan_path = Path(self._directory.name).joinpath('scan.yml')
+        YamlSerialization().to_yaml_file(scan_path, scan_tree)
+        # Scans written with their keys sorted have the children of every node ahead of its name.
+        sorted_scan_path = Path(self._directory.name).joinpath('sorted_scan.yml')
+        sorted_scan_path.write_text(yaml.safe_dump(scan_tree.to_dict(), sort_keys=True))
+
+        expected = TreeDiff().diff_between_trees(scan_tree, tree_loader.read_tree_from_disk(self._second, True, 'sha256'))
+
+        external_tree_diff = ExternalTreeDiff()
+        for path in [scan_path, sorted_scan_path]:
+            with self.subTest(path.name), \
+                    external_tree_diff.sort_tree_from_yaml(path, memory_budget=4096) as first_tree, \
+                    external_tree_diff.sort_tree_from_disk(self._second, True, 'sha256', memory_budget=4096) as second_tree:
+                actual = external_tree_diff.diff_between_sorted_trees(first_tree, second_tree)
+
+                self.assertEqual(str(self._first), first_tree.root.name)
+                self.assertEqual('sha256', first_tree.root.checksum_algo)
+                self.assertEqual(_summarize(expected), _summarize(actual))
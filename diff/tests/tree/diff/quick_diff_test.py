@@ -0,0 +1,80 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import TreeLoader
+from diff.core.tree.diff import QuickDiff, DiskSide, ScanSide, FirstDifference
+
+
+class QuickDiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._first = Path(self._directory.name).joinpath('first')
+        self._second = Path(self._directory.name).joinpath('second')
+        for root in [self._first, self._second]:
+            root.joinpath('nested').mkdir(parents=True)
+            root.joinpath('nested', 'file.txt').write_bytes(b'content')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _first_difference(self, compare_checksums: bool) -> FirstDifference | None:
+        return QuickDiff(2).first_difference(
+            DiskSide(self._first, 'sha256'),
+            DiskSide(self._second, 'sha256'),
+            compare_checksums
+        )
+
+    def test_first_difference_with_identical_directories(self):
+        self.assertIsNone(self._first_difference(True))
+
+    def test_first_difference_with_missing_file(self):
+        self._second.joinpath('nested', 'extra.txt').write_bytes(b'extra')
+
+        actual = self._first_difference(False)
+
+        self.assertIsNotNone(actual)
+        self.assertEqual(str(Path('nested', 'extra.txt')), actual.relative_path)
+        self.assertEqual(FirstDifference.MISSING_FROM_FIRST, actual.reason)
+
+    def test_first_difference_with_different_checksum(self):
+        self._second.joinpath('nested', 'file.txt').write_bytes(b'CONTENT')
+
+        self.assertIsNone(self._first_difference(False))
+
+        actual = self._first_difference(True)
+
+        self.assertIsNotNone(actual)
+        self.assertEqual(str(Path('nested', 'file.txt')), actual.relative_path)
+        self.assertEqual(FirstDifference.CHECKSUM, actual.reason)
+
+    def test_first_difference_stops_walking_after_difference(self):
+        self._second.joinpath('extra.txt').write_bytes(b'extra')
+
+        tree_loader = TreeLoader()
+        tree_loader.list_children = Mock(wraps=tree_loader.list_children)
+
+        actual = QuickDiff().first_difference(
+            DiskSide(self._first, 'sha256', tree_loader),
+            DiskSide(self._second, 'sha256', tree_loader),
+            True
+        )
+
+        self.assertEqual(FirstDifference.MISSING_FROM_FIRST, actual.reason)
+        # Only the two root directories should have been listed.
+        self.assertEqual(2, tree_loader.list_children.call_count)
+
+    def test_first_difference_against_scan(self):
+        scan_tree = TreeLoader().read_tree_from_disk(self._first, True, 'sha256')
+        # Same size as the original content so only the checksum can tell them apart.
+        self._first.joinpath('nested', 'file.txt').write_bytes(b'changed')
+
+        self.assertIsNone(QuickDiff().first_difference(ScanSide(scan_tree), DiskSide(self._first, 'sha256'), False))
+
+        actual = QuickDiff().first_difference(ScanSide(scan_tree), DiskSide(self._first, 'sha256'), True)
+
+        self.assertIsNotNone(actual)
+        self.assertEqual(FirstDifference.CHECKSUM, actual.reason)
@@ -0,0 +1,46 @@
+import unittest
+
+from diff.core.tree import Node
+from diff.core.tree.diff import ReplicaDiff
+
+
+def _attach(parent: Node, name: str, size: int | None, checksum: str | None) -> Node:
+    node = Node(parent, name, size, checksum, None)
+    parent.attach_child(node)
+    return node
+
+
+class ReplicaDiffTests(unittest.TestCase):
+
+    def test_diff_between_replicas(self):
+        trees = [Node(None, f'/replica{position}', None, None, None) for position in range(3)]
+
+        for tree in trees:
+            _attach(tree, 'same', 100, 'same_checksum')
+
+        # 'folder' and its only file are missing from the last replica.
+        for tree in trees[:2]:
+            folder = _attach(tree, 'folder', None, None)
+            _attach(folder, 'file', 10, 'folder_checksum')
+
+        # 'changed' has a different checksum in the second replica.
+        _attach(trees[0], 'changed', 50, 'checksum_1')
+        _attach(trees[1], 'changed', 50, 'checksum_2')
+        _attach(trees[2], 'changed', 50, 'checksum_1')
+
+        # 'only_last' only exists in the last replica.
+        _attach(trees[2], 'only_last', 5, None)
+
+        actual = ReplicaDiff().diff_between_replicas(trees)
+
+        self.assertEqual(['folder', 'changed', 'only_last'], [difference.relative_path for difference in actual])
+
+        self.assertEqual([2], actual[0].missing)
+        self.assertFalse(actual[0].different)
+
+        self.assertEqual([], actual[1].missing)
+        self.assertTrue(actual[1].different)
+        self.assertEqual(['checksum_1', 'checksum_2', 'checksum_1'], [node.checksum for node in actual[1].nodes])
+
+        self.assertEqual([0, 1], actual[2].missing)
+        self.assertFalse(actual[2].different)
@@ -0,0 +1,67 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import Node
+from diff.core.tree.diff import SimilarityPrinter, DiffResult, MissingResult, DiffMessageDecorator, ListingOptions
+
+
+class _Decorator(DiffMessageDecorator):
+
+    def first_tree_has_diff_message(self) -> str:
+        return 'Missing from first:'
+
+    def first_tree_no_diff_message(self) -> str:
+        return 'Nothing missing from first.'
+
+    def second_tree_has_diff_message(self) -> str:
+        return 'Missing from second:'
+
+    def second_tree_no_diff_message(self) -> str:
+        return 'Nothing missing from second.'
+
+    def first_tree_label(self) -> str:
+        return 'the first tree'
+
+    def second_tree_label(self) -> str:
+        return 'the second tree'
+
+
+class SimilarityPrinterTests(unittest.TestCase):
+
+    def setUp(self):
+        self._first_root = Node(None, 'first', None, None, None)
+        self._second_root = Node(None, 'second', None, None, None)
+        missing = []
+        for position in range(3):
+            node = Node(self._second_root, f'file{position}.txt', position, None, None)
+            self._second_root.attach_child(node)
+            missing.append(node)
+        self._diff_result = DiffResult([], MissingResult(self._first_root, missing), MissingResult(self._second_root, []))
+
+    def _lines(self, listing_options: ListingOptions):
+        print_function = Mock()
+        SimilarityPrinter(print_function).print_similarity_results(self._diff_result, _Decorator(), listing_options)
+        return [call.args[0] for call in print_function.call_args_list]
+
+    def test_limit_caps_each_section(self):
+        lines = self._lines(ListingOptions(limit=2))
+
+        self.assertIn(f'\t[{Path("second", "file1.txt")}]', lines)
+        self.assertNotIn(f'\t[{Path("second", "file2.txt")}]', lines)
+        self.assertIn('\t... and 1 more not listed.', lines)
+
+    def test_summary_replaces_listing_and_full_listing_is_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            full_listing = Path(directory).joinpath('listing.txt')
+
+            lines = self._lines(ListingOptions(summary_depth=1, full_listing=full_listing))
+
+            self.assertIn('\t[.] added 3 files (3 bytes), removed 0 files (0 bytes), changed 0 files (0 bytes)', lines)
+            self.assertNotIn('Missing from first:', lines)
+            self.assertEqual(f'The full listing of the differences was saved to: [{full_listing}]', lines[-1])
+            listing = full_listing.read_text(encoding='utf-8').splitlines()
+            self.assertIn('Missing from first:', listing)
+            self.assertIn(f'\t[{Path("second", "file2.txt")}]', listing)
@@ -45,3 +45,22 @@ class TreeDiffTests(unittest.TestCase):
 
         self.assertEqual(1, len(actual.second_tree.missing))
         self.assertEqual('different1', actual.second_tree.missing[0].name)
+
+    def test_diff_between_deep_trees(self):
+        depth = 3000
+        trees = []
+        for root_name, checksum in [('C:/parent', 'first_checksum'), ('D:/parent', 'second_checksum')]:
+            node = Node(None, root_name, None, None, None)
+            trees.append(node)
+            for _ in range(depth):
+                child = Node(node, 'nested', None, None, None)
+                node.attach_child(child)
+                node = child
+            node.attach_child(Node(node, 'file', 100, checksum, None))
+
+        actual = TreeDiff().diff_between_trees(trees[0], trees[1])
+
+        self.assertEqual(1, len(actual.similar))
+        self.assertEqual('file', actual.similar[0][0].name)
+        self.assertEqual(0, len(actual.first_tree.missing))
+        self.assertEqual(0, len(actual.second_tree.missing))
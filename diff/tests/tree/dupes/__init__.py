@@ -0,0 +1 @@
+from .duplicate_finder_test import DuplicateFinderTests
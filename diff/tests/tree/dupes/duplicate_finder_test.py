@@ -0,0 +1,66 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import TreeLoader
+from diff.core.tree.dupes import DuplicateFinder
+from diff.core.util import Checksum
+
+
+class DuplicateFinderTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._root = Path(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _write(self, relative_path: str, content: bytes) -> Path:
+        path = self._root.joinpath(relative_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def test_find_duplicates(self):
+        self._write('first/a.bin', b'duplicate content')
+        self._write('second/nested/b.bin', b'duplicate content')
+        self._write('second/c.bin', b'different content')
+        self._write('second/unique.bin', b'unique size')
+        self._write('second/empty1.bin', b'')
+        self._write('second/empty2.bin', b'')
+
+        checksum = Checksum()
+        checksum.compute_file_checksum = Mock(wraps=checksum.compute_file_checksum)
+
+        tree_loader = TreeLoader(checksum=checksum)
+        trees = [
+            tree_loader.read_tree_from_disk(self._root.joinpath('first'), False, 'sha256'),
+            tree_loader.read_tree_from_disk(self._root.joinpath('second'), False, 'sha256')
+        ]
+
+        actual = DuplicateFinder(checksum).find_duplicates(trees, 'sha256', 2)
+
+        self.assertEqual(1, len(actual))
+        self.assertEqual(17, actual[0].size)
+        self.assertEqual(17, actual[0].reclaimable_size())
+        self.assertEqual(['a.bin', 'b.bin'], sorted(node.name for node in actual[0].nodes))
+        self.assertEqual(checksum.compute_file_checksum(self._root.joinpath('first/a.bin'), 'sha256'), actual[0].checksum)
+
+        # Only the two files that collided on both size and partial checksum should have been fully hashed.
+        self.assertEqual(3, checksum.compute_file_checksum.call_count)
+
+    def test_find_duplicates_with_same_start_and_end(self):
+        block = b'x' * 16
+        self._write('a.bin', block + b'1' + block)
+        self._write('b.bin', block + b'2' + block)
+
+        checksum = Checksum()
+        partial_checksum = checksum.compute_partial_checksum
+        checksum.compute_partial_checksum = Mock(side_effect=lambda path, algo: partial_checksum(path, algo, 16))
+
+        tree = TreeLoader(checksum=checksum).read_tree_from_disk(self._root, False, 'sha256')
+
+        self.assertEqual([], DuplicateFinder(checksum).find_duplicates([tree], 'sha256'))
@@ -0,0 +1,42 @@
+import unittest
+
+from diff.core.tree import Node
+
+
+class NodeTests(unittest.TestCase):
+
+    def setUp(self):
+        self._root = Node(None, 'root', None, None, None)
+        self._directory = Node(self._root, 'directory', None, None, None)
+        self._root.attach_child(self._directory)
+        self._file = Node(self._directory, 'file.txt', 10, None, None)
+        self._directory.attach_child(self._file)
+
+    def test_find_node(self):
+        self.assertIs(self._file, self._root.find_node('directory/file.txt'))
+        self.assertIs(self._root, self._root.find_node(''))
+        self.assertIsNone(self._root.find_node('directory/missing.txt'))
+        self.assertIsNone(self._root.find_node('directory/file.txt/nested'))
+
+    def test_find_child_index_follows_attached_and_detached_children(self):
+        self.assertIs(self._file, self._directory.find_child('file.txt'))
+
+        other_file = Node(self._directory, 'other.txt', 20, None, None)
+        self._directory.attach_child(other_file)
+        self.assertIs(other_file, self._directory.find_child('other.txt'))
+
+        self._directory.detach_child(self._file)
+        self.assertIsNone(self._directory.find_child('file.txt'))
+        self.assertEqual([other_file], self._directory.children)
+
+        self._directory.detach_child(other_file)
+        self.assertIsNone(self._directory.children)
+        self.assertIsNone(self._directory.find_child('other.txt'))
+
+    def test_detach_child_ignores_nodes_that_are_not_children(self):
+        self.assertIs(self._file, self._directory.find_child('file.txt'))
+
+        self._directory.detach_child(Node(self._directory, 'file.txt', 10, None, None))
+
+        self.assertIs(self._file, self._directory.find_child('file.txt'))
+        self.assertEqual([self._file], self._directory.children)
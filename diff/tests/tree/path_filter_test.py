@@ -0,0 +1,56 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+
+from diff.core.errors import NotAFileException
+from diff.core.tree import PathFilter, build_path_filter
+
+
+class PathFilterTests(unittest.TestCase):
+
+    def test_should_skip(self):
+        path_filter = PathFilter(['*.tmp', 'node_modules', '.git/', 'build/output', 'docs/**/*.md', '/top', 'file[0-9].txt'])
+        test_cases = [
+            ('a.tmp', 'nested/a.tmp', False, True),
+            ('a.tmpx', 'a.tmpx', False, False),
+            ('node_modules', 'a/b/node_modules', True, True),
+            ('.git', 'a/.git', True, True),
+            ('.git', '.git', False, False),
+            ('output', 'build/output', True, True),
+            ('output', 'nested/build/output', True, False),
+            ('readme.md', 'docs/readme.md', False, True),
+            ('readme.md', 'docs/a/b/readme.md', False, True),
+            ('readme.md', 'other/readme.md', False, False),
+            ('top', 'top', True, True),
+            ('top', 'nested/top', True, False),
+            ('file1.txt', 'file1.txt', False, True),
+            ('fileA.txt', 'fileA.txt', False, False)
+        ]
+        for name, relative_path, is_dir, expected in test_cases:
+            with self.subTest(relative_path=relative_path, is_dir=is_dir):
+                self.assertEqual(expected, path_filter.should_skip(name, relative_path, is_dir))
+
+    def test_should_skip_with_includes(self):
+        path_filter = PathFilter(['excluded.py'], ['*.py', 'data/*.csv'])
+
+        self.assertFalse(path_filter.should_skip('a.py', 'nested/a.py', False))
+        self.assertFalse(path_filter.should_skip('b.csv', 'data/b.csv', False))
+        self.assertFalse(path_filter.should_skip('nested', 'nested', True))
+        self.assertTrue(path_filter.should_skip('b.csv', 'other/b.csv', False))
+        self.assertTrue(path_filter.should_skip('excluded.py', 'excluded.py', False))
+
+    def test_build_path_filter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ignore_file = Path(directory).joinpath('.diffignore')
+            ignore_file.write_text('# cache directories\n\n__pycache__/\n')
+
+            path_filter = build_path_filter(['*.log'], [], str(ignore_file))
+
+            with self.assertRaises(NotAFileException):
+                build_path_filter([], [], str(Path(directory).joinpath('missing')))
+
+        self.assertTrue(path_filter.should_skip('__pycache__', 'a/__pycache__', True))
+        self.assertTrue(path_filter.should_skip('a.log', 'a.log', False))
+        self.assertTrue(path_filter.should_skip('$RECYCLE.BIN', '$RECYCLE.BIN', True))
+        self.assertFalse(path_filter.should_skip('a.txt', 'a.txt', False))
@@ -0,0 +1,107 @@
+from pathlib import Path
+import json
+import os
+import tempfile
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import TreeLoader, ScanJournal, YamlSerialization, journal_path_for
+from diff.core.util import Checksum, HashPool
+from diff.core.util.hash_pool import HASH_BACKEND_SERIAL
+
+
+_SETTINGS = {'path': 'root', 'algo': 'sha256', 'chunk_threshold': None}
+
+
+class _InterruptedChecksum(Checksum):
+
+    """
+    Interrupts the scan, the same way Ctrl+C would, once a number of files have been hashed.
+    """
+
+    def __init__(self, interrupt_after: int):
+        super().__init__()
+        self._remaining = interrupt_after
+
+    def compute_file_checksum(self, path: Path, algo: str) -> str:
+        if self._remaining == 0:
+            raise KeyboardInterrupt()
+        self._remaining -= 1
+        return super().compute_file_checksum(path, algo)
+
+
+class ScanJournalTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._root = Path(self._directory.name).joinpath('root')
+        self._root.joinpath('nested').mkdir(parents=True)
+        for position in range(3):
+            self._root.joinpath(f'file{position}.txt').write_text(f'content{position}')
+            self._root.joinpath('nested', f'file{position}.txt').write_text(f'nested{position}')
+        self._journal_path = journal_path_for(Path(self._directory.name).joinpath('scan.yml'))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_resume_only_hashes_remaining_files(self):
+        with ScanJournal(self._journal_path, _SETTINGS, False) as journal:
+            with self.assertRaises(KeyboardInterrupt):
+                # The files are hashed one at a time so the scan is interrupted after exactly three files.
+                tree_loader = TreeLoader(checksum=_InterruptedChecksum(3), hash_pool=HashPool(HASH_BACKEND_SERIAL))
+                tree_loader.read_tree_from_disk(self._root, True, 'sha256', journal=journal)
+
+        hashed_before_interruption = [Path(line) for line in _recorded_paths(self._journal_path)]
+        modified = hashed_before_interruption[0]
+        modified.write_text('modified')
+        os.utime(modified, ns=(0, 0))
+
+        checksum = Checksum()
+        checksum.compute_file_checksum = Mock(wraps=checksum.compute_file_checksum)  # type: ignore[method-assign]
+        with ScanJournal(self._journal_path, _SETTINGS, True) as journal:
+            resumed_tree = TreeLoader(checksum=checksum).read_tree_from_disk(self._root, True, 'sha256', journal=journal)
+
+            self.assertEqual(3, journal.resumed)
+
+        uninterrupted_tree = TreeLoader().read_tree_from_disk(self._root, True, 'sha256')
+        serialization = YamlSerialization()
+        self.assertEqual(serialization.to_yaml_string(uninterrupted_tree), serialization.to_yaml_string(resumed_tree))
+        hashed_after_resuming = {call.args[0] for call in checksum.compute_file_checksum.call_args_list}
+        self.assertEqual(4, len(hashed_after_resuming))
+        self.assertIn(modified, hashed_after_resuming)
+
+    def test_partially_written_line_is_discarded(self):
+        path_stat = os.stat(self._root.joinpath('file0.txt'))
+        with ScanJournal(self._journal_path, _SETTINGS, False) as journal:
+            journal.record(self._root.joinpath('file0.txt'), path_stat, 'A')
+        with open(self._journal_path, 'ab') as file:
+            file.write(b'{"path": "trunc')
+
+        with ScanJournal(self._journal_path, _SETTINGS, True) as journal:
+            journal.record(self._root.joinpath('file1.txt'), path_stat, 'B')
+
+        with ScanJournal(self._journal_path, _SETTINGS, True) as journal:
+            self.assertEqual(2, journal.resumed)
+            self.assertEqual(('A', None, None), journal.restore(self._root.joinpath('file0.txt'), path_stat))
+
+    def test_existing_journal_is_discarded_unless_resumed(self):
+        path_stat = self._root.joinpath('file0.txt').stat()
+        with ScanJournal(self._journal_path, _SETTINGS, False) as journal:
+            journal.record(self._root.joinpath('file0.txt'), path_stat, 'A')
+
+        ScanJournal(self._journal_path, _SETTINGS, False).close()
+
+        with ScanJournal(self._journal_path, _SETTINGS, True) as journal:
+            self.assertEqual(0, journal.resumed)
+
+    def test_existing_journal_requires_same_settings(self):
+        ScanJournal(self._journal_path, _SETTINGS, False).close()
+
+        with self.assertRaises(ValueError):
+            ScanJournal(self._journal_path, {**_SETTINGS, 'algo': 'md5'}, True)
+
+
+def _recorded_paths(journal_path: Path):
+    with open(journal_path, 'rb') as file:
+        return [json.loads(line)['path'] for line in file.read().splitlines()[1:]]
@@ -0,0 +1,158 @@
+from typing import Any, Callable, List
+from pathlib import Path
+import errno
+import hashlib
+import os
+import tempfile
+import time
+
+import unittest
+from unittest.mock import Mock
+
+from diff.core.tree import TreeLoader, YamlSerialization, ScanWatcher, WatchedScan
+from diff.core.util import Checksum, Inotify, InotifyEvent, is_inotify_available, either
+from diff.core.util.inotify import IN_Q_OVERFLOW
+
+
+def _sha256(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest().upper()
+
+
+def _drain(watched_scan: WatchedScan, inotify: Inotify, until: Callable[[], bool]):
+    """
+    Applies events until the condition holds. The events are read with a short timeout so the test does not depend
+    on how the kernel batches them.
+    """
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        watched_scan.apply_events(inotify.read_events(0.05))
+        watched_scan.flush()
+        if until():
+            return
+
+
+class _LimitedInotify(Inotify):
+
+    """
+    Fails to watch the directories with a given name, the same way inotify does once the limit of watches is reached.
+    """
+
+    def __init__(self, unwatchable_name: str):
+        super().__init__()
+        self._unwatchable_name = unwatchable_name
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        if path.name == self._unwatchable_name:
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        return super().add_watch(path, mask)
+
+
+@unittest.skipUnless(is_inotify_available(), 'inotify is only available on Linux')
+class ScanWatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._root = Path(self._directory.name).joinpath('root')
+        self._root.joinpath('folder').mkdir(parents=True)
+        self._root.joinpath('folder', 'kept.txt').write_text('kept')
+        self._root.joinpath('folder', 'modified.txt').write_text('before')
+        self._root.joinpath('deleted.txt').write_text('deleted')
+        self._scan_path = Path(self._directory.name).joinpath('scan.yml')
+        tree = TreeLoader().read_tree_from_disk(self._root, True, 'sha256')
+        YamlSerialization().to_yaml_file(self._scan_path, tree)
+        self._opened: List[Any] = []
+
+    def tearDown(self):
+        for watched_scan, inotify in self._opened:
+            watched_scan.close()
+            inotify.close()
+        self._directory.cleanup()
+
+    def _open(self, scan_watcher: ScanWatcher) -> Any:
+        opened = scan_watcher.open(self._scan_path)
+        self._opened.append(opened)
+        return opened
+
+    def test_events_update_tree(self):
+        watched_scan, inotify = self._open(ScanWatcher())
+
+        self._root.joinpath('folder', 'modified.txt').write_text('after')
+        self._root.joinpath('deleted.txt').unlink()
+        self._root.joinpath('created', 'nested').mkdir(parents=True)
+        self._root.joinpath('created', 'nested', 'new.txt').write_text('new')
+
+        def is_updated() -> bool:
+            new_file = watched_scan.root.find_node('created/nested/new.txt')
+            modified = watched_scan.root.find_node('folder/modified.txt')
+            return (new_file is not None and new_file.checksum == _sha256('new')
+                    and modified is not None and modified.checksum == _sha256('after'))
+        _drain(watched_scan, inotify, is_updated)
+
+        self.assertTrue(is_updated())
+        self.assertIsNone(watched_scan.root.find_node('deleted.txt'))
+        self.assertEqual(_sha256('kept'), either(watched_scan.root.find_node('folder/kept.txt'), watched_scan.root).checksum)
+        self.assertEqual(5, either(watched_scan.root.find_node('folder/modified.txt'), watched_scan.root).size)
+
+    def test_rename_moves_nodes_without_rehashing(self):
+        checksum = Checksum()
+        checksum.compute_file_checksum = Mock(wraps=checksum.compute_file_checksum)  # type: ignore[method-assign]
+        watched_scan, inotify = self._open(ScanWatcher(checksum=checksum))
+
+        self._root.joinpath('folder').rename(self._root.joinpath('renamed'))
+        _drain(watched_scan, inotify, lambda: watched_scan.root.find_node('renamed/kept.txt') is not None)
+        self._root.joinpath('renamed', 'added.txt').write_text('added')
+        _drain(watched_scan, inotify, lambda: watched_scan.root.find_node('renamed/added.txt') is not None)
+
+        self.assertIsNone(watched_scan.root.find_node('folder'))
+        self.assertEqual(_sha256('kept'), either(watched_scan.root.find_node('renamed/kept.txt'), watched_scan.root).checksum)
+        checksum.compute_file_checksum.assert_called_once_with(self._root.joinpath('renamed', 'added.txt'), 'sha256')
+
+    def test_file_created_before_directory_rename_is_kept(self):
+        watched_scan, inotify = self._open(ScanWatcher())
+
+        self._root.joinpath('folder', 'created.txt').write_text('created')
+        self._root.joinpath('folder').rename(self._root.joinpath('renamed'))
+        _drain(watched_scan, inotify, lambda: watched_scan.root.find_node('renamed/created.txt') is not None)
+
+        self.assertEqual(_sha256('created'), either(watched_scan.root.find_node('renamed/created.txt'), watched_scan.root).checksum)
+
+    def test_overflow_rescans_tree(self):
+        watched_scan, inotify = self._open(ScanWatcher())
+        inotify.read_events(0)
+
+        # The events of these changes are discarded to simulate the kernel dropping them when its queue overflowed.
+        self._root.joinpath('folder', 'modified.txt').write_text('after')
+        self._root.joinpath('added.txt').write_text('added')
+        time.sleep(0.01)
+        inotify.read_events(0.05)
+        watched_scan.apply_events([InotifyEvent(-1, IN_Q_OVERFLOW, 0, '')])
+        changes = watched_scan.flush()
+
+        self.assertEqual(1, watched_scan.overflows)
+        self.assertEqual(2, changes)
+        self.assertEqual(_sha256('after'), either(watched_scan.root.find_node('folder/modified.txt'), watched_scan.root).checksum)
+        self.assertEqual(_sha256('added'), either(watched_scan.root.find_node('added.txt'), watched_scan.root).checksum)
+
+    def test_unwatchable_directory_is_rescanned_on_flush(self):
+        watched_scan, _ = self._open(ScanWatcher(inotify_factory=lambda: _LimitedInotify('folder')))
+
+        self._root.joinpath('folder', 'added.txt').write_text('added')
+        changes = watched_scan.flush()
+
+        self.assertEqual(1, changes)
+        self.assertEqual(_sha256('added'), either(watched_scan.root.find_node('folder/added.txt'), watched_scan.root).checksum)
+
+    def test_watch_saves_changes(self):
+        scan_watcher = ScanWatcher()
+        flushes: List[int] = []
+
+        def should_stop() -> bool:
+            if not self._root.joinpath('late.txt').exists():
+                self._root.joinpath('late.txt').write_text('late')
+            return len(flushes) > 0
+
+        scan_watcher.watch(self._scan_path, 0.05, should_stop=should_stop, on_flush=flushes.append)
+
+        saved = TreeLoader().read_tree_from_yaml(self._scan_path)
+        self.assertEqual(_sha256('late'), either(saved.find_node('late.txt'), saved).checksum)
+        self.assertFalse(self._scan_path.with_name(self._scan_path.name + '.tmp').exists())
@@ -1,12 +1,15 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
+import os
+import tempfile
 
 import unittest
 from unittest.mock import patch, Mock
 
 from diff.core.errors import InvalidScanFileException
-from diff.core.tree import TreeLoader, YamlSerialization
-from diff.core.util import Checksum, either
+from diff.core.tree import TreeLoader, YamlSerialization, Node, PathFilter
+from diff.core.util import Checksum, HashPool, either
+from diff.core.util.hash_pool import HASH_BACKEND_SERIAL, HASH_BACKEND_THREAD, HASH_BACKEND_PROCESS
 
 from diff.tests.util import fully_qualified_name
 
@@ -46,6 +49,15 @@ class TreeLoaderTests(unittest.TestCase):
 
         self.assertTrue(expected_cause in str(context.exception), f'Expected error to contain root cause message: [{expected_cause}].')
 
+    @patch(fully_qualified_name(YamlSerialization))
+    def test_read_tree_from_yaml_with_unrecognized_key(self, mock_yaml: YamlSerialization):
+        mock_yaml.read_yaml_file = Mock(return_value={'name': 'root', 'children': [{'name': 'child', 'random': 1}]})
+
+        with self.assertRaises(InvalidScanFileException) as context:
+            TreeLoader(mock_yaml).read_tree_from_yaml(Path(__file__))
+
+        self.assertIn('random', str(context.exception))
+
     @patch(fully_qualified_name(Checksum))
     def test_read_tree_from_disk(self, mock_checksum: Checksum):
         checksum_algo = 'sha512'
@@ -71,3 +83,138 @@ class TreeLoaderTests(unittest.TestCase):
         self.assertEqual('test.txt', child_nodes[0].name)
         self.assertEqual(expected_checksum, child_nodes[0].checksum)
         self.assertIsNone(child_nodes[0].checksum_algo)
+
+    def test_read_tree_from_disk_in_inode_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            for name in ['c.txt', 'a.txt', 'b.txt']:
+                root.joinpath('nested').mkdir(exist_ok=True)
+                root.joinpath('nested', name).write_text(name)
+                root.joinpath(name).write_text(name)
+
+            hashed: List[Path] = []
+            mock_checksum = Mock()
+            mock_checksum.compute_file_checksum = Mock(side_effect=lambda path, algo: hashed.append(path) or path.name)
+
+            actual = TreeLoader(checksum=mock_checksum).read_tree_from_disk(root, True, 'sha256', 'inode')
+
+            self.assertEqual(6, len(hashed))
+            self.assertEqual(sorted(hashed, key=lambda path: os.stat(path).st_ino), hashed)
+            self.assertTrue(all(child.checksum == child.name for child in either(actual.children, []) if child.size is not None))
+
+    def test_read_tree_from_disk_with_invalid_read_order(self):
+        with self.assertRaises(ValueError):
+            TreeLoader().read_tree_from_disk(Path(__file__).parent, False, None, 'random')
+
+    def test_read_tree_from_disk_hashes_hard_links_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('original.txt').write_text('content')
+            try:
+                os.link(root.joinpath('original.txt'), root.joinpath('link.txt'))
+            except OSError:
+                self.skipTest('Hard links are not supported by the file system.')
+
+            mock_checksum = Mock()
+            mock_checksum.compute_file_checksum = Mock(return_value='expected_checksum')
+
+            actual = TreeLoader(checksum=mock_checksum).read_tree_from_disk(root, True, 'sha256')
+
+            mock_checksum.compute_file_checksum.assert_called_once()
+            self.assertEqual(['expected_checksum', 'expected_checksum'], [child.checksum for child in either(actual.children, [])])
+
+    def test_read_tree_from_disk_with_each_hash_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('nested').mkdir()
+            for position in range(5):
+                root.joinpath('nested', f'file{position}.bin').write_bytes(bytes([position]) * position * 100)
+            root.joinpath('large.bin').write_bytes(bytes(1000))
+            try:
+                os.link(root.joinpath('nested', 'file1.bin'), root.joinpath('link.bin'))
+            except OSError:
+                pass
+
+            expected = TreeLoader(hash_pool=HashPool(HASH_BACKEND_SERIAL)).read_tree_from_disk(root, True, 'sha256', chunk_threshold=1000, chunk_size=256)
+            for backend in [HASH_BACKEND_THREAD, HASH_BACKEND_PROCESS]:
+                with self.subTest(backend=backend):
+                    tree_loader = TreeLoader(hash_pool=HashPool(backend, workers=2, batch_files=2))
+                    actual = tree_loader.read_tree_from_disk(root, True, 'sha256', chunk_threshold=1000, chunk_size=256)
+
+                    self.assertEqual(expected.to_dict(), actual.to_dict())
+
+    def test_read_tree_from_disk_deeper_than_recursion_limit(self):
+        depth = 1100
+        with tempfile.TemporaryDirectory() as directory:
+            deepest = Path(directory)
+            for _ in range(depth):
+                deepest = deepest.joinpath('d')
+                deepest.mkdir()
+            deepest.joinpath('file.txt').write_text('content')
+
+            try:
+                actual = TreeLoader().read_tree_from_disk(Path(directory), False, None)
+                self.assertIsNotNone(actual.find_node('/'.join(['d'] * depth + ['file.txt'])))
+            finally:
+                # shutil.rmtree, used to clean up the temporary directory, is itself recursive.
+                deepest.joinpath('file.txt').unlink()
+                while deepest != Path(directory):
+                    deepest.rmdir()
+                    deepest = deepest.parent
+
+    def test_read_tree_from_yaml_deeper_than_recursion_limit(self):
+        depth = 1100
+        root = Node(None, 'root', None, None, 'sha256')
+        node = root
+        for _ in range(depth):
+            child = Node(node, 'd', None, None, None)
+            node.attach_child(child)
+            node = child
+        node.attach_child(Node(node, 'file.txt', 7, 'checksum', None))
+
+        with tempfile.TemporaryDirectory() as directory:
+            scan_path = Path(directory).joinpath('scan.yml')
+            YamlSerialization().to_yaml_file(scan_path, root)
+
+            actual = TreeLoader().read_tree_from_yaml(scan_path)
+
+        leaf = actual.find_node('/'.join(['d'] * depth + ['file.txt']))
+        self.assertIsNotNone(leaf)
+        self.assertEqual('checksum', either(leaf, root).checksum)
+
+    def test_read_entries_from_disk_matches_tree(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('folder', 'nested').mkdir(parents=True)
+            root.joinpath('folder', 'nested', 'deep.txt').write_text('deep')
+            root.joinpath('folder', 'skipped.pyc').write_text('skipped')
+            root.joinpath('empty').mkdir()
+            root.joinpath('file.txt').write_text('file')
+            path_filter = PathFilter(['*.pyc'])
+            tree_loader = TreeLoader()
+
+            tree = tree_loader.read_tree_from_disk(root, True, 'sha256', path_filter=path_filter)
+            actual = list(tree_loader.read_entries_from_disk(root, True, 'sha256', path_filter))
+
+        expected = []
+        pending = [(child, child.name) for child in reversed(either(tree.children, []))]
+        while len(pending) > 0:
+            node, relative_path = pending.pop()
+            expected.append((relative_path, node.size, node.checksum))
+            pending.extend((child, os.path.join(relative_path, child.name)) for child in reversed(either(node.children, [])))
+        self.assertEqual(expected, actual)
+        self.assertEqual(5, len(actual))
+
+    def test_read_tree_from_disk_prunes_excluded_directories(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            root.joinpath('node_modules', 'package').mkdir(parents=True)
+            root.joinpath('node_modules', 'package', 'index.js').write_text('index')
+            root.joinpath('main.py').write_text('main')
+            root.joinpath('main.pyc').write_text('main')
+
+            with patch('os.scandir', wraps=os.scandir) as mock_scandir:
+                actual = TreeLoader().read_tree_from_disk(root, False, None, path_filter=PathFilter(['node_modules/', '*.pyc']))
+
+        mock_scandir.assert_called_once_with(root)
+        self.assertEqual(['main.py'], [child.name for child in either(actual.children, [])])
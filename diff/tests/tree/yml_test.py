@@ -0,0 +1,51 @@
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import yaml
+
+from diff.core.tree import Node, YamlSerialization
+
+
+class YamlSerializationTests(unittest.TestCase):
+
+    def test_to_yaml_string_matches_safe_dump(self):
+        root = Node(None, 'root', None, None, 'sha256')
+        directory = Node(root, 'yes', None, None, None)
+        root.attach_child(directory)
+        directory.attach_child(Node(directory, '123', 0, 'null', None))
+        directory.attach_child(Node(directory, 'a: b', 10 ** 12, 'AB', None))
+
+        actual = YamlSerialization().to_yaml_string(root)
+
+        self.assertEqual(yaml.safe_dump(root.to_dict(), sort_keys=False), actual)
+
+    def test_read_yaml_file_matches_safe_load(self):
+        content = 'name: root\nchildren:\n- &file {name: \'123\', size: 7, checksum: ~}\n- *file\n- {name: yes, size: !!int "3"}\n'
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory).joinpath('scan.yml')
+            file_path.write_text(content)
+
+            actual = YamlSerialization().read_yaml_file(file_path)
+
+        self.assertEqual(yaml.safe_load(content), actual)
+
+    def test_round_trip_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        root = Node(None, 'root', None, None, None)
+        node = root
+        for _ in range(depth):
+            child = Node(node, 'd', None, None, None)
+            node.attach_child(child)
+            node = child
+        serialization = YamlSerialization()
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory).joinpath('scan.yml')
+            serialization.to_yaml_file(file_path, root)
+            values = serialization.read_yaml_file(file_path)
+
+        for _ in range(depth):
+            values = values['children'][0]
+        self.assertEqual({'name': 'd'}, values)
@@ -1,2 +1,8 @@
 from .compute_file_checksum_test import ComputeFileChecksumTests
+from .checksum_manifest_test import ChecksumManifestTests
+from .io_scheduler_test import IoSchedulerTests
+from .hash_pool_test import HashPoolTests
+from .external_sort_test import ExternalSorterTests
+from .progress_test import ProgressReporterTests
+from .profiler_test import ProfilerTests
 from .util import fully_qualified_name
@@ -0,0 +1,46 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+
+from diff.core.errors import InvalidChecksumManifestException
+from diff.core.util import ChecksumManifest
+
+
+class ChecksumManifestTests(unittest.TestCase):
+
+    def test_write_and_read_manifest(self):
+        entries = [
+            ('ABCDEF', 'plain/file.txt'),
+            ('012345', 'with\\backslash'),
+            ('6789AB', 'with\nnew line')
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            manifest_path = Path(directory).joinpath('manifest.sha256')
+            ChecksumManifest().write_manifest(manifest_path, entries)
+
+            lines = manifest_path.read_text().splitlines()
+            actual = ChecksumManifest().read_manifest(manifest_path)
+
+        self.assertEqual('abcdef  plain/file.txt', lines[0])
+        self.assertEqual('\\012345  with\\\\backslash', lines[1])
+        self.assertEqual('\\6789ab  with\\nnew line', lines[2])
+        self.assertEqual(entries, actual)
+
+    def test_read_manifest_with_binary_marker(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest_path = Path(directory).joinpath('manifest.sha256')
+            manifest_path.write_text('abcdef *binary.bin\n\n')
+
+            self.assertEqual([('ABCDEF', 'binary.bin')], ChecksumManifest().read_manifest(manifest_path))
+
+    def test_read_manifest_with_invalid_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest_path = Path(directory).joinpath('manifest.sha256')
+            manifest_path.write_text('abcdef  valid.txt\nnot a manifest line\n')
+
+            with self.assertRaises(InvalidChecksumManifestException) as context:
+                ChecksumManifest().read_manifest(manifest_path)
+
+        self.assertTrue('Line 2' in str(context.exception))
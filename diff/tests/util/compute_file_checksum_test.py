@@ -1,4 +1,6 @@
 from pathlib import Path
+import hashlib
+import tempfile
 
 import unittest
 
@@ -23,3 +25,62 @@ class ComputeFileChecksumTests(unittest.TestCase):
             with self.subTest(algo=test_case[0]):
                 actual = Checksum().compute_file_checksum(input_file_path, test_case[0])
                 self.assertEqual(test_case[1], actual)
+
+    def test_compute_file_checksum_with_tree_algorithm(self):
+        input_file_path = Path(__file__).absolute().parent.joinpath('checksum_test_file.txt')
+        content = input_file_path.read_bytes()
+
+        single_chunk = hashlib.sha256(hashlib.sha256(content).digest()).hexdigest().upper()
+        self.assertEqual(single_chunk, Checksum().compute_file_checksum(input_file_path, 'sha256-tree'))
+
+        chunk_size = 8
+        chunk_digests = b''.join(
+            hashlib.sha256(content[offset:offset + chunk_size]).digest()
+            for offset in range(0, len(content), chunk_size)
+        )
+        multiple_chunks = hashlib.sha256(chunk_digests).hexdigest().upper()
+        self.assertEqual(multiple_chunks, Checksum(chunk_size, 4).compute_file_checksum(input_file_path, 'sha256-tree'))
+
+    def test_compute_file_checksum_with_tree_algorithm_and_empty_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            empty_file_path = Path(directory).joinpath('empty.bin')
+            empty_file_path.write_bytes(b'')
+
+            actual = Checksum().compute_file_checksum(empty_file_path, 'sha512-tree')
+
+        self.assertEqual(hashlib.sha512(b'').hexdigest().upper(), actual)
+
+    def test_compute_file_checksum_and_chunk_digests(self):
+        input_file_path = Path(__file__).absolute().parent.joinpath('checksum_test_file.txt')
+        content = input_file_path.read_bytes()
+        expected_chunks = [hashlib.sha256(content[offset:offset + 16]).hexdigest().upper() for offset in range(0, len(content), 16)]
+
+        for algo in ['sha256', 'sha256-tree']:
+            with self.subTest(algo=algo):
+                checksum = Checksum(16)
+                actual_checksum, actual_chunks = checksum.compute_file_checksum_and_chunk_digests(input_file_path, algo, 16)
+
+                self.assertEqual(checksum.compute_file_checksum(input_file_path, algo), actual_checksum)
+                self.assertEqual(expected_chunks, actual_chunks)
+                self.assertEqual(expected_chunks, checksum.compute_chunk_digests(input_file_path, algo, 16))
+
+    def test_compute_file_checksum_of_sparse_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sparse_file_path = Path(directory).joinpath('sparse.bin')
+            with open(sparse_file_path, 'wb') as file:
+                file.truncate(8 * 1024 * 1024)
+                file.seek(3 * 1024 * 1024 + 5)
+                file.write(b'data in the middle of a hole')
+            content = sparse_file_path.read_bytes()
+
+            chunk_size = 1024 * 1024
+            chunk_digests = b''.join(
+                hashlib.sha256(content[offset:offset + chunk_size]).digest()
+                for offset in range(0, len(content), chunk_size)
+            )
+
+            self.assertEqual(hashlib.sha256(content).hexdigest().upper(), Checksum().compute_file_checksum(sparse_file_path, 'sha256'))
+            self.assertEqual(
+                hashlib.sha256(chunk_digests).hexdigest().upper(),
+                Checksum(chunk_size, 2).compute_file_checksum(sparse_file_path, 'sha256-tree')
+            )
@@ -0,0 +1,49 @@
+import gc
+import os
+import random
+import tempfile
+import warnings
+
+import unittest
+
+from diff.core.util import ExternalSorter
+
+
+class ExternalSorterTests(unittest.TestCase):
+
+    def test_sorts_records_in_memory(self):
+        records = [(f'{value:05}', value, None) for value in random.Random(1).sample(range(1000), 1000)]
+
+        with ExternalSorter() as sorter:
+            sorter.add_all(records)
+            actual = list(sorter.sorted())
+
+            self.assertEqual(0, sorter.runs)
+        self.assertEqual(sorted(records), actual)
+
+    def test_sorts_records_larger_than_budget(self):
+        records = [(f'{value:06}', value, 'checksum') for value in random.Random(2).sample(range(100_000), 20_000)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with ExternalSorter(memory_budget=64 * 1024, directory=directory) as sorter:
+                sorter.add_all(records)
+                runs = sorter.runs
+                actual = list(sorter.sorted())
+
+            remaining = os.listdir(directory)
+
+        # The budget only holds a few runs at a time so the runs are merged in several passes.
+        self.assertGreater(runs, 10)
+        self.assertEqual(sorted(records), actual)
+        self.assertEqual([], remaining)
+
+    def test_close_closes_unfinished_spill_files(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            with ExternalSorter() as sorter:
+                spill_file = sorter.spill_file()
+                spill_file.write(('key', 1))
+            del spill_file
+            gc.collect()
+
+        self.assertEqual([], [warning for warning in caught if issubclass(warning.category, ResourceWarning)])
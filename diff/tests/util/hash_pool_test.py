@@ -0,0 +1,67 @@
+from pathlib import Path
+import tempfile
+
+import unittest
+from unittest.mock import patch
+
+from diff.core.util import Checksum, HashPool
+from diff.core.util.hash_pool import HASH_BACKEND_SERIAL, HASH_BACKEND_THREAD, HASH_BACKEND_PROCESS
+
+
+class _CustomChecksum(Checksum):
+    pass
+
+
+class HashPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._files = []
+        for position in range(7):
+            path = Path(self._directory.name).joinpath(f'file{position}.bin')
+            path.write_bytes(bytes([position]) * (position * 1000))
+            self._files.append((path, position * 1000))
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_every_backend_computes_the_same_checksums(self):
+        checksum = Checksum()
+        expected = [checksum.compute_file_checksum(path, 'sha256') for path, _ in self._files]
+        for backend in [HASH_BACKEND_SERIAL, HASH_BACKEND_THREAD, HASH_BACKEND_PROCESS]:
+            with self.subTest(backend=backend):
+                pool = HashPool(backend, workers=2, batch_files=2, batch_bytes=4000)
+                actual = [None] * len(self._files)
+                for index, file_checksum in pool.hash_files(self._files, 'sha256', checksum):
+                    actual[index] = file_checksum
+
+                self.assertEqual(expected, actual)
+
+    @patch('diff.core.util.hash_pool._is_on_rotational_device', return_value=False)
+    def test_auto_backend_follows_file_sizes(self, _):
+        pool = HashPool(workers=4, small_file_size=4000, minimum_process_files=3)
+
+        self.assertEqual(HASH_BACKEND_PROCESS, pool.choose_backend(self._files, Checksum()))
+        self.assertEqual(HASH_BACKEND_THREAD, pool.choose_backend(self._files[3:], Checksum()))
+        self.assertEqual(HASH_BACKEND_THREAD, pool.choose_backend(self._files, _CustomChecksum()))
+        self.assertEqual(HASH_BACKEND_SERIAL, pool.choose_backend(self._files[:1], Checksum()))
+        self.assertEqual(HASH_BACKEND_THREAD, HashPool(HASH_BACKEND_PROCESS).choose_backend(self._files, _CustomChecksum()))
+
+    @patch('diff.core.util.hash_pool._is_on_rotational_device', return_value=True)
+    def test_auto_backend_reads_spinning_disks_one_file_at_a_time(self, _):
+        pool = HashPool(workers=4, small_file_size=4000, minimum_process_files=3)
+
+        self.assertEqual(HASH_BACKEND_SERIAL, pool.choose_backend(self._files, Checksum()))
+
+    @patch('diff.core.util.hash_pool._is_on_rotational_device', return_value=False)
+    def test_ordered_files_are_only_read_one_at_a_time_in_auto_mode(self, _):
+        pool = HashPool(workers=4, small_file_size=4000, minimum_process_files=3)
+
+        self.assertEqual(HASH_BACKEND_SERIAL, pool.choose_backend(self._files, Checksum(), ordered=True))
+        for backend in [HASH_BACKEND_THREAD, HASH_BACKEND_PROCESS]:
+            pool.set_backend(backend)
+            self.assertEqual(backend, pool.choose_backend(self._files, Checksum(), ordered=True))
+
+    def test_set_backend_with_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            HashPool().set_backend('random')
@@ -0,0 +1,59 @@
+from typing import List
+from pathlib import Path
+import os
+import tempfile
+import threading
+import time
+
+import unittest
+
+from diff.core.util import IoScheduler
+
+
+class IoSchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        root = Path(self._directory.name)
+        self._paths = [root.joinpath(f'file{position}.txt') for position in range(6)]
+        for path in self._paths:
+            path.write_text(path.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _run(self, rotational: bool, max_workers_per_device: int) -> tuple[List[str], List[Path], int]:
+        lock = threading.Lock()
+        order: List[Path] = []
+        running = [0, 0]
+
+        def function(path: Path) -> str:
+            with lock:
+                order.append(path)
+                running[0] += 1
+                running[1] = max(running[0], running[1])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return path.name
+
+        scheduler = IoScheduler(max_workers_per_device, lambda device: rotational)
+        results = scheduler.map(function, list(reversed(self._paths)))
+        return results, order, running[1]
+
+    def test_map_on_rotational_device(self):
+        results, order, max_running = self._run(True, 4)
+
+        self.assertEqual([path.name for path in reversed(self._paths)], results)
+        self.assertEqual(1, max_running)
+        self.assertEqual(sorted(order, key=lambda path: os.stat(path).st_ino), order)
+
+    def test_map_on_non_rotational_device(self):
+        results, order, max_running = self._run(False, 3)
+
+        self.assertEqual([path.name for path in reversed(self._paths)], results)
+        self.assertEqual(len(self._paths), len(order))
+        self.assertEqual(3, max_running)
+
+    def test_map_without_paths(self):
+        self.assertEqual([], IoScheduler().map(lambda path: path, []))
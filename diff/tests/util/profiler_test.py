@@ -0,0 +1,52 @@
+import json
+
+import unittest
+
+from diff.core.util import Profiler
+
+
+class ProfilerTests(unittest.TestCase):
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+
+        with profiler.span('phase') as span:
+            span.add_bytes(10)
+        profiler.count('counter')
+
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(0, span.bytes)
+        self.assertEqual({}, json.loads(profiler.report('json'))['phases'])
+
+    def test_report_aggregates_spans_and_counters(self):
+        profiler = Profiler()
+        profiler.enable()
+
+        for size in [10, 20]:
+            with profiler.span('phase') as span:
+                span.add_bytes(size)
+        profiler.count('counter', 3)
+
+        report = json.loads(profiler.report('json'))
+
+        self.assertEqual(2, report['phases']['phase']['calls'])
+        self.assertEqual(30, report['phases']['phase']['bytes'])
+        self.assertEqual({'counter': 3}, report['counters'])
+        self.assertIsNone(report['capture'])
+
+    def test_table_report_includes_capture(self):
+        profiler = Profiler()
+        profiler.enable('cprofile')
+
+        with profiler.span('phase'):
+            sum(range(100))
+
+        table = profiler.report('table')
+
+        self.assertTrue(table.startswith('Phase'))
+        self.assertIn('phase', table)
+        self.assertIn('function calls', table)
+
+    def test_enable_with_invalid_capture(self):
+        with self.assertRaises(ValueError):
+            Profiler().enable('random')
@@ -0,0 +1,72 @@
+from typing import List, Dict, Any
+import io
+import json
+
+import unittest
+
+from diff.core.util import ProgressReporter
+
+
+class ProgressReporterTests(unittest.TestCase):
+
+    def setUp(self):
+        self._now: List[float] = [0.0]
+        self._stream = io.StringIO()
+
+    def _reporter(self, mode: str) -> ProgressReporter:
+        reporter = ProgressReporter(self._stream, lambda: self._now[0], 60)
+        reporter.set_mode(mode)
+        return reporter
+
+    def test_stage_renders_final_json_line(self):
+        with self._reporter('json').stage('Hashing', 4, 4096) as progress:
+            progress.file_completed(1024)
+            progress.file_completed(1024)
+            self._now[0] = 2.0
+
+        lines = self._stream.getvalue().splitlines()
+        self.assertEqual(1, len(lines))
+        snapshot = json.loads(lines[0])
+        self.assertEqual('Hashing', snapshot['stage'])
+        self.assertEqual(2, snapshot['files'])
+        self.assertEqual(2, snapshot['queued_files'])
+        self.assertEqual(1.0, snapshot['files_per_second'])
+        self.assertEqual(1024.0, snapshot['bytes_per_second'])
+        self.assertEqual(2.0, snapshot['eta'])
+        self.assertTrue(snapshot['final'])
+
+    def test_stage_renders_final_plain_line(self):
+        with self._reporter('plain').stage('Listing') as progress:
+            progress.directory_found()
+            progress.file_completed()
+            progress.entry_skipped()
+            self._now[0] = 1.0
+
+        self.assertEqual('Listing: 1 files 1 directories 1.0 files/s queued directories 1 1 skipped\n', self._stream.getvalue())
+
+    def test_quiet_mode_renders_nothing(self):
+        with self._reporter('quiet').stage('Hashing', 1, 1) as progress:
+            progress.file_completed(1)
+
+        self.assertEqual('', self._stream.getvalue())
+
+    def test_auto_mode_falls_back_to_plain_without_terminal(self):
+        with self._reporter('auto').stage('Hashing', 1) as progress:
+            progress.file_completed()
+
+        self.assertTrue(self._stream.getvalue().startswith('Hashing: 1/1 files'))
+        self.assertNotIn('\r', self._stream.getvalue())
+
+    def test_callback_receives_snapshots_instead_of_stream(self):
+        snapshots: List[Dict[str, Any]] = []
+        reporter = ProgressReporter(self._stream, lambda: self._now[0], 60, snapshots.append)
+        with reporter.stage('Hashing', 2) as progress:
+            progress.file_completed(10)
+
+        self.assertEqual('', self._stream.getvalue())
+        self.assertEqual(1, len(snapshots))
+        self.assertEqual(('Hashing', 1, 10, True), tuple(snapshots[0][key] for key in ('stage', 'files', 'bytes', 'final')))
+
+    def test_set_mode_with_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ProgressReporter().set_mode('random')